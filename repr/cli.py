@@ -92,7 +92,7 @@ from .storage import (
     mark_story_pushed,
     update_story_metadata,
     STORIES_DIR,
-    backup_all_data,
+    write_backup,
     restore_from_backup,
     get_storage_stats,
 )
@@ -918,12 +918,9 @@ def generate(
     """
     import asyncio
     from .timeline import extract_commits_from_git, detect_project_root, get_session_contexts_for_commits
-    from .story_synthesis import synthesize_stories
+    from .story_synthesis import synthesize_stories_sync
     from .db import get_db
     from .privacy import check_cloud_permission, log_cloud_operation
-
-    def synthesize_stories_sync(*args, **kwargs):
-        return asyncio.run(synthesize_stories(*args, **kwargs))
     
     # Determine mode
     if cloud:
@@ -1114,53 +1111,44 @@ def generate(
 
             # Generate public/internal posts for each story
             if stories and not dry_run:
-                from .story_synthesis import transform_story_for_feed_sync, _build_fallback_post
+                from .story_synthesis import transform_stories_for_feed_sync, _build_fallback_codex
 
                 if not json_output:
                     console.print(f"  Generating build log posts...")
 
-                for story in stories:
-                    try:
-                        # Generate Tripartite Codex content (internal includes all fields)
-                        result = transform_story_for_feed_sync(story, mode="internal")
-
-                        # Store structured fields
-                        story.hook = result.hook
-                        story.what = result.what
-                        story.value = result.value
-                        story.insight = result.insight
-                        story.show = result.show
-                        story.post_body = result.post_body
-
-                        # Internal-specific fields
-                        if hasattr(result, 'problem') and result.problem:
-                            story.problem = result.problem
-                        if hasattr(result, 'how') and result.how:
-                            story.implementation_details = result.how
-
-                        # Legacy fields for backward compatibility
-                        what_clean = result.what.rstrip(".").rstrip()
-                        value_clean = result.value.lstrip(".").lstrip()
-                        story.public_post = f"{result.hook}\n\n{what_clean}. {value_clean}\n\nInsight: {result.insight}"
-                        story.internal_post = story.public_post
-                        story.public_show = result.show
-                        story.internal_show = result.show
-                    except Exception as e:
-                        # Print error for visibility
-                        if not json_output:
-                            print_warning(f"  Post generation failed: {e}")
-                        # Fallback: build from story data
-                        from .story_synthesis import _build_fallback_codex
-                        result = _build_fallback_codex(story, "internal")
-                        story.hook = result.hook
-                        story.what = result.what
-                        story.value = result.value
-                        story.insight = result.insight
-                        story.post_body = result.post_body
-                        what_clean = result.what.rstrip(".").rstrip()
-                        value_clean = result.value.lstrip(".").lstrip()
-                        story.public_post = f"{result.hook}\n\n{what_clean}. {value_clean}\n\nInsight: {result.insight}"
-                        story.internal_post = story.public_post
+                try:
+                    # Generate Tripartite Codex content (internal includes all fields),
+                    # several stories per LLM request
+                    results = transform_stories_for_feed_sync(stories, mode="internal")
+                except Exception as e:
+                    # Print error for visibility
+                    if not json_output:
+                        print_warning(f"  Post generation failed: {e}")
+                    # Fallback: build from story data
+                    results = [_build_fallback_codex(story, "internal") for story in stories]
+
+                for story, result in zip(stories, results):
+                    # Store structured fields
+                    story.hook = result.hook
+                    story.what = result.what
+                    story.value = result.value
+                    story.insight = result.insight
+                    story.show = result.show
+                    story.post_body = result.post_body
+
+                    # Internal-specific fields
+                    if hasattr(result, 'problem') and result.problem:
+                        story.problem = result.problem
+                    if hasattr(result, 'how') and result.how:
+                        story.implementation_details = result.how
+
+                    # Legacy fields for backward compatibility
+                    what_clean = result.what.rstrip(".").rstrip()
+                    value_clean = result.value.lstrip(".").lstrip()
+                    story.public_post = f"{result.hook}\n\n{what_clean}. {value_clean}\n\nInsight: {result.insight}"
+                    story.internal_post = story.public_post
+                    story.public_show = result.show
+                    story.internal_show = result.show
 
             # Save to SQLite
             if not dry_run and stories:
@@ -3481,16 +3469,14 @@ def data_backup(
         repr data backup > backup.json
         repr data backup --output backup.json
     """
-    backup_data = backup_all_data()
-    json_str = json.dumps(backup_data, indent=2, default=str)
-    
     if output:
-        output.write_text(json_str)
+        with output.open("w", encoding="utf-8") as f:
+            counts = write_backup(f)
         print_success(f"Backup saved to {output}")
-        console.print(f"  Stories: {len(backup_data['stories'])}")
-        console.print(f"  Profiles: {len(backup_data['profiles'])}")
+        console.print(f"  Stories: {counts['stories']}")
+        console.print(f"  Profiles: {counts['profiles']}")
     else:
-        print(json_str)
+        write_backup(sys.stdout)
 
 
 @data_app.command("restore")
@@ -3549,6 +3535,42 @@ def data_clear_cache():
     console.print("  Config preserved")
 
 
+@data_app.command("reindex")
+def data_reindex():
+    """
+    Rebuild the local story index.
+
+    Story listings use an index of the metadata files. Run this after
+    editing story files by hand if listings look out of date.
+
+    Example:
+        repr data reindex
+    """
+    from .storage import get_story_count, rebuild_story_index
+
+    rebuild_story_index()
+    print_success(f"Reindexed {get_story_count()} stories")
+
+
+@data_app.command("format-stories")
+def data_format_stories(
+    pretty: bool = typer.Option(True, "--pretty/--compact", help="Indent JSON or write it compact"),
+):
+    """
+    Reformat local story metadata files.
+
+    Story metadata is stored as compact JSON. Use --pretty to make the
+    files readable by hand, and --compact to shrink them again.
+
+    Example:
+        repr data format-stories --pretty
+    """
+    from .storage import format_story_files
+
+    count = format_story_files(pretty=pretty)
+    print_success(f"Reformatted {count} story files ({'pretty' if pretty else 'compact'})")
+
+
 @data_app.command("migrate-db")
 def data_migrate_db(
     dry_run: bool = typer.Option(False, "--dry-run", help="Show what would be migrated"),
@@ -5446,10 +5468,9 @@ def timeline_refresh(
     """
     from .db import get_db
     from .story_synthesis import (
-        transform_story_for_feed_sync,
+        transform_stories_for_feed_sync,
         _build_fallback_post,
-        extract_file_changes_from_commits,
-        extract_key_snippets_from_commits,
+        extract_recall_data,
     )
 
     db = get_db()
@@ -5496,23 +5517,29 @@ def timeline_refresh(
     for p in db.list_projects():
         project_paths[p["id"]] = p["path"]
 
-    for story in stories:
+    # Regenerate Tripartite Codex content for every story up front, several
+    # stories per request (posts only depend on fields git extraction leaves alone)
+    try:
+        results = transform_stories_for_feed_sync(stories, mode="internal")
+    except Exception as e:
+        results = [e] * len(stories)
+
+    for story, result in zip(stories, results):
         try:
             # Extract file changes and snippets from git
             project_path = project_paths.get(story.project_id)
             if story.commit_shas and project_path:
-                file_changes, total_ins, total_del = extract_file_changes_from_commits(
-                    story.commit_shas, project_path
+                file_changes, total_ins, total_del, key_snippets = extract_recall_data(
+                    story.commit_shas, project_path, max_snippets=3
                 )
                 story.file_changes = file_changes
                 story.total_insertions = total_ins
                 story.total_deletions = total_del
-                story.key_snippets = extract_key_snippets_from_commits(
-                    story.commit_shas, project_path, max_snippets=3
-                )
+                story.key_snippets = key_snippets
 
-            # Regenerate Tripartite Codex content
-            result = transform_story_for_feed_sync(story, mode="internal")
+            # A failed transform still saves the refreshed git data (with a fallback post)
+            if isinstance(result, Exception):
+                raise result
 
             # Store structured fields
             story.hook = result.hook
@@ -5,6 +5,7 @@ Configuration management for ~/.repr/ directory.
 import hashlib
 import json
 import os
+import shutil
 import subprocess
 import tempfile
 from datetime import datetime
@@ -67,6 +68,8 @@ PROFILES_DIR = CONFIG_DIR / "profiles"
 CACHE_DIR = CONFIG_DIR / "cache"
 AUDIT_DIR = CONFIG_DIR / "audit"
 REPO_HASHES_FILE = CACHE_DIR / "repo-hashes.json"
+COMMIT_CACHE_DIR = CACHE_DIR / "commits"  # Per-commit stats/snippets, keyed by SHA
+FEED_CACHE_FILE = CACHE_DIR / "feed-posts.db"  # Generated feed posts, keyed by prompt hash
 
 # Version for config schema migrations
 CONFIG_VERSION = 3
@@ -922,6 +925,9 @@ def clear_cache() -> None:
     """Clear all cached data."""
     if REPO_HASHES_FILE.exists():
         REPO_HASHES_FILE.unlink()
+    if COMMIT_CACHE_DIR.exists():
+        shutil.rmtree(COMMIT_CACHE_DIR, ignore_errors=True)
+    FEED_CACHE_FILE.unlink(missing_ok=True)
 
 
 def get_cache_size() -> int:
@@ -383,11 +383,15 @@ class SocialDatabase:
             ))
 
     def _row_to_connection(self, row: sqlite3.Row) -> SocialConnection:
-        """Convert database row to SocialConnection."""
-        return SocialConnection(
+        """Convert database row to SocialConnection.
+
+        Rows were validated on the way in, so skip Pydantic revalidation.
+        Enum fields are stored as their values to match ``use_enum_values``.
+        """
+        return SocialConnection.model_construct(
             id=row["id"],
-            platform=SocialPlatform(row["platform"]),
-            status=ConnectionStatus(row["status"]),
+            platform=SocialPlatform(row["platform"]).value,
+            status=ConnectionStatus(row["status"]).value,
             access_token=row["access_token"],
             refresh_token=row["refresh_token"],
             token_expires_at=datetime.fromisoformat(row["token_expires_at"]) if row["token_expires_at"] else None,
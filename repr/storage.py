@@ -6,36 +6,126 @@ Stories are stored as pairs:
   - <ULID>.json: Metadata (commits, timestamps, repo, etc.)
 """
 
+import io
+import itertools
 import json
 import os
+import queue
+import sqlite3
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, TextIO
+
+from . import story_index
+
+# Prefer orjson for the metadata hot path when it is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str (orjson errors subclass JSONDecodeError)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any, pretty: bool = False) -> str:
+    """
+    Serialize to JSON, stringifying unknown types like default=str.
+
+    Story files are written compact; pass ``pretty=True`` for output meant
+    for humans (exports, `repr data format-stories --pretty`).
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option).decode("utf-8")
+    if pretty:
+        return json.dumps(obj, indent=2, default=str)
+    return json.dumps(obj, separators=(",", ":"), default=str)
+
 
 # ULID generation (simple implementation)
-import random
 import time
 
 # Base32 alphabet for ULID
 ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_ULID_TABLE = ULID_ALPHABET.encode("ascii")
+_ULID_RANDOM_MAX = (1 << 80) - 1
+
+# Monotonic mode state: last timestamp and random component handed out
+_ulid_lock = threading.Lock()
+_last_ulid_ms = 0
+_last_ulid_rand = 0
+
+
+def _next_ulid_int(monotonic: bool) -> int:
+    """Return the next ULID as a 128-bit integer (48-bit ms timestamp + 80 random bits)."""
+    global _last_ulid_ms, _last_ulid_rand
+
+    now_ms = int(time.time() * 1000)
+    if monotonic:
+        with _ulid_lock:
+            if now_ms > _last_ulid_ms:
+                rand = int.from_bytes(os.urandom(10), "big")
+            elif _last_ulid_rand < _ULID_RANDOM_MAX:
+                # Same millisecond (or clock went backwards): keep ordering
+                now_ms = _last_ulid_ms
+                rand = _last_ulid_rand + 1
+            else:
+                # Random component exhausted: borrow the next millisecond
+                now_ms = _last_ulid_ms + 1
+                rand = int.from_bytes(os.urandom(10), "big")
+            _last_ulid_ms, _last_ulid_rand = now_ms, rand
+    else:
+        rand = int.from_bytes(os.urandom(10), "big")
 
+    return (now_ms << 80) | rand
 
-def generate_ulid() -> str:
-    """Generate a ULID (Universally Unique Lexicographically Sortable Identifier)."""
-    # Timestamp component (48 bits = 10 chars)
-    timestamp_ms = int(time.time() * 1000)
-    timestamp_chars = []
-    for _ in range(10):
-        timestamp_chars.append(ULID_ALPHABET[timestamp_ms & 31])
-        timestamp_ms >>= 5
-    timestamp_part = "".join(reversed(timestamp_chars))
-    
-    # Random component (80 bits = 16 chars)
-    random_chars = [random.choice(ULID_ALPHABET) for _ in range(16)]
-    random_part = "".join(random_chars)
-    
-    return timestamp_part + random_part
+
+def _encode_ulid(n: int) -> str:
+    """Encode a 128-bit ULID integer as 26 Crockford base32 chars (5 bits each)."""
+    buf = bytearray(26)
+    for i in range(25, -1, -1):
+        buf[i] = _ULID_TABLE[n & 31]
+        n >>= 5
+    return buf.decode("ascii")
+
+
+def generate_ulid_bytes(monotonic: bool = False) -> bytes:
+    """
+    Generate a ULID in its 16-byte binary form.
+
+    Byte order is big-endian, so the raw bytes sort the same way as the
+    string form. Use this for identifiers that never reach the filesystem
+    or a user; convert with ulid_bytes_to_str() when they do.
+    """
+    return _next_ulid_int(monotonic).to_bytes(16, "big")
+
+
+def ulid_bytes_to_str(ulid: bytes) -> str:
+    """Encode a 16-byte ULID as its canonical 26-char string."""
+    return _encode_ulid(int.from_bytes(ulid, "big"))
+
+
+def generate_ulid(monotonic: bool = False) -> str:
+    """
+    Generate a ULID (Universally Unique Lexicographically Sortable Identifier).
+
+    Args:
+        monotonic: Within the same millisecond, increment the previous random
+            component instead of drawing a new one. IDs generated in a batch
+            then sort in creation order and skip the RNG call.
+    """
+    return _encode_ulid(_next_ulid_int(monotonic))
 
 
 # Storage paths
@@ -43,30 +133,348 @@ REPR_HOME = Path(os.getenv("REPR_HOME", Path.home() / ".repr"))
 STORIES_DIR = REPR_HOME / "stories"
 
 
+# Directories already created by this process (keyed by path, since tests
+# and REPR_HOME overrides can repoint them)
+_DIRS_READY: tuple[Path, Path] | None = None
+
+
 def ensure_directories() -> None:
-    """Ensure storage directories exist."""
+    """Ensure storage directories exist (mkdir once per process)."""
+    global _DIRS_READY
+    if _DIRS_READY == (REPR_HOME, STORIES_DIR):
+        return
     REPR_HOME.mkdir(exist_ok=True)
     STORIES_DIR.mkdir(exist_ok=True)
+    _DIRS_READY = (REPR_HOME, STORIES_DIR)
+
+
+# Parsed story metadata keyed by path, validated against (mtime_ns, size)
+_META_CACHE: dict[str, tuple[int, int, dict[str, Any]]] = {}
+_META_CACHE_MAX = 4096
+_META_CACHE_LOCK = threading.Lock()
+_JSON_NATIVE = (str, int, float, bool, type(None), list, dict)
+
+# Thread pool for cold metadata reads (created on first large listing).
+# Cache hits are served inline; only this many misses justify the handoff.
+_META_POOL: ThreadPoolExecutor | None = None
+_META_POOL_WORKERS = 8
+_META_PARALLEL_MIN = 64
 
 
-def _atomic_write(path: Path, content: str) -> None:
-    """Write content atomically using temp file + rename."""
+def _load_meta_cached(
+    meta_path: str | os.PathLike, st: os.stat_result | None = None
+) -> dict[str, Any]:
+    """
+    Load story metadata, reusing the last parse if the file is unchanged.
+
+    Pass ``st`` when a stat result is already at hand (e.g. from a
+    DirEntry) to skip the extra syscall. Returns a shallow copy so callers
+    can annotate the dict freely. Raises json.JSONDecodeError / OSError
+    like a plain read would.
+    """
+    key = os.fspath(meta_path)
+    if st is None:
+        st = os.stat(key)
+    cached = _META_CACHE.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return dict(cached[2])
+
+    with open(key, "rb") as f:
+        metadata = _json_loads(f.read())
+    with _META_CACHE_LOCK:
+        if key not in _META_CACHE and len(_META_CACHE) >= _META_CACHE_MAX:
+            # FIFO eviction: dicts preserve insertion order
+            del _META_CACHE[next(iter(_META_CACHE))]
+        _META_CACHE[key] = (st.st_mtime_ns, st.st_size, metadata)
+    return dict(metadata)
+
+
+def _load_meta_entry(entry: os.DirEntry) -> dict[str, Any] | None:
+    """Load metadata for a scanned .json entry, or None if unreadable."""
+    try:
+        return _load_meta_cached(entry.path, entry.stat())
+    except (json.JSONDecodeError, OSError):
+        return None
+
+
+def _load_meta_entries(entries: list[os.DirEntry]) -> list[dict[str, Any] | None]:
+    """
+    Load metadata for many entries, in order.
+
+    Unchanged files are served from the cache inline. Cold reads are
+    IO-bound, so a large set of misses is split into one chunk per worker
+    of a small shared thread pool; a few misses aren't worth the handoff.
+    """
+    global _META_POOL
+    results: list[dict[str, Any] | None] = [None] * len(entries)
+    misses: list[int] = []
+    for i, entry in enumerate(entries):
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        cached = _META_CACHE.get(entry.path)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            results[i] = dict(cached[2])
+        else:
+            misses.append(i)
+
+    if len(misses) < _META_PARALLEL_MIN:
+        for i in misses:
+            results[i] = _load_meta_entry(entries[i])
+        return results
+
+    if _META_POOL is None:
+        _META_POOL = ThreadPoolExecutor(
+            max_workers=_META_POOL_WORKERS, thread_name_prefix="repr-meta"
+        )
+    chunks = [misses[k::_META_POOL_WORKERS] for k in range(_META_POOL_WORKERS)]
+    futures = [
+        _META_POOL.submit(lambda chunk: [_load_meta_entry(entries[i]) for i in chunk], chunk)
+        for chunk in chunks
+    ]
+    for chunk, future in zip(chunks, futures):
+        for i, metadata in zip(chunk, future.result()):
+            results[i] = metadata
+    return results
+
+
+def _remember_meta(meta_path: Path, metadata: dict[str, Any]) -> None:
+    """Cache metadata just written to meta_path so the next read skips parsing."""
+    key = os.fspath(meta_path)
+    try:
+        st = os.stat(key)
+    except OSError:
+        _META_CACHE.pop(key, None)
+        return
+    with _META_CACHE_LOCK:
+        _META_CACHE[key] = (st.st_mtime_ns, st.st_size, metadata)
+
+
+def _index_story(story_id: str, metadata: dict[str, Any] | None) -> None:
+    """
+    Update the story index after a write (None = story deleted).
+
+    Best effort: if the index can't be updated here, the next listing
+    reconciles it from the files on disk.
+    """
+    try:
+        if metadata is None:
+            story_index.delete(STORIES_DIR, story_id)
+        else:
+            story_index.upsert(STORIES_DIR, story_id, metadata)
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def _index_stories(items: list[tuple[str, dict[str, Any]]]) -> None:
+    """Index many (story_id, metadata) items after a bulk write (best effort)."""
+    try:
+        story_index.upsert_many(STORIES_DIR, items)
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def rebuild_story_index() -> None:
+    """Rebuild the story metadata index from the files in STORIES_DIR."""
+    ensure_directories()
+    story_index.rebuild_index(STORIES_DIR, _load_meta_entries)
+
+
+def _invalidate_meta_cache(meta_path: Path) -> None:
+    """Drop a cached metadata entry after the file is written or removed."""
+    _META_CACHE.pop(os.fspath(meta_path), None)
+
+
+def _iter_story_entries(
+    stories_dir: Path | None = None,
+) -> list[tuple[str, os.DirEntry | None, os.DirEntry | None]]:
+    """
+    Scan the stories directory once, grouping files by story ID.
+
+    Returns (story_id, md_entry, json_entry) tuples; either entry may be
+    None when only one half of the pair exists. DirEntry objects carry
+    their own stat cache, so callers avoid a second syscall per file.
+    """
+    stories_dir = STORIES_DIR if stories_dir is None else stories_dir
+    grouped: dict[str, list[os.DirEntry | None]] = {}
+    try:
+        with os.scandir(stories_dir) as it:
+            for entry in it:
+                name = entry.name
+                if not entry.is_file():
+                    continue
+                if name.endswith(".md"):
+                    grouped.setdefault(name[:-3], [None, None])[0] = entry
+                elif name.endswith(".json"):
+                    grouped.setdefault(name[:-5], [None, None])[1] = entry
+    except FileNotFoundError:
+        return []
+    return [(story_id, md, meta) for story_id, (md, meta) in grouped.items()]
+
+
+# Max encoded stories waiting for the writer thread during bulk restore/import
+_WRITE_QUEUE_SIZE = 32
+
+# Temp file names for atomic writes: pid + counter is unique per process, so
+# O_EXCL creation almost never collides and skips mkstemp's random-name retries
+_TMP_COUNTER = itertools.count()
+_TMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_CLOEXEC", 0)
+
+
+def _mkstemp(directory: Path) -> tuple[int, str]:
+    """Create a temp file in directory for an atomic write; returns (fd, path)."""
+    if os.name != "nt":
+        tmp_path = os.path.join(
+            directory, f".repr-{os.getpid()}-{next(_TMP_COUNTER)}.tmp"
+        )
+        try:
+            return os.open(tmp_path, _TMP_FLAGS, 0o600), tmp_path
+        except FileExistsError:
+            pass  # Stale file from a recycled pid: let mkstemp pick a name
+    return tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+
+def _fsync_dir(path: Path) -> None:
+    """Flush a directory entry table to disk so renames survive a crash."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # Windows: directories can't be opened for fsync
+    dir_fd = os.open(path, os.O_DIRECTORY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def _atomic_write(path: Path, content: str, durable: bool = False) -> None:
+    """
+    Write content atomically using temp file + rename.
+
+    With ``durable=True`` the file and its parent directory are fsynced so
+    the new content survives a crash. Bulk writers leave it off and call
+    _fsync_dir() once at the end instead.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    fd, tmp_path = _mkstemp(path.parent)
     try:
-        with os.fdopen(fd, "w") as f:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
             f.write(content)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
         os.replace(tmp_path, path)
     except Exception:
         if os.path.exists(tmp_path):
             os.unlink(tmp_path)
         raise
+    if durable:
+        _fsync_dir(path.parent)
+
+
+def _atomic_write_pair(
+    md_path: Path,
+    md_content: str,
+    meta_path: Path,
+    meta_content: str,
+    durable: bool = False,
+) -> None:
+    """
+    Write a story's .md and .json files as one temp-file/rename group.
+
+    Both temp files are written (and fsynced when durable) before either is
+    renamed into place, and the shared parent directory is fsynced once.
+    """
+    tmp_paths: list[str] = []
+    try:
+        for path, content in ((md_path, md_content), (meta_path, meta_content)):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = _mkstemp(path.parent)
+            tmp_paths.append(tmp_path)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+        os.replace(tmp_paths[0], md_path)
+        os.replace(tmp_paths[1], meta_path)
+    except Exception:
+        for tmp_path in tmp_paths:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        raise
+    if durable:
+        _fsync_dir(meta_path.parent)
+        if md_path.parent != meta_path.parent:
+            _fsync_dir(md_path.parent)
+
+
+def _stamp_metadata(metadata: dict[str, Any], story_id: str, now: str) -> None:
+    """Add the ID and timestamps every saved story carries."""
+    if "created_at" not in metadata:
+        metadata["created_at"] = now
+    metadata["updated_at"] = now
+    metadata["id"] = story_id
+
+
+def _write_story_pairs(pairs: Iterable[tuple[str, str, str, dict[str, Any]]]) -> int:
+    """
+    Write (story_id, content, metadata_json, metadata) items as non-durable
+    file pairs, then index them.
+    
+    Items are pulled from ``pairs`` on the calling thread (so any encoding a
+    generator does there overlaps with disk I/O) and handed through a
+    bounded queue to a single writer thread. The caller fsyncs the
+    directory once afterwards.
+    
+    Returns:
+        Number of stories written
+    """
+    jobs: queue.Queue = queue.Queue(maxsize=_WRITE_QUEUE_SIZE)
+    errors: list[BaseException] = []
+    stories_dir = STORIES_DIR
+    
+    def writer() -> None:
+        while True:
+            item = jobs.get()
+            if item is None:
+                return
+            if errors:
+                continue  # Drain remaining items after a failure
+            story_id, content, meta_json, _ = item
+            try:
+                _atomic_write_pair(
+                    stories_dir / f"{story_id}.md", content,
+                    stories_dir / f"{story_id}.json", meta_json,
+                )
+            except BaseException as e:
+                errors.append(e)
+    
+    thread = threading.Thread(target=writer, name="repr-story-writer", daemon=True)
+    thread.start()
+    written: list[tuple[str, dict[str, Any]]] = []
+    try:
+        for item in pairs:
+            if errors:
+                break
+            jobs.put(item)
+            written.append((item[0], item[3]))
+    finally:
+        jobs.put(None)
+        thread.join()
+        for story_id, _ in written:
+            _invalidate_meta_cache(stories_dir / f"{story_id}.json")
+    
+    if errors:
+        raise errors[0]
+    _index_stories(written)
+    return len(written)
 
 
 def save_story(
     content: str,
     metadata: dict[str, Any],
     story_id: str | None = None,
+    durable: bool = True,
 ) -> str:
     """
     Save a story to ~/.repr/stories/
@@ -75,6 +483,7 @@ def save_story(
         content: Markdown content of the story
         metadata: Story metadata (commits, repo, timestamps, etc.)
         story_id: Optional ULID (generates new one if not provided)
+        durable: fsync each file; bulk callers pass False and sync once
     
     Returns:
         Story ID (ULID)
@@ -84,24 +493,39 @@ def save_story(
     if story_id is None:
         story_id = generate_ulid()
     
-    # Add timestamps to metadata
-    now = datetime.now().isoformat()
-    if "created_at" not in metadata:
-        metadata["created_at"] = now
-    metadata["updated_at"] = now
-    metadata["id"] = story_id
+    _stamp_metadata(metadata, story_id, datetime.now().isoformat())
     
-    # Write markdown file
+    # Write markdown + metadata files together
     md_path = STORIES_DIR / f"{story_id}.md"
-    _atomic_write(md_path, content)
-    
-    # Write metadata file
     meta_path = STORIES_DIR / f"{story_id}.json"
-    _atomic_write(meta_path, json.dumps(metadata, indent=2, default=str))
+    _atomic_write_pair(
+        md_path, content,
+        meta_path, _json_dumps(metadata),
+        durable=durable,
+    )
+    _invalidate_meta_cache(meta_path)
+    _index_story(story_id, metadata)
     
     return story_id
 
 
+def load_story_content(story_id: str) -> str | None:
+    """
+    Load only a story's Markdown content, without touching its metadata.
+    
+    Args:
+        story_id: Story ULID
+    
+    Returns:
+        Markdown content or None if not found
+    """
+    try:
+        with open(STORIES_DIR / f"{story_id}.md", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
 def load_story(story_id: str) -> tuple[str, dict[str, Any]] | None:
     """
     Load a story by ID.
@@ -112,20 +536,16 @@ def load_story(story_id: str) -> tuple[str, dict[str, Any]] | None:
     Returns:
         Tuple of (content, metadata) or None if not found
     """
-    md_path = STORIES_DIR / f"{story_id}.md"
-    meta_path = STORIES_DIR / f"{story_id}.json"
-    
-    if not md_path.exists():
+    content = load_story_content(story_id)
+    if content is None:
         return None
     
-    content = md_path.read_text()
-    
     metadata = {}
-    if meta_path.exists():
-        try:
-            metadata = json.loads(meta_path.read_text())
-        except json.JSONDecodeError:
-            pass
+    try:
+        with open(STORIES_DIR / f"{story_id}.json", "rb") as f:
+            metadata = _json_loads(f.read())
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
     
     return content, metadata
 
@@ -152,15 +572,24 @@ def delete_story(story_id: str) -> bool:
     if meta_path.exists():
         meta_path.unlink()
         deleted = True
+    _invalidate_meta_cache(meta_path)
+    _index_story(story_id, None)
     
     return deleted
 
 
+@lru_cache(maxsize=4096)
+def _parse_created_at(created_at: str) -> datetime:
+    """Parse a stored ISO timestamp (Python 3.10 fromisoformat rejects "Z")."""
+    return datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+
+
 def list_stories(
     repo_name: str | None = None,
     since: datetime | None = None,
     needs_review: bool = False,
     limit: int | None = None,
+    include_content_stats: bool = False,
 ) -> list[dict[str, Any]]:
     """
     List all stories with metadata.
@@ -170,43 +599,126 @@ def list_stories(
         since: Filter by creation date
         needs_review: Only show stories needing review
         limit: Maximum stories to return
+        include_content_stats: Add _has_content/_content_size from the .md file
     
     Returns:
         List of story metadata dicts (sorted by creation date, newest first)
     """
     ensure_directories()
     
+    try:
+        return _list_stories_indexed(
+            repo_name, since, needs_review, limit, include_content_stats
+        )
+    except sqlite3.Error:
+        # Index unavailable (e.g. read-only home): fall back to a full scan
+        return _list_stories_scan(
+            repo_name, since, needs_review, limit, include_content_stats
+        )
+
+
+def _story_predicates(
+    repo_name: str | None,
+    since: datetime | None,
+    needs_review: bool,
+) -> list[Callable[[dict[str, Any]], bool]]:
+    """Build the active list_stories filters once instead of re-checking each per story."""
+    predicates = []
+    if repo_name:
+        predicates.append(lambda m: m.get("repo_name") == repo_name)
+    if since is not None:
+        def _since_ok(m: dict[str, Any]) -> bool:
+            created_at = m.get("created_at")
+            return not created_at or _parse_created_at(created_at) >= since
+        predicates.append(_since_ok)
+    if needs_review:
+        predicates.append(lambda m: m.get("needs_review", False))
+    return predicates
+
+
+def _list_stories_indexed(
+    repo_name: str | None,
+    since: datetime | None,
+    needs_review: bool,
+    limit: int | None,
+    include_content_stats: bool,
+) -> list[dict[str, Any]]:
+    """List stories via the SQLite metadata index, reading only matching files."""
+    predicates = _story_predicates(repo_name, since, needs_review)
     stories = []
+    changed: list[tuple[str, dict[str, Any], os.stat_result]] = []
     
-    for meta_path in STORIES_DIR.glob("*.json"):
-        try:
-            metadata = json.loads(meta_path.read_text())
-            
-            # Apply filters
-            if repo_name and metadata.get("repo_name") != repo_name:
+    with story_index.connect(STORIES_DIR) as conn:
+        story_index.sync(conn, STORIES_DIR, _load_meta_entries)
+        
+        # `since` is compared as datetimes (stored timestamps mix naive and
+        # Z-suffixed forms), so it is applied here rather than in SQL
+        rows = story_index.query(conn, repo_name=repo_name, needs_review=needs_review)
+        for story_id, created_at, mtime_ns, size in rows:
+            if since is not None and created_at and _parse_created_at(created_at) < since:
                 continue
             
-            if since:
-                created_at = metadata.get("created_at")
-                if created_at:
-                    created = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-                    if created < since:
-                        continue
-            
-            if needs_review and not metadata.get("needs_review", False):
+            meta_path = STORIES_DIR / f"{story_id}.json"
+            try:
+                st = os.stat(meta_path)
+                metadata = _load_meta_cached(meta_path, st)
+            except (json.JSONDecodeError, OSError):
                 continue
             
-            # Check if content file exists
-            story_id = meta_path.stem
-            md_path = STORIES_DIR / f"{story_id}.md"
-            if md_path.exists():
-                metadata["_has_content"] = True
-                metadata["_content_size"] = md_path.stat().st_size
+            # Edited in place since it was indexed: the row may be out of
+            # date, so re-check the filters against the file and fix the row
+            if st.st_mtime_ns != mtime_ns or st.st_size != size:
+                changed.append((story_id, metadata, st))
+                if predicates and not all(pred(metadata) for pred in predicates):
+                    continue
             
-            stories.append(metadata)
+            if include_content_stats:
+                try:
+                    metadata["_content_size"] = os.stat(STORIES_DIR / f"{story_id}.md").st_size
+                    metadata["_has_content"] = True
+                except OSError:
+                    pass
             
-        except (json.JSONDecodeError, IOError):
+            stories.append(metadata)
+            if limit and len(stories) >= limit:
+                break
+        
+        if changed:
+            story_index.update_rows(conn, changed)
+    
+    return stories
+
+
+def _list_stories_scan(
+    repo_name: str | None,
+    since: datetime | None,
+    needs_review: bool,
+    limit: int | None,
+    include_content_stats: bool,
+) -> list[dict[str, Any]]:
+    """List stories by scanning and parsing every metadata file."""
+    stories = []
+    predicates = _story_predicates(repo_name, since, needs_review)
+    
+    pairs = [(md, meta) for _, md, meta in _iter_story_entries() if meta is not None]
+    loaded = _load_meta_entries([meta for _, meta in pairs])
+    
+    for (md_entry, _), metadata in zip(pairs, loaded):
+        if metadata is None:
             continue
+        
+        if predicates and not all(pred(metadata) for pred in predicates):
+            continue
+        
+        # Check if content file exists
+        if include_content_stats and md_entry is not None:
+            try:
+                metadata["_content_size"] = md_entry.stat().st_size
+                metadata["_has_content"] = True
+            except OSError:
+                pass
+        
+        stories.append(metadata)
     
     # Sort by creation date (newest first)
     stories.sort(
@@ -237,13 +749,22 @@ def update_story_metadata(story_id: str, updates: dict[str, Any]) -> bool:
         return False
     
     try:
-        metadata = json.loads(meta_path.read_text())
+        metadata = _load_meta_cached(meta_path)
         metadata.update(updates)
         metadata["updated_at"] = datetime.now().isoformat()
-        _atomic_write(meta_path, json.dumps(metadata, indent=2, default=str))
-        return True
+        _atomic_write(meta_path, _json_dumps(metadata), durable=True)
     except (json.JSONDecodeError, IOError):
+        _invalidate_meta_cache(meta_path)
         return False
+    
+    # Keep the written dict warm unless an update value would read back
+    # differently (e.g. a datetime serialized via default=str)
+    if all(isinstance(v, _JSON_NATIVE) for v in updates.values()):
+        _remember_meta(meta_path, metadata)
+    else:
+        _invalidate_meta_cache(meta_path)
+    _index_story(story_id, metadata)
+    return True
 
 
 def get_processed_commit_shas(repo_name: str | None = None) -> set[str]:
@@ -260,20 +781,19 @@ def get_processed_commit_shas(repo_name: str | None = None) -> set[str]:
     
     processed_shas = set()
     
-    for meta_path in STORIES_DIR.glob("*.json"):
-        try:
-            metadata = json.loads(meta_path.read_text())
-            
-            # Filter by repo if specified
-            if repo_name and metadata.get("repo_name") != repo_name:
-                continue
-            
-            # Collect commit SHAs from this story
-            commit_shas = metadata.get("commit_shas", [])
-            processed_shas.update(commit_shas)
-            
-        except (json.JSONDecodeError, IOError):
+    meta_entries = [meta for _, _, meta in _iter_story_entries() if meta is not None]
+    
+    for metadata in _load_meta_entries(meta_entries):
+        if metadata is None:
             continue
+        
+        # Filter by repo if specified
+        if repo_name and metadata.get("repo_name") != repo_name:
+            continue
+        
+        # Collect commit SHAs from this story
+        commit_shas = metadata.get("commit_shas", [])
+        processed_shas.update(commit_shas)
     
     return processed_shas
 
@@ -297,80 +817,176 @@ def get_stories_needing_review() -> list[dict[str, Any]]:
 def get_story_count() -> int:
     """Get total number of stories."""
     ensure_directories()
-    return len(list(STORIES_DIR.glob("*.md")))
+    return sum(1 for _, md_entry, _ in _iter_story_entries() if md_entry is not None)
 
 
-# ============================================================================
-# Backup & Restore
-# ============================================================================
-
-def backup_all_data() -> dict[str, Any]:
+def format_story_files(pretty: bool = True) -> int:
     """
-    Create a full backup of all repr data.
+    Rewrite every story metadata file as indented or compact JSON.
+    
+    Story files are written compact by default; this makes them readable
+    for manual inspection (or compacts them again).
+    
+    Args:
+        pretty: Indent with two spaces if True, compact if False
     
     Returns:
-        Dict containing all data (can be serialized to JSON)
+        Number of metadata files rewritten
     """
-    from .config import load_config, PROFILES_DIR, CACHE_DIR
-    from .privacy import load_audit_log
-    
     ensure_directories()
     
-    # Backup stories
-    stories_backup = []
-    for md_path in STORIES_DIR.glob("*.md"):
-        story_id = md_path.stem
-        meta_path = STORIES_DIR / f"{story_id}.json"
+    formatted = 0
+    for _, _, meta_entry in _iter_story_entries():
+        if meta_entry is None:
+            continue
+        try:
+            with open(meta_entry.path, "rb") as f:
+                metadata = _json_loads(f.read())
+        except (json.JSONDecodeError, OSError):
+            continue
+        _atomic_write(Path(meta_entry.path), _json_dumps(metadata, pretty=pretty))
+        _invalidate_meta_cache(meta_entry.path)
+        formatted += 1
+    
+    if formatted:
+        _fsync_dir(STORIES_DIR)
+    return formatted
+
+
+# ============================================================================
+# Backup & Restore
+# ============================================================================
+
+def _iter_backup_stories():
+    """Yield story backup records one at a time."""
+    for story_id, md_entry, meta_entry in _iter_story_entries():
+        if md_entry is None:
+            continue
         
-        content = md_path.read_text()
+        with open(md_entry.path, encoding="utf-8") as f:
+            content = f.read()
         metadata = {}
-        if meta_path.exists():
+        if meta_entry is not None:
             try:
-                metadata = json.loads(meta_path.read_text())
+                with open(meta_entry.path, "rb") as f:
+                    metadata = _json_loads(f.read())
             except json.JSONDecodeError:
                 pass
         
-        stories_backup.append({
+        yield {
             "id": story_id,
             "content": content,
             "metadata": metadata,
-        })
+        }
+
+
+def _iter_backup_profiles():
+    """Yield profile backup records one at a time."""
+    from .config import PROFILES_DIR
     
-    # Backup profiles
-    profiles_backup = []
-    for profile_path in PROFILES_DIR.glob("*.md"):
-        content = profile_path.read_text()
-        meta_path = profile_path.with_suffix(".meta.json")
+    try:
+        with os.scandir(PROFILES_DIR) as it:
+            names = {entry.name for entry in it if entry.is_file()}
+    except FileNotFoundError:
+        return
+    
+    for filename in names:
+        if not filename.endswith(".md"):
+            continue
+        name = filename[:-3]
+        with open(os.path.join(PROFILES_DIR, filename)) as f:
+            content = f.read()
         metadata = {}
-        if meta_path.exists():
+        meta_name = f"{name}.meta.json"
+        if meta_name in names:
             try:
-                metadata = json.loads(meta_path.read_text())
+                with open(os.path.join(PROFILES_DIR, meta_name), "rb") as f:
+                    metadata = _json_loads(f.read())
             except json.JSONDecodeError:
                 pass
         
-        profiles_backup.append({
-            "name": profile_path.stem,
+        yield {
+            "name": name,
             "content": content,
             "metadata": metadata,
-        })
+        }
+
+
+def _backup_settings() -> tuple[dict[str, Any], list]:
+    """Get config (without sensitive data) and the audit log for a backup."""
+    from .config import load_config
+    from .privacy import load_audit_log
     
-    # Get config (without sensitive data)
     config = load_config()
     config_backup = {k: v for k, v in config.items() if k != "auth"}
+    return config_backup, load_audit_log()
+
+
+def _write_json_array(fp: TextIO, records) -> int:
+    """Write records to fp as a JSON array, one record at a time."""
+    count = 0
+    fp.write("[")
+    for record in records:
+        fp.write(",\n" if count else "\n")
+        fp.write(_json_dumps(record, pretty=True))
+        count += 1
+    fp.write("\n]" if count else "]")
+    return count
+
+
+def backup_all_data() -> dict[str, Any]:
+    """
+    Create a full backup of all repr data.
+    
+    Loads everything into memory; use write_backup() to stream large
+    archives straight to a file.
+    
+    Returns:
+        Dict containing all data (can be serialized to JSON)
+    """
+    ensure_directories()
     
-    # Get audit log
-    audit_log = load_audit_log()
+    config_backup, audit_log = _backup_settings()
     
     return {
         "version": "1.0",
         "exported_at": datetime.now().isoformat(),
-        "stories": stories_backup,
-        "profiles": profiles_backup,
+        "stories": list(_iter_backup_stories()),
+        "profiles": list(_iter_backup_profiles()),
         "config": config_backup,
         "audit_log": audit_log,
     }
 
 
+def write_backup(fp: TextIO) -> dict[str, int]:
+    """
+    Stream a full backup of all repr data to a text file as JSON.
+    
+    Produces the same document as backup_all_data(), but holds only one
+    story or profile in memory at a time.
+    
+    Args:
+        fp: Writable text file handle
+    
+    Returns:
+        Dict with counts of written stories and profiles
+    """
+    ensure_directories()
+    
+    config_backup, audit_log = _backup_settings()
+    
+    fp.write('{\n"version": "1.0",\n')
+    fp.write(f'"exported_at": {_json_dumps(datetime.now().isoformat())},\n')
+    fp.write('"stories": ')
+    stories = _write_json_array(fp, _iter_backup_stories())
+    fp.write(',\n"profiles": ')
+    profiles = _write_json_array(fp, _iter_backup_profiles())
+    fp.write(f',\n"config": {_json_dumps(config_backup, pretty=True)}')
+    fp.write(f',\n"audit_log": {_json_dumps(audit_log, pretty=True)}\n}}\n')
+    
+    return {"stories": stories, "profiles": profiles}
+
+
 def restore_from_backup(backup_data: dict[str, Any], merge: bool = True) -> dict[str, int]:
     """
     Restore data from a backup.
@@ -392,22 +1008,29 @@ def restore_from_backup(backup_data: dict[str, Any], merge: bool = True) -> dict
         "config_keys": 0,
     }
     
-    # Restore stories
-    for story in backup_data.get("stories", []):
-        story_id = story.get("id")
-        if not story_id:
-            continue
-        
-        # Check if exists
-        md_path = STORIES_DIR / f"{story_id}.md"
-        if md_path.exists() and merge:
-            continue  # Skip existing in merge mode
-        
-        # Write story
-        _atomic_write(md_path, story.get("content", ""))
-        meta_path = STORIES_DIR / f"{story_id}.json"
-        _atomic_write(meta_path, json.dumps(story.get("metadata", {}), indent=2))
-        restored["stories"] += 1
+    # Restore stories: one directory scan up front, non-durable writes,
+    # then a single directory fsync once the whole batch is in place
+    existing_ids = {
+        story_id for story_id, md_entry, _ in _iter_story_entries() if md_entry is not None
+    }
+    
+    def encoded_stories():
+        for story in backup_data.get("stories", []):
+            story_id = story.get("id")
+            if not story_id:
+                continue
+            
+            if merge and story_id in existing_ids:
+                continue  # Skip existing in merge mode
+            
+            existing_ids.add(story_id)
+            metadata = story.get("metadata", {})
+            yield story_id, story.get("content", ""), _json_dumps(metadata), metadata
+    
+    restored["stories"] = _write_story_pairs(encoded_stories())
+    
+    if restored["stories"]:
+        _fsync_dir(STORIES_DIR)
     
     # Restore profiles
     for profile in backup_data.get("profiles", []):
@@ -422,7 +1045,7 @@ def restore_from_backup(backup_data: dict[str, Any], merge: bool = True) -> dict
         profile_path.write_text(profile.get("content", ""))
         if profile.get("metadata"):
             meta_path = profile_path.with_suffix(".meta.json")
-            _atomic_write(meta_path, json.dumps(profile.get("metadata"), indent=2))
+            _atomic_write(meta_path, _json_dumps(profile.get("metadata")))
         restored["profiles"] += 1
     
     # Restore config (merge non-sensitive keys)
@@ -449,6 +1072,19 @@ def restore_from_backup(backup_data: dict[str, Any], merge: bool = True) -> dict
     return restored
 
 
+def export_stories_json_stream(fp: TextIO) -> int:
+    """
+    Stream all stories to a text file as a JSON array.
+    
+    Args:
+        fp: Writable text file handle
+    
+    Returns:
+        Number of stories written
+    """
+    return _write_json_array(fp, _iter_backup_stories())
+
+
 def export_stories_json() -> str:
     """
     Export all stories as JSON.
@@ -456,19 +1092,9 @@ def export_stories_json() -> str:
     Returns:
         JSON string of all stories
     """
-    stories = []
-    for md_path in STORIES_DIR.glob("*.md"):
-        story_id = md_path.stem
-        result = load_story(story_id)
-        if result:
-            content, metadata = result
-            stories.append({
-                "id": story_id,
-                "content": content,
-                "metadata": metadata,
-            })
-    
-    return json.dumps(stories, indent=2, default=str)
+    buf = io.StringIO()
+    export_stories_json_stream(buf)
+    return buf.getvalue()
 
 
 def import_stories_json(json_data: str, merge: bool = True) -> int:
@@ -483,26 +1109,36 @@ def import_stories_json(json_data: str, merge: bool = True) -> int:
         Number of stories imported
     """
     try:
-        stories = json.loads(json_data)
+        stories = _json_loads(json_data)
     except json.JSONDecodeError:
         return 0
     
-    imported = 0
-    for story in stories:
-        story_id = story.get("id")
-        
-        # Generate new ID if not provided or if exists and not merging
-        md_path = STORIES_DIR / f"{story_id}.md" if story_id else None
-        if not story_id or (md_path and md_path.exists() and not merge):
-            story_id = generate_ulid()
-        elif md_path and md_path.exists() and merge:
-            continue  # Skip existing
-        
-        # Save story
-        content = story.get("content", "")
-        metadata = story.get("metadata", {})
-        save_story(content, metadata, story_id)
-        imported += 1
+    ensure_directories()
+    existing_ids = {
+        story_id for story_id, md_entry, _ in _iter_story_entries() if md_entry is not None
+    }
+    now = datetime.now().isoformat()
+    
+    def encoded_stories():
+        for story in stories:
+            story_id = story.get("id")
+            
+            # Generate new ID if not provided or if exists and not merging
+            exists = bool(story_id) and story_id in existing_ids
+            if not story_id or (exists and not merge):
+                story_id = generate_ulid(monotonic=True)
+            elif exists and merge:
+                continue  # Skip existing
+            
+            metadata = story.get("metadata", {})
+            _stamp_metadata(metadata, story_id, now)
+            existing_ids.add(story_id)
+            yield story_id, story.get("content", ""), _json_dumps(metadata), metadata
+    
+    imported = _write_story_pairs(encoded_stories())
+    
+    if imported:
+        _fsync_dir(STORIES_DIR)
     
     return imported
 
@@ -520,16 +1156,26 @@ def get_storage_stats() -> dict[str, Any]:
     
     def dir_size(path: Path) -> int:
         total = 0
-        if path.exists():
-            for f in path.rglob("*"):
-                if f.is_file():
-                    total += f.stat().st_size
+        stack = [os.fspath(path)]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
         return total
     
-    def file_count(path: Path, pattern: str = "*") -> int:
-        if path.exists():
-            return len(list(path.glob(pattern)))
-        return 0
+    def file_count(path: Path, suffix: str) -> int:
+        try:
+            with os.scandir(path) as it:
+                return sum(1 for entry in it if entry.name.endswith(suffix))
+        except (FileNotFoundError, NotADirectoryError):
+            return 0
     
     stories_size = dir_size(STORIES_DIR)
     profiles_size = dir_size(PROFILES_DIR)
@@ -538,12 +1184,12 @@ def get_storage_stats() -> dict[str, Any]:
     
     return {
         "stories": {
-            "count": file_count(STORIES_DIR, "*.md"),
+            "count": file_count(STORIES_DIR, ".md"),
             "size_bytes": stories_size,
             "path": str(STORIES_DIR),
         },
         "profiles": {
-            "count": file_count(PROFILES_DIR, "*.md"),
+            "count": file_count(PROFILES_DIR, ".md"),
             "size_bytes": profiles_size,
             "path": str(PROFILES_DIR),
         },
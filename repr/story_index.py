@@ -0,0 +1,270 @@
+"""
+SQLite index over story metadata in ~/.repr/stories/.
+
+The .json metadata files stay the source of truth. This index only keeps the
+columns list_stories() filters and sorts on, so a listing runs an indexed
+query and opens just the matching files instead of parsing every story on
+disk.
+
+The index lives next to the stories directory (~/.repr/stories.index.db) and
+is kept current by storage's write paths (save, update, delete, restore,
+import). Changes made behind its back are reconciled cheaply:
+
+- Files added or removed: each listing checks the stories directory mtime
+  and only rescans (stat-only, re-parsing changed files) when it moved.
+- Files edited in place (which leaves the directory mtime alone): rows a
+  listing reads are compared against the file's (mtime_ns, size); storage
+  re-checks its filters against the file and updates the row.
+
+An edit that makes a story match a filter it didn't match before is only
+seen after the next rescan; rebuild_index() (`repr data reindex`) forces one.
+"""
+
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+INDEX_FILE = "stories.index.db"
+
+# An mtime this close to "now" may still be shared by a write that lands in
+# the same timestamp tick, so it isn't trusted as a change marker.
+_RACY_WINDOW_NS = 2_000_000_000
+
+MetaLoader = Callable[[list[os.DirEntry]], list[dict[str, Any] | None]]
+
+# Index databases whose schema already exists (init_db runs once per process)
+_READY: set[str] = set()
+
+
+def get_index_path(stories_dir: Path) -> Path:
+    """Get the index database path for a stories directory."""
+    return stories_dir.parent / INDEX_FILE
+
+
+@contextmanager
+def connect(stories_dir: Path):
+    """Context manager for index connections (one transaction)."""
+    path = os.fspath(get_index_path(stories_dir))
+    if path in _READY and not os.path.exists(path):
+        _READY.discard(path)  # Deleted underneath us (e.g. `repr data clear`)
+    conn = sqlite3.connect(path, timeout=30.0)
+    # The index is rebuildable from the JSON files, so skip fsync on commit
+    conn.execute("PRAGMA synchronous=OFF")
+    try:
+        if path not in _READY:
+            init_db(conn)
+            _READY.add(path)
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def init_db(conn: sqlite3.Connection) -> None:
+    """Create the index tables if they don't exist."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS story_index (
+            id TEXT PRIMARY KEY,
+            repo_name TEXT,
+            created_at TEXT NOT NULL DEFAULT '',
+            needs_review INTEGER NOT NULL DEFAULT 0,
+            pushed_at TEXT,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_story_index_created ON story_index(created_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_story_index_repo ON story_index(repo_name, created_at)"
+    )
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS index_state (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    """)
+
+
+def _is_racy(mtime_ns: int) -> bool:
+    return time.time_ns() - mtime_ns <= _RACY_WINDOW_NS
+
+
+def _row_values(story_id: str, metadata: dict[str, Any], st: os.stat_result) -> tuple:
+    """Extract the indexed columns from story metadata."""
+    created_at = metadata.get("created_at")
+    repo_name = metadata.get("repo_name")
+    pushed_at = metadata.get("pushed_at")
+    return (
+        story_id,
+        repo_name if isinstance(repo_name, str) else None,
+        created_at if isinstance(created_at, str) else "",
+        1 if metadata.get("needs_review", False) else 0,
+        str(pushed_at) if pushed_at else None,
+        # A racy mtime is stored as 0 so the file is checked again later
+        0 if _is_racy(st.st_mtime_ns) else st.st_mtime_ns,
+        st.st_size,
+    )
+
+
+_UPSERT_SQL = """
+    INSERT OR REPLACE INTO story_index (
+        id, repo_name, created_at, needs_review, pushed_at, mtime_ns, size
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def update_rows(
+    conn: sqlite3.Connection,
+    rows: Iterable[tuple[str, dict[str, Any], os.stat_result]],
+) -> None:
+    """Index (story_id, metadata, stat of its .json file) items."""
+    conn.executemany(_UPSERT_SQL, (_row_values(*row) for row in rows))
+
+
+def upsert(stories_dir: Path, story_id: str, metadata: dict[str, Any]) -> None:
+    """Index a story after its metadata file was written."""
+    upsert_many(stories_dir, [(story_id, metadata)])
+
+
+def upsert_many(
+    stories_dir: Path, items: Iterable[tuple[str, dict[str, Any]]]
+) -> None:
+    """Index several stories after their metadata files were written."""
+    rows = [
+        (story_id, metadata, os.stat(stories_dir / f"{story_id}.json"))
+        for story_id, metadata in items
+    ]
+    with connect(stories_dir) as conn:
+        update_rows(conn, rows)
+
+
+def delete(stories_dir: Path, story_id: str) -> None:
+    """Remove a story from the index."""
+    with connect(stories_dir) as conn:
+        conn.execute("DELETE FROM story_index WHERE id = ?", (story_id,))
+
+
+def _get_state(conn: sqlite3.Connection, key: str) -> str | None:
+    row = conn.execute("SELECT value FROM index_state WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _set_state(conn: sqlite3.Connection, key: str, value: str | None) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO index_state (key, value) VALUES (?, ?)", (key, value)
+    )
+
+
+def sync(
+    conn: sqlite3.Connection,
+    stories_dir: Path,
+    load_many: MetaLoader,
+    force: bool = False,
+) -> None:
+    """
+    Pick up stories added or removed behind the index's back.
+
+    Skipped entirely while the stories directory mtime matches the last
+    sync. Otherwise stats every .json file and only re-parses (via
+    ``load_many``) the ones whose mtime or size changed.
+
+    Args:
+        conn: Open index connection
+        stories_dir: Stories directory to index
+        load_many: Loads metadata for a list of DirEntry objects, in order
+        force: Rescan even if the directory looks unchanged
+    """
+    dir_mtime = os.stat(stories_dir).st_mtime_ns
+    same_dir = _get_state(conn, "stories_dir") == str(stories_dir)
+    if not force and same_dir and _get_state(conn, "dir_mtime_ns") == str(dir_mtime):
+        return
+
+    if not same_dir:
+        conn.execute("DELETE FROM story_index")
+        _set_state(conn, "stories_dir", str(stories_dir))
+
+    indexed = {
+        row[0]: (row[1], row[2])
+        for row in conn.execute("SELECT id, mtime_ns, size FROM story_index")
+    }
+
+    on_disk: set[str] = set()
+    stale: list[tuple[str, os.DirEntry, os.stat_result]] = []
+    with os.scandir(stories_dir) as it:
+        for entry in it:
+            name = entry.name
+            if not name.endswith(".json") or not entry.is_file():
+                continue
+            story_id = name[:-5]
+            on_disk.add(story_id)
+            st = entry.stat()
+            if indexed.get(story_id) != (st.st_mtime_ns, st.st_size):
+                stale.append((story_id, entry, st))
+
+    if stale:
+        loaded = load_many([entry for _, entry, _ in stale])
+        rows = []
+        for (story_id, _, st), metadata in zip(stale, loaded):
+            if metadata is None:
+                on_disk.discard(story_id)
+            else:
+                rows.append((story_id, metadata, st))
+        update_rows(conn, rows)
+
+    removed = [(story_id,) for story_id in indexed.keys() - on_disk]
+    if removed:
+        conn.executemany("DELETE FROM story_index WHERE id = ?", removed)
+
+    # Racy mtimes force a rescan next time instead of trusting them
+    _set_state(conn, "dir_mtime_ns", None if _is_racy(dir_mtime) else str(dir_mtime))
+
+
+def query(
+    conn: sqlite3.Connection,
+    repo_name: str | None = None,
+    needs_review: bool = False,
+) -> Iterator[tuple[str, str, int, int]]:
+    """
+    Query indexed stories, newest first.
+
+    Rows are fetched lazily, so callers that stop early (e.g. at a limit)
+    only read as much of the index as they use.
+
+    Returns:
+        Iterator of (story_id, created_at, mtime_ns, size) tuples
+    """
+    conditions = []
+    params: list[Any] = []
+
+    if repo_name:
+        conditions.append("repo_name = ?")
+        params.append(repo_name)
+
+    if needs_review:
+        conditions.append("needs_review = 1")
+
+    where_clause = " AND ".join(conditions) if conditions else "1=1"
+    return conn.execute(
+        f"""
+        SELECT id, created_at, mtime_ns, size FROM story_index
+        WHERE {where_clause}
+        ORDER BY created_at DESC
+        """,
+        params,
+    )
+
+
+def rebuild_index(stories_dir: Path, load_many: MetaLoader) -> None:
+    """Drop and rebuild the index from the metadata files on disk."""
+    with connect(stories_dir) as conn:
+        conn.execute("DELETE FROM story_index")
+        conn.execute("DELETE FROM index_state")
+        sync(conn, stories_dir, load_many, force=True)
@@ -9,13 +9,38 @@ Creates coherent Story objects by:
 """
 
 import asyncio
+import atexit
+import hashlib
+import heapq
+import json
+import os
+import random
+import re
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
 import uuid
-from datetime import datetime, timezone
-from typing import Callable, Union
-
-from openai import OpenAI
-from anthropic import Anthropic
-from pydantic import BaseModel, Field
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from itertools import chain
+from typing import Any, AsyncIterator, Callable, Union
+
+import httpx
+from openai import DefaultHttpxClient as OpenAIHttpClient, OpenAI
+from anthropic import Anthropic, DefaultHttpxClient as AnthropicHttpClient
+from pydantic import BaseModel, Field, ValidationError
+from pydantic_core import from_json
+
+# orjson parses LLM responses noticeably faster than pydantic's JSON path
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .config import get_or_generate_username
 from .models import (
@@ -56,6 +81,141 @@ class BatchAnalysis(BaseModel):
     )
 
 
+class GroupedBatchAnalysis(BaseModel):
+    """LLM output for several independent commit batches sent in one request."""
+    groups: list[BatchAnalysis] = Field(
+        description="One analysis per commit group, in prompt order"
+    )
+
+
+def _fallback_analysis(commits: list[CommitData]) -> BatchAnalysis:
+    """Fallback when the LLM fails: each commit is its own story."""
+    return BatchAnalysis(stories=[
+        StoryBoundary(
+            commit_shas=[c.sha],
+            title=c.message.split("\n")[0][:80],
+            category="chore",
+        )
+        for c in commits
+    ])
+
+
+def _commit_lookup(commits: list[CommitData]) -> Callable[[str], CommitData | None]:
+    """
+    Build a lookup resolving full or abbreviated SHAs to a batch's commits.
+
+    Every prefix of every SHA maps to its commit, so lookups are a single
+    dict hit. On an ambiguous prefix the earliest commit wins.
+    """
+    commit_map = {c.sha: c for c in commits}
+    prefix_map: dict[str, CommitData] = {}
+    for c in commits:
+        for n in range(1, len(c.sha)):
+            prefix_map.setdefault(c.sha[:n], c)
+
+    def find_commit_by_sha(sha: str) -> CommitData | None:
+        """Find commit by full or prefix SHA."""
+        return commit_map.get(sha) or prefix_map.get(sha)
+
+    return find_commit_by_sha
+
+
+def _session_links(
+    sessions: list[SessionContext] | None,
+) -> list[tuple[str, frozenset[str]]]:
+    """Pair each session ID with its linked commits as a set, once per batch."""
+    return [(s.session_id, frozenset(s.linked_commits)) for s in sessions or ()]
+
+
+# uuid5 is SHA-1 over namespace bytes + name; hash the constant prefix once
+_STORY_ID_HASH = hashlib.sha1(
+    uuid.NAMESPACE_DNS.bytes + b"repr-story-", usedforsecurity=False
+)
+
+
+def _story_id(sorted_shas: list[str], title: str) -> str:
+    """
+    Deterministic story ID, identical to
+    uuid5(NAMESPACE_DNS, f"repr-story-{'-'.join(sorted_shas)}-{title}").
+    """
+    h = _STORY_ID_HASH.copy()
+    h.update("-".join(sorted_shas).encode("utf-8"))
+    h.update(b"-")
+    h.update(title.encode("utf-8"))
+    return str(uuid.UUID(bytes=h.digest()[:16], version=5))
+
+
+# Opening fence line (```json etc.), body, optional closing fence
+_FENCE_RE = re.compile(r"```[^\n]*\n(.*?)(?:```)?", re.S)
+
+
+def _clean_llm_json(content: str) -> str:
+    """Strip markdown code fences from an LLM JSON response."""
+    # Many models wrap JSON in ```json blocks
+    content = content.strip()
+    if m := _FENCE_RE.fullmatch(content):
+        content = m.group(1).rstrip()
+
+    # Debug: show raw response if REPR_DEBUG is set
+    if os.environ.get("REPR_DEBUG"):
+        print(f"DEBUG: Raw LLM response ({len(content)} chars):")
+        print(content[:1000])
+
+    return content
+
+
+def _parse_llm_json(model_cls: type[BaseModel], content: str) -> BaseModel:
+    """Validate an LLM JSON response, parsing with orjson when available."""
+    if orjson is not None:
+        return model_cls.model_validate(orjson.loads(content))
+    return model_cls.model_validate_json(content)
+
+
+# Re-parse a streaming response for newly completed stories every N chunks
+_STREAM_PARSE_EVERY = 16
+
+
+def _stream_delta_text(client_type: str, chunk: Any) -> str | None:
+    """Get the text carried by one streaming chunk/event."""
+    if client_type == "anthropic":
+        if getattr(chunk, "type", None) == "content_block_delta":
+            return getattr(chunk.delta, "text", None)
+        return None
+    if not chunk.choices:
+        return None
+    return chunk.choices[0].delta.content
+
+
+def _completed_boundaries(content: str, emitted: int) -> list[StoryBoundary]:
+    """
+    Parse a partial BatchAnalysis response and return stories finished since
+    the first ``emitted``. The last story in the array may still be
+    streaming, so it's only returned once another one starts.
+    """
+    text = content.lstrip()
+    if text.startswith("```"):
+        first_newline = text.find("\n")
+        if first_newline < 0:
+            return []
+        text = text[first_newline + 1:]
+    try:
+        parsed = from_json(text, allow_partial=True)
+    except (TypeError, ValueError):
+        return []
+    stories = parsed.get("stories") if isinstance(parsed, dict) else None
+    if not isinstance(stories, list):
+        return []
+
+    boundaries = []
+    for raw in stories[emitted:-1]:
+        try:
+            boundaries.append(StoryBoundary.model_validate(raw))
+        except ValidationError:
+            # Leave it for the final full parse to report
+            break
+    return boundaries
+
+
 # =============================================================================
 # Prompts
 # =============================================================================
@@ -196,6 +356,22 @@ Write like a developer explaining their own work.
 
 Output valid JSON with "hook", "what", "value", "problem", "how", "insight", "show", and "post_body" fields."""
 
+PUBLIC_STORY_BATCH_USER = """Turn each of these stories into a first-person build-in-public dev log:
+
+{stories_json}
+
+Write like a developer explaining their own work. Treat each story on its own.
+
+Output valid JSON: {{"results": [...]}} with exactly one object per story, in the same order, each with "hook", "what", "value", "insight", "show", and "post_body" fields."""
+
+INTERNAL_STORY_BATCH_USER = """Extract each of these stories as a first-person internal dev log:
+
+{stories_json}
+
+Write like a developer explaining their own work. Treat each story on its own.
+
+Output valid JSON: {{"results": [...]}} with exactly one object per story, in the same order, each with "hook", "what", "value", "problem", "how", "insight", "show", and "post_body" fields."""
+
 STORY_SYNTHESIS_SYSTEM = """You analyze git commits and group them into coherent "stories" - logical units of work.
 
 Your job:
@@ -323,48 +499,303 @@ If commit "def5678" has message "Add auth, fix navbar, update docs" and touches
 
 Note: "diagram" is optional. Only include when it clarifies architecture/flow changes."""
 
+STORY_SYNTHESIS_GROUPS_USER = """Analyze these {group_count} independent groups of commits. Treat each group on its own: a story may only reference commits from its own group.
+
+{groups_text}
+
+Output valid JSON with a "groups" array containing exactly {group_count} objects, in the same order as the groups above. Each object has a "stories" array in the same format as for a single batch of commits. Fill in ALL fields with specific details.
+
+{{
+  "groups": [
+    {{"stories": [{{"commit_shas": ["abc1234"], "title": "...", "problem": "...", "approach": "...", ...}}]}},
+    {{"stories": [{{"commit_shas": ["def5678"], "title": "...", "problem": "...", "approach": "...", ...}}]}}
+  ]
+}}"""
+
 
 # =============================================================================
 # File Change Extraction
 # =============================================================================
 
-def extract_file_changes_from_commits(
+def _git_numstat(
+    repo_path: str, commit_shas: list[str]
+) -> dict[str, list[tuple[str, int, int]]] | None:
+    """
+    Per-file (path, insertions, deletions) for each commit, from one git call.
+
+    Merges are diffed against their first parent and root commits against the
+    empty tree, matching GitPython's ``commit.stats``. Binary files count as
+    0/0. Returns None if git fails (e.g. an unknown SHA in the list).
+    """
+    if len(commit_shas) == 1:
+        # Single commit (common for small stories): plain diff-tree skips the
+        # revision walk setup. With -m a merge is listed once per parent,
+        # first parent first.
+        argv = [
+            "git", "-C", repo_path, "diff-tree", "-r", "--root", "-m",
+            "--numstat", "--no-renames", "-z", commit_shas[0], "--",
+        ]
+    else:
+        argv = [
+            "git", "-C", repo_path, "log", "--no-walk=unsorted",
+            "--numstat", "--no-renames", "-m", "--first-parent", "-z",
+            "--format=%x00%H", *commit_shas, "--",
+        ]
+    try:
+        result = subprocess.run(argv, capture_output=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+
+    # -z output: "[\0]<sha>\0[\n]<ins>\t<dels>\t<path>\0...", one block per commit
+    stats: dict[str, list[tuple[str, int, int]]] = {}
+    current: list[tuple[str, int, int]] = []
+    for token in result.stdout.decode("utf-8", errors="replace").split("\0"):
+        token = token.lstrip("\n")
+        if not token:
+            continue
+        if "\t" not in token:
+            # A repeated SHA is a merge's diff against a later parent: drop it
+            current = stats.setdefault(token, []) if token not in stats else []
+            continue
+        ins, dels, path = token.split("\t", 2)
+        current.append((
+            path,
+            int(ins) if ins != "-" else 0,
+            int(dels) if dels != "-" else 0,
+        ))
+    return stats
+
+
+# Language detection by extension for code snippets
+_SNIPPET_LANGS = {
+    ".py": "python", ".js": "javascript", ".ts": "typescript",
+    ".tsx": "tsx", ".jsx": "jsx", ".go": "go", ".rs": "rust",
+    ".java": "java", ".rb": "ruby", ".php": "php", ".c": "c",
+    ".cpp": "cpp", ".h": "c", ".hpp": "cpp", ".cs": "csharp",
+    ".swift": "swift", ".kt": "kotlin", ".sql": "sql",
+    ".sh": "bash", ".yaml": "yaml", ".yml": "yaml", ".json": "json",
+    ".md": "markdown", ".html": "html", ".css": "css", ".scss": "scss",
+}
+
+# Limits snippet patches to code files, so git never builds the rest
+_SNIPPET_PATHSPECS = tuple(f":(icase)*{ext}" for ext in _SNIPPET_LANGS)
+
+# Added lines that don't make a meaningful snippet: imports and comments
+_SNIPPET_SKIP_PREFIXES = ("import ", "from ", "#", "//", "/*", "*")
+
+
+# Meaningful added lines kept per file in the snippet cache (the default
+# snippet length)
+_SNIPPET_CACHE_LINES = 15
+
+
+def _diff_path(header: bytes) -> str | None:
+    """Path from a ``--- a/x`` / ``+++ b/x`` patch header line."""
+    name = header[4:].rstrip(b"\n").decode("utf-8", errors="ignore")
+    if name.startswith('"') and name.endswith('"'):
+        name = name[1:-1]
+    if name == "/dev/null":
+        return None
+    return name[2:]
+
+
+def _git_snippet_files(
+    repo_path: str,
     commit_shas: list[str],
-    project_path: str | None = None,
-) -> tuple[list[FileChange], int, int]:
+    max_lines: int = _SNIPPET_CACHE_LINES,
+) -> dict[str, list[tuple[str, list[str]]]] | None:
     """
-    Extract detailed file changes from git commits.
+    Snippet candidates per commit, from one streamed ``git log -p``.
 
-    Args:
-        commit_shas: List of commit SHAs to analyze
-        project_path: Path to git repo (optional, uses cwd)
+    Only added lines matter, so patches come without context lines (-U0).
 
-    Returns:
-        Tuple of (file_changes, total_insertions, total_deletions)
+    For each code file a commit changes (in diff order) this gives the path
+    and up to ``max_lines`` meaningful added lines: not blank, not imports
+    or comments. Merges are diffed against their first parent; root commits
+    have no candidates. Commits without code changes are left out. Returns
+    None if git fails (e.g. an unknown SHA in the list).
     """
     try:
-        from git import Repo
-        from pathlib import Path
+        proc = subprocess.Popen(
+            [
+                "git", "-C", repo_path, "-c", "core.quotePath=off", "log",
+                "--no-walk=unsorted", "-p", "-U0", "-M", "-m", "--first-parent",
+                "--no-color", "--no-ext-diff", "--format=%x00%H %P",
+                *commit_shas, "--", *_SNIPPET_PATHSPECS,
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+
+    files: dict[str, list[tuple[str, list[str]]]] = {}
+    try:
+        commit_files: list[tuple[str, list[str]]] = []
+        in_header = False
+        old_path: str | None = None
+        lines: list[str] | None = None
+        for line in proc.stdout:
+            if line.startswith(b"\0"):
+                header = line[1:].split()
+                commit_files = files.setdefault(header[0].decode(), [])
+                if len(header) < 2:
+                    commit_files = []  # root commit: nothing to diff against
+                lines = None
+                in_header = False
+            elif line.startswith(b"diff --git "):
+                old_path = lines = None
+                in_header = True
+            elif in_header:
+                if line.startswith(b"@@"):
+                    in_header = False
+                elif line.startswith(b"--- "):
+                    old_path = _diff_path(line)
+                elif line.startswith(b"+++ "):
+                    path = _diff_path(line) or old_path
+                    # Skip binary and non-code files
+                    if path and Path(path).suffix.lower() in _SNIPPET_LANGS:
+                        lines = []
+                        commit_files.append((path, lines))
+            elif (
+                lines is not None
+                and len(lines) < max_lines
+                and line.startswith(b"+")
+                and not line.startswith(b"+++")
+            ):
+                text = line[1:].rstrip(b"\n").decode("utf-8", errors="ignore")
+                stripped = text.strip()
+                # Skip empty lines, imports, and simple syntax
+                if stripped and not stripped.startswith(_SNIPPET_SKIP_PREFIXES):
+                    lines.append(text)
+    finally:
+        proc.stdout.close()
+        proc.wait()
+    if proc.returncode != 0:
+        return None
+    return files
+
+
+# Full commit SHAs (SHA-1 or SHA-256); only these are cached on disk
+_FULL_SHA_RE = re.compile(r"[0-9a-f]{40}(?:[0-9a-f]{24})?")
+
+
+def _commit_cache_get(kind: str, sha: str) -> Any | None:
+    """Read cached per-commit data, or None if not cached."""
+    from .config import COMMIT_CACHE_DIR
+
+    if not _FULL_SHA_RE.fullmatch(sha):
+        return None
+    try:
+        return json.loads((COMMIT_CACHE_DIR / kind / f"{sha}.json").read_bytes())
+    except (OSError, ValueError):
+        return None
 
-        repo_path = Path(project_path) if project_path else Path.cwd()
-        repo = Repo(repo_path, search_parent_directories=True)
-    except Exception:
-        return [], 0, 0
 
-    # Aggregate file stats across all commits
-    file_stats: dict[str, dict] = {}  # path -> {insertions, deletions, change_type}
-    total_ins = 0
-    total_del = 0
+def _commit_cache_put(kind: str, sha: str, data: Any) -> None:
+    """Cache per-commit data on disk. Best effort: failures are ignored."""
+    from .config import COMMIT_CACHE_DIR
 
-    for sha in commit_shas:
+    if not _FULL_SHA_RE.fullmatch(sha):
+        return
+    cache_dir = COMMIT_CACHE_DIR / kind
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to temp file first, then atomic rename
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
         try:
-            commit = repo.commit(sha)
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, cache_dir / f"{sha}.json")
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+class _CommitExtractor:
+    """
+    Recall data (file stats and snippets) for commits in one repository.
+
+    Per-commit results are memoized by SHA, in memory and on disk under
+    COMMIT_CACHE_DIR. A commit SHA pins its content, so cached entries
+    never go stale; each run only asks git about commits it hasn't seen.
+    """
 
-            # Get per-file stats
-            for file_path, stats in commit.stats.files.items():
-                ins = stats.get("insertions", 0)
-                dels = stats.get("deletions", 0)
+    def __init__(self, repo_path: str):
+        self.repo_path = repo_path
+        self._stats: dict[str, list[tuple[str, int, int]]] = {}
+        self._snippet_files: dict[str, list[tuple[str, list[str]]]] = {}
 
+    def _cached(
+        self,
+        kind: str | None,
+        memo: dict[str, Any],
+        fetch: Callable[[str, list[str]], dict[str, Any] | None],
+        commit_shas: list[str],
+    ) -> dict[str, Any]:
+        """
+        Per-commit ``fetch`` results keyed by the given SHAs, through ``memo``
+        and (unless ``kind`` is None) the disk cache. Unknown SHAs are left
+        out.
+        """
+        missing = []
+        for sha in dict.fromkeys(commit_shas):
+            if sha in memo:
+                continue
+            cached = _commit_cache_get(kind, sha) if kind else None
+            if cached is not None:
+                memo[sha] = cached
+            else:
+                missing.append(sha)
+
+        if missing:
+            fetched = fetch(self.repo_path, missing)
+            if fetched is None:
+                # One bad SHA fails the whole log; retry per commit and skip failures
+                found = {}
+                if len(missing) > 1:
+                    for sha in missing:
+                        single = fetch(self.repo_path, [sha])
+                        if single is not None:
+                            found[sha] = next(iter(single.values()), [])
+            else:
+                found = {}
+                for sha in missing:
+                    entries = fetched.get(sha)
+                    if entries is None:
+                        # Abbreviated SHA, or no output for this commit
+                        entries = next(
+                            (v for full, v in fetched.items() if full.startswith(sha)), []
+                        )
+                    found[sha] = entries
+            for sha, entries in found.items():
+                memo[sha] = entries
+                if kind:
+                    _commit_cache_put(kind, sha, entries)
+
+        return {sha: memo[sha] for sha in commit_shas if sha in memo}
+
+    def commit_stats(self, commit_shas: list[str]) -> dict[str, list[tuple[str, int, int]]]:
+        """Per-file (path, insertions, deletions) keyed by the given SHAs."""
+        return self._cached("stats", self._stats, _git_numstat, commit_shas)
+
+    def file_changes(self, commit_shas: list[str]) -> tuple[list[FileChange], int, int]:
+        """Aggregate file changes over commits (see extract_file_changes_from_commits)."""
+        if not commit_shas:
+            return [], 0, 0
+        commit_stats = self.commit_stats(commit_shas)
+
+        # Aggregate file stats across all commits
+        file_stats: dict[str, dict] = {}  # path -> {insertions, deletions, change_type}
+        total_ins = 0
+        total_del = 0
+
+        for sha in commit_shas:
+            for file_path, ins, dels in commit_stats.get(sha, ()):
                 if file_path not in file_stats:
                     file_stats[file_path] = {
                         "insertions": 0,
@@ -383,21 +814,115 @@ def extract_file_changes_from_commits(
                 elif dels > 0 and ins == 0 and file_stats[file_path]["insertions"] == 0:
                     file_stats[file_path]["change_type"] = "deleted"
 
-        except Exception:
-            continue
+        # Convert to FileChange objects
+        file_changes = [
+            FileChange(
+                file_path=path,
+                change_type=stats["change_type"],
+                insertions=stats["insertions"],
+                deletions=stats["deletions"],
+            )
+            for path, stats in sorted(file_stats.items())
+        ]
 
-    # Convert to FileChange objects
-    file_changes = [
-        FileChange(
-            file_path=path,
-            change_type=stats["change_type"],
-            insertions=stats["insertions"],
-            deletions=stats["deletions"],
-        )
-        for path, stats in sorted(file_stats.items())
-    ]
+        return file_changes, total_ins, total_del
+
+    def snippets(
+        self,
+        commit_shas: list[str],
+        max_snippets: int = 3,
+        max_lines: int = 15,
+    ) -> list[CodeSnippet]:
+        """Representative snippets from commit diffs (see extract_key_snippets_from_commits)."""
+        if not commit_shas or max_snippets <= 0:
+            return []
+
+        if max_lines <= _SNIPPET_CACHE_LINES:
+            files_by_sha = self._cached(
+                "snippets", self._snippet_files, _git_snippet_files, commit_shas
+            )
+        else:
+            files_by_sha = self._cached(
+                None,
+                {},
+                lambda repo_path, shas: _git_snippet_files(repo_path, shas, max_lines),
+                commit_shas,
+            )
+
+        snippets = []
+        seen_files = set()
+        for sha in commit_shas:
+            for file_path, lines in files_by_sha.get(sha, ()):
+                if file_path in seen_files:
+                    continue
+                seen_files.add(file_path)
+
+                # Take first max_lines of meaningful additions
+                content_lines = lines[:max_lines]
+                if len(content_lines) < 2:  # Need at least 2 meaningful lines
+                    continue
+
+                snippets.append(CodeSnippet(
+                    file_path=file_path,
+                    language=_SNIPPET_LANGS[Path(file_path).suffix.lower()],
+                    content="\n".join(content_lines),
+                    line_count=len(content_lines),
+                    context=f"Changes in {Path(file_path).name}",
+                ))
+                if len(snippets) >= max_snippets:
+                    return snippets
+
+        return snippets
+
+    def prefetch(self, commit_shas: list[str]) -> None:
+        """Load stats and snippet candidates, running the two git walks side by side."""
+        stats_walk = None
+        if any(sha not in self._stats for sha in commit_shas):
+            # git does the work in both walks, so they overlap without the GIL
+            stats_walk = threading.Thread(target=self.commit_stats, args=(commit_shas,))
+            stats_walk.start()
+        self._cached("snippets", self._snippet_files, _git_snippet_files, commit_shas)
+        if stats_walk is not None:
+            stats_walk.join()
+
+    def recall(
+        self, commit_shas: list[str], max_snippets: int = 3
+    ) -> tuple[list[FileChange], int, int, list[CodeSnippet]]:
+        """File changes and snippets for commits (see extract_recall_data)."""
+        if max_snippets <= 0:
+            return (*self.file_changes(commit_shas), [])
+        self.prefetch(commit_shas)
+        return (*self.file_changes(commit_shas), self.snippets(commit_shas, max_snippets))
+
+
+# Stories in a batch whose recall data is extracted at once
+_RECALL_WORKERS = 8
+
+
+@lru_cache(maxsize=16)
+def _commit_extractor(repo_path: str) -> _CommitExtractor:
+    """Shared extractor per repository path, so its memoized stats are reused."""
+    return _CommitExtractor(repo_path)
+
+
+def extract_file_changes_from_commits(
+    commit_shas: list[str],
+    project_path: str | None = None,
+) -> tuple[list[FileChange], int, int]:
+    """
+    Extract detailed file changes from git commits.
+
+    Stats for commits not already cached come from a single
+    ``git log --numstat`` call.
+
+    Args:
+        commit_shas: List of commit SHAs to analyze
+        project_path: Path to git repo (optional, uses cwd)
 
-    return file_changes, total_ins, total_del
+    Returns:
+        Tuple of (file_changes, total_insertions, total_deletions)
+    """
+    return _commit_extractor(project_path or os.getcwd()).file_changes(commit_shas)
 
 
 def extract_key_snippets_from_commits(
@@ -409,6 +934,9 @@ def extract_key_snippets_from_commits(
     """
     Extract representative code snippets from commit diffs.
 
+    Diffs for commits not already cached come from a single streamed
+    ``git log -p``.
+
     Args:
         commit_shas: List of commit SHAs
         project_path: Path to git repo
@@ -418,102 +946,283 @@ def extract_key_snippets_from_commits(
     Returns:
         List of CodeSnippet objects
     """
-    try:
-        from git import Repo
-        from pathlib import Path
+    return _commit_extractor(project_path or os.getcwd()).snippets(
+        commit_shas, max_snippets, max_lines
+    )
 
-        repo_path = Path(project_path) if project_path else Path.cwd()
-        repo = Repo(repo_path, search_parent_directories=True)
-    except Exception:
-        return []
 
-    snippets = []
-    seen_files = set()
-
-    # Language detection by extension
-    ext_to_lang = {
-        ".py": "python", ".js": "javascript", ".ts": "typescript",
-        ".tsx": "tsx", ".jsx": "jsx", ".go": "go", ".rs": "rust",
-        ".java": "java", ".rb": "ruby", ".php": "php", ".c": "c",
-        ".cpp": "cpp", ".h": "c", ".hpp": "cpp", ".cs": "csharp",
-        ".swift": "swift", ".kt": "kotlin", ".sql": "sql",
-        ".sh": "bash", ".yaml": "yaml", ".yml": "yaml", ".json": "json",
-        ".md": "markdown", ".html": "html", ".css": "css", ".scss": "scss",
-    }
+def extract_recall_data(
+    commit_shas: list[str],
+    project_path: str | None = None,
+    max_snippets: int = 3,
+) -> tuple[list[FileChange], int, int, list[CodeSnippet]]:
+    """
+    Extract file changes and key snippets for a story's commits together.
 
-    for sha in commit_shas:
-        if len(snippets) >= max_snippets:
-            break
+    Args:
+        commit_shas: List of commit SHAs
+        project_path: Path to git repo (optional, uses cwd)
+        max_snippets: Maximum number of snippets to return
 
-        try:
-            commit = repo.commit(sha)
+    Returns:
+        Tuple of (file_changes, total_insertions, total_deletions, key_snippets)
+    """
+    return _commit_extractor(project_path or os.getcwd()).recall(commit_shas, max_snippets)
 
-            # Get diff with parent
-            if not commit.parents:
-                continue
-            parent = commit.parents[0]
 
-            for diff in parent.diff(commit, create_patch=True):
-                if len(snippets) >= max_snippets:
-                    break
+def prefetch_recall_data(
+    commit_shas: list[str],
+    project_path: str | None = None,
+) -> None:
+    """
+    Load recall data for many commits at once, e.g. all stories in a batch.
 
-                file_path = diff.b_path or diff.a_path
-                if not file_path or file_path in seen_files:
-                    continue
+    Runs one stats walk and one patch walk over the commits that aren't
+    cached yet; extract_recall_data calls for any subset are then served
+    from the cache.
 
-                # Skip binary and non-code files
-                ext = Path(file_path).suffix.lower()
-                if ext not in ext_to_lang:
-                    continue
+    Args:
+        commit_shas: List of commit SHAs
+        project_path: Path to git repo (optional, uses cwd)
+    """
+    if commit_shas:
+        _commit_extractor(project_path or os.getcwd()).prefetch(commit_shas)
 
-                seen_files.add(file_path)
 
-                # Extract added lines from diff
-                try:
-                    diff_text = diff.diff.decode("utf-8", errors="ignore")
-                except Exception:
-                    continue
+# =============================================================================
+# Credentials
+# =============================================================================
 
-                # Find added lines (lines starting with +, not ++)
-                added_lines = []
-                for line in diff_text.split("\n"):
-                    if line.startswith("+") and not line.startswith("+++"):
-                        added_lines.append(line[1:])  # Remove the + prefix
+def _config_stamp() -> int | None:
+    """Config file mtime, used to invalidate cached credential lookups."""
+    from .config import CONFIG_FILE
 
-                if not added_lines:
-                    continue
+    try:
+        return CONFIG_FILE.stat().st_mtime_ns
+    except OSError:
+        return None
 
-                # Take first max_lines of meaningful additions
-                content_lines = []
-                for line in added_lines:
-                    stripped = line.strip()
-                    # Skip empty lines, imports, and simple syntax
-                    if stripped and not stripped.startswith(("import ", "from ", "#", "//", "/*", "*")):
-                        content_lines.append(line)
-                    if len(content_lines) >= max_lines:
-                        break
 
-                if len(content_lines) < 2:  # Need at least 2 meaningful lines
-                    continue
+@lru_cache(maxsize=32)
+def _resolve_credentials(
+    model_name: str,
+    config_stamp: int | None,
+) -> tuple[str | None, str | None, str | None]:
+    """
+    Resolve (api_key, base_url, provider) for a model from repr's config.
 
-                snippets.append(CodeSnippet(
-                    file_path=file_path,
-                    language=ext_to_lang.get(ext, ""),
-                    content="\n".join(content_lines),
-                    line_count=len(content_lines),
-                    context=f"Changes in {Path(file_path).name}",
-                ))
+    Reading BYOK/LiteLLM settings means loading the config and hitting the
+    OS keychain per provider, so results are cached per model until the
+    config file changes (config_stamp).
+    """
+    api_key = None
+    base_url = None
+    provider = None
 
-        except Exception:
-            continue
+    try:
+        from .config import (
+            get_byok_config,
+            get_litellm_config,
+            get_llm_config,
+            BYOK_PROVIDERS,
+        )
 
-    return snippets
+        # Each BYOK lookup reads the keychain; load a provider at most once
+        byok_configs: dict[str, dict | None] = {}
+
+        def byok_for(name: str) -> dict | None:
+            if name not in byok_configs:
+                byok_configs[name] = get_byok_config(name)
+            return byok_configs[name]
+
+        # Determine which BYOK provider to use based on model
+        byok_provider = None
+
+        # Check if model matches a configured BYOK provider model
+        for provider_name in BYOK_PROVIDERS.keys():
+            byok = byok_for(provider_name)
+            if byok and byok.get("model") == model_name:
+                byok_provider = provider_name
+                break
+
+        # Also check for provider/model format (e.g., "anthropic/claude-haiku-4-5")
+        if not byok_provider and "/" in model_name:
+            provider_part = model_name.split("/")[0]
+            if provider_part in BYOK_PROVIDERS:
+                byok_provider = provider_part
+
+        # Anthropic uses its own client
+        if byok_provider == "anthropic":
+            byok = byok_for("anthropic")
+            if byok and byok.get("api_key"):
+                api_key = byok["api_key"]
+                provider = "anthropic"
+        # OpenAI-compatible providers (groq, together, openrouter)
+        elif byok_provider in ("openai", "groq", "together", "openrouter"):
+            byok = byok_for(byok_provider)
+            if byok and byok.get("api_key"):
+                api_key = byok["api_key"]
+                base_url = byok.get("base_url")
+                provider = "openai"
+        # Other providers (gemini, etc.) need LiteLLM
+        elif byok_provider:
+            litellm_url, litellm_key = get_litellm_config()
+            if litellm_key:
+                api_key = litellm_key
+                base_url = litellm_url
+                provider = "openai"  # LiteLLM is OpenAI-compatible
+
+        # Fallback to openai BYOK
+        if not api_key:
+            byok = byok_for("openai")
+            if byok and byok.get("api_key"):
+                api_key = byok["api_key"]
+                base_url = base_url or byok.get("base_url")
+                provider = "openai"
+
+        # Check local LLM config
+        if not api_key:
+            llm_config = get_llm_config()
+            if llm_config.get("local_api_key"):
+                api_key = llm_config["local_api_key"]
+                base_url = base_url or llm_config.get("local_api_url")
+                provider = "openai"
+
+        # Check LiteLLM
+        if not api_key:
+            litellm_url, litellm_key = get_litellm_config()
+            if litellm_key:
+                api_key = litellm_key
+                base_url = base_url or litellm_url
+                provider = "openai"
+    except Exception:
+        pass
+
+    return api_key, base_url, provider
+
+
+# =============================================================================
+# Rate Limiting
+# =============================================================================
+
+# Expected completion size used when budgeting a synthesis request's tokens
+_EXPECTED_COMPLETION_TOKENS = 2000
+
+
+class TokenBucket:
+    """
+    Proactive requests/tokens-per-minute limiter for concurrent LLM calls.
+
+    Capacity refills continuously (rpm/60 requests and tpm/60 tokens per
+    second), so callers are paced just under the provider's limits instead
+    of hitting 429s and sleeping through client-side retry backoff.
+    """
+
+    def __init__(self, rpm: int, tpm: int | None = None):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.available_requests = float(rpm)
+        self.available_tokens = float(tpm) if tpm else 0.0
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self.available_requests = min(self.rpm, self.available_requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self.available_tokens = min(self.tpm, self.available_tokens + elapsed * self.tpm / 60)
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Wait until one request and ``tokens`` tokens are available, then take them."""
+        # A request larger than the whole budget would never fit; let it through at full capacity
+        tokens = min(tokens, self.tpm) if self.tpm else 0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.available_requests >= 1 and self.available_tokens >= tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= tokens
+                    return
+                wait = (1 - self.available_requests) * 60 / self.rpm
+                if self.tpm:
+                    wait = max(wait, (tokens - self.available_tokens) * 60 / self.tpm)
+                await asyncio.sleep(max(wait, 0.01))
 
 
 # =============================================================================
 # Synthesis Engine
 # =============================================================================
 
+# Whole lowercase words of 3+ letters
+_KEYWORD_RE = re.compile(r'\b[a-z]{3,}\b')
+_STOPWORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'for', 'to', 'in', 'on',
+    'of', 'and', 'or', 'with', 'from',
+})
+
+# Clients are shared across synthesizers so their connection pools (and TLS
+# sessions) are reused for every batch and feed transform in a process.
+_CLIENT_CACHE: dict[tuple[str, str, str | None], Union[OpenAI, Anthropic]] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+
+# Concurrent batches can trip provider rate limits; the SDKs retry 429s and
+# overloads with exponential backoff (honoring Retry-After), but only twice
+# by default before we'd fall back to one chore story per commit
+_MAX_RETRIES = 5
+
+# httpx drops idle keep-alive connections after 5s by default, which is
+# shorter than the gap between batches or feed transforms, so every request
+# would pay a fresh TCP/TLS handshake
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=90.0,
+)
+
+
+def _get_shared_client(
+    client_type: str,
+    api_key: str,
+    base_url: str | None,
+) -> Union[OpenAI, Anthropic]:
+    """Get a process-wide client for (client_type, api_key, base_url)."""
+    key = (client_type, api_key, base_url)
+    with _CLIENT_CACHE_LOCK:
+        client = _CLIENT_CACHE.get(key)
+        if client is None:
+            if client_type == "anthropic":
+                client = Anthropic(
+                    api_key=api_key,
+                    base_url=base_url,
+                    max_retries=_MAX_RETRIES,
+                    http_client=AnthropicHttpClient(limits=_HTTP_LIMITS),
+                )
+            else:
+                client = OpenAI(
+                    api_key=api_key,
+                    base_url=base_url,
+                    max_retries=_MAX_RETRIES,
+                    http_client=OpenAIHttpClient(limits=_HTTP_LIMITS),
+                )
+            _CLIENT_CACHE[key] = client
+        return client
+
+
+def _anthropic_system(system_prompt: str) -> list[dict[str, Any]]:
+    """
+    Wrap a system prompt for Anthropic, marked as a cacheable prefix.
+
+    The system prompts are module constants and always come first, so every
+    request in a run shares the prefix. OpenAI caches long shared prefixes
+    automatically; Anthropic only caches what's marked. Prompts under the
+    provider's minimum cacheable length are simply sent uncached.
+    """
+    return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
+
 class StorySynthesizer:
     """Synthesizes stories from commits using LLM."""
 
@@ -522,11 +1231,16 @@ class StorySynthesizer:
         api_key: str | None = None,
         base_url: str | None = None,
         model: str | None = None,
+        rate_limiter: TokenBucket | None = None,
+        stream: bool = False,
     ):
         self.api_key = api_key
         self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.stream = stream  # Build stories while the response streams in
         self._model_override = model  # Explicit override
         self._model: str | None = None  # Resolved model (lazy)
+        self._api_model: str | None = None  # Resolved model without provider prefix
         self._client: Union[OpenAI, Anthropic, None] = None
         self._client_type: str | None = None  # "openai" or "anthropic"
 
@@ -541,6 +1255,14 @@ class StorySynthesizer:
     def model(self, value: str):
         """Allow setting model directly."""
         self._model = value
+        self._api_model = None
+
+    @property
+    def api_model(self) -> str:
+        """Model name as sent to the provider ("openai/gpt-4o" -> "gpt-4o")."""
+        if self._api_model is None:
+            self._api_model = self.model.rsplit("/", 1)[-1]
+        return self._api_model
 
     def _resolve_model(self) -> str:
         """Resolve model from override, config, or default."""
@@ -585,8 +1307,6 @@ class StorySynthesizer:
     def _get_client(self) -> Union[OpenAI, Anthropic]:
         """Get or create LLM client (OpenAI or Anthropic)."""
         if self._client is None:
-            import os
-
             api_key = self.api_key
             base_url = self.base_url
 
@@ -594,77 +1314,10 @@ class StorySynthesizer:
             provider = None
 
             if not api_key:
-                try:
-                    from .config import (
-                        get_byok_config,
-                        get_litellm_config,
-                        get_llm_config,
-                        BYOK_PROVIDERS,
-                    )
-
-                    # Determine which BYOK provider to use based on model
-                    model_name = self.model
-                    byok_provider = None
-
-                    # Check if model matches a configured BYOK provider model
-                    for provider_name in BYOK_PROVIDERS.keys():
-                        byok = get_byok_config(provider_name)
-                        if byok and byok.get("model") == model_name:
-                            byok_provider = provider_name
-                            break
-
-                    # Also check for provider/model format (e.g., "anthropic/claude-haiku-4-5")
-                    if not byok_provider and "/" in model_name:
-                        provider_part = model_name.split("/")[0]
-                        if provider_part in BYOK_PROVIDERS:
-                            byok_provider = provider_part
-
-                    # Anthropic uses its own client
-                    if byok_provider == "anthropic":
-                        byok = get_byok_config("anthropic")
-                        if byok and byok.get("api_key"):
-                            api_key = byok["api_key"]
-                            provider = "anthropic"
-                    # OpenAI-compatible providers (groq, together, openrouter)
-                    elif byok_provider in ("openai", "groq", "together", "openrouter"):
-                        byok = get_byok_config(byok_provider)
-                        if byok and byok.get("api_key"):
-                            api_key = byok["api_key"]
-                            base_url = base_url or byok.get("base_url")
-                            provider = "openai"
-                    # Other providers (gemini, etc.) need LiteLLM
-                    elif byok_provider:
-                        litellm_url, litellm_key = get_litellm_config()
-                        if litellm_key:
-                            api_key = litellm_key
-                            base_url = base_url or litellm_url
-                            provider = "openai"  # LiteLLM is OpenAI-compatible
-
-                    # Fallback to openai BYOK
-                    if not api_key:
-                        byok = get_byok_config("openai")
-                        if byok and byok.get("api_key"):
-                            api_key = byok["api_key"]
-                            base_url = base_url or byok.get("base_url")
-                            provider = "openai"
-
-                    # Check local LLM config
-                    if not api_key:
-                        llm_config = get_llm_config()
-                        if llm_config.get("local_api_key"):
-                            api_key = llm_config["local_api_key"]
-                            base_url = base_url or llm_config.get("local_api_url")
-                            provider = "openai"
-
-                    # Check LiteLLM
-                    if not api_key:
-                        litellm_url, litellm_key = get_litellm_config()
-                        if litellm_key:
-                            api_key = litellm_key
-                            base_url = base_url or litellm_url
-                            provider = "openai"
-                except Exception:
-                    pass
+                api_key, config_base_url, provider = _resolve_credentials(
+                    self.model, _config_stamp()
+                )
+                base_url = base_url or config_base_url
 
                 if not api_key:
                     api_key = os.getenv("OPENAI_API_KEY")
@@ -673,13 +1326,9 @@ class StorySynthesizer:
             if not api_key:
                 raise ValueError("No API key found. Configure via 'repr llm byok openai <key>'")
 
-            # Create the appropriate client
-            if provider == "anthropic":
-                self._client = Anthropic(api_key=api_key, base_url=base_url)
-                self._client_type = "anthropic"
-            else:
-                self._client = OpenAI(api_key=api_key, base_url=base_url)
-                self._client_type = "openai"
+            # Create (or reuse) the appropriate client
+            self._client_type = "anthropic" if provider == "anthropic" else "openai"
+            self._client = _get_shared_client(self._client_type, api_key, base_url)
 
         return self._client
 
@@ -690,260 +1339,536 @@ class StorySynthesizer:
         return self._client_type
     
     def _format_commits_for_prompt(self, commits: list[CommitData]) -> str:
-        """Format commits for LLM prompt."""
-        lines = []
-        for c in commits:
-            lines.append(f"SHA: {c.sha[:8]}")
-            lines.append(f"Message: {c.message}")
-            lines.append(f"Files: {', '.join(c.files[:10])}")
-            if c.insertions or c.deletions:
-                lines.append(f"Changes: +{c.insertions}/-{c.deletions}")
-            lines.append("")
-        return "\n".join(lines)
+        """Format commits for LLM prompt (one block per commit, blank line between)."""
+        return "\n".join([
+            f"SHA: {c.sha[:8]}\n"
+            f"Message: {c.message}\n"
+            f"Files: {', '.join(c.files[:10])}\n"
+            + (f"Changes: +{c.insertions}/-{c.deletions}\n" if c.insertions or c.deletions else "")
+            for c in commits
+        ])
     
-    async def synthesize_batch(
+    def _request_kwargs(
         self,
-        commits: list[CommitData],
-        sessions: list[SessionContext] | None = None,
-    ) -> tuple[list[Story], ContentIndex]:
-        """
-        Synthesize stories from a batch of commits.
-
-        Args:
-            commits: Commits to analyze (ordered by time)
-            sessions: Optional sessions to link
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int = 4096,
+        use_temperature: bool = True,
+    ) -> dict:
+        """Build the create() kwargs for a synthesis request."""
+        model_name = self.api_model
+
+        if (self._client_type or "openai") == "anthropic":
+            # Anthropic API format
+            kwargs = {
+                "model": model_name,
+                "system": _anthropic_system(system_prompt),
+                "messages": [
+                    {"role": "user", "content": user_prompt},
+                ],
+                "max_tokens": max_tokens,
+            }
+        else:
+            # OpenAI API format
+            kwargs = {
+                "model": model_name,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                "response_format": {"type": "json_object"},
+            }
+        if use_temperature:
+            kwargs["temperature"] = 0.3
+        return kwargs
 
-        Returns:
-            Tuple of (stories, updated_index)
+    async def _complete(self, system_prompt: str, user_prompt: str, max_tokens: int = 4096) -> str:
         """
-        if not commits:
-            return [], ContentIndex()
+        Run one synthesis request and return the JSON text of the response.
 
-        # Get LLM analysis (using sync client to avoid event loop cleanup issues)
+        Uses the sync client (avoids event loop cleanup issues) in a worker
+        thread, so concurrent batches still overlap.
+        """
         client = self._get_client()
         client_type = self._client_type or "openai"
-        commits_text = self._format_commits_for_prompt(commits)
 
         def make_request(use_temperature: bool = True):
-            model_name = self.model.split("/")[-1] if "/" in self.model else self.model
-
+            kwargs = self._request_kwargs(system_prompt, user_prompt, max_tokens, use_temperature)
             if client_type == "anthropic":
-                # Anthropic API format
-                kwargs = {
-                    "model": model_name,
-                    "system": STORY_SYNTHESIS_SYSTEM,
-                    "messages": [
-                        {"role": "user", "content": STORY_SYNTHESIS_USER.format(
-                            commits_text=commits_text
-                        )},
-                    ],
-                    "max_tokens": 4096,
-                }
-                if use_temperature:
-                    kwargs["temperature"] = 0.3
                 return client.messages.create(**kwargs)
-            else:
-                # OpenAI API format
-                kwargs = {
-                    "model": model_name,
-                    "messages": [
-                        {"role": "system", "content": STORY_SYNTHESIS_SYSTEM},
-                        {"role": "user", "content": STORY_SYNTHESIS_USER.format(
-                            commits_text=commits_text
-                        )},
-                    ],
-                    "response_format": {"type": "json_object"},
-                }
-                if use_temperature:
-                    kwargs["temperature"] = 0.3
-                return client.chat.completions.create(**kwargs)
+            return client.chat.completions.create(**kwargs)
+
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(
+                (len(system_prompt) + len(user_prompt)) // 4 + _EXPECTED_COMPLETION_TOKENS
+            )
 
         try:
-            try:
-                response = make_request(use_temperature=True)
-            except Exception as e:
-                if "temperature" in str(e).lower() and "unsupported" in str(e).lower():
-                    response = make_request(use_temperature=False)
-                else:
-                    raise
+            response = await asyncio.to_thread(make_request, True)
+        except Exception as e:
+            if "temperature" in str(e).lower() and "unsupported" in str(e).lower():
+                response = await asyncio.to_thread(make_request, False)
+            else:
+                raise
 
-            # Extract content from response (different formats for OpenAI vs Anthropic)
-            if client_type == "anthropic":
-                content = response.content[0].text
+        # Extract content from response (different formats for OpenAI vs Anthropic)
+        if client_type == "anthropic":
+            content = response.content[0].text
+        else:
+            content = response.choices[0].message.content
+
+        return _clean_llm_json(content)
+
+    async def synthesize_batch(
+        self,
+        commits: list[CommitData],
+        sessions: list[SessionContext] | None = None,
+    ) -> tuple[list[Story], ContentIndex]:
+        """
+        Synthesize stories from a batch of commits.
+
+        Args:
+            commits: Commits to analyze (ordered by time)
+            sessions: Optional sessions to link
+
+        Returns:
+            Tuple of (stories, updated_index)
+        """
+        if not commits:
+            return [], ContentIndex()
+
+        stories = None
+        try:
+            user_prompt = STORY_SYNTHESIS_USER.format(
+                commits_text=self._format_commits_for_prompt(commits)
+            )
+            if self.stream:
+                stories = await self._stream_stories(commits, user_prompt, sessions)
             else:
-                content = response.choices[0].message.content
-
-            # Strip markdown code fences if present (many models wrap JSON in ```json blocks)
-            content = content.strip()
-            if content.startswith("```"):
-                # Remove opening fence
-                first_newline = content.find("\n")
-                if first_newline > 0:
-                    content = content[first_newline + 1:]
-                # Remove closing fence
-                if content.endswith("```"):
-                    content = content[:-3].rstrip()
-
-            # Debug: show raw response if REPR_DEBUG is set
-            import os
-            if os.environ.get("REPR_DEBUG"):
-                print(f"DEBUG: Raw LLM response ({len(content)} chars):")
-                print(content[:1000])
-
-            analysis = BatchAnalysis.model_validate_json(content)
+                content = await self._complete(STORY_SYNTHESIS_SYSTEM, user_prompt)
+                analysis = _parse_llm_json(BatchAnalysis, content)
 
         except Exception as e:
             # Always print error for visibility
             from rich.console import Console
             Console(stderr=True).print(f"[yellow]  LLM error: {type(e).__name__}: {e}[/]")
 
-            # Fallback: each commit is its own story
-            analysis = BatchAnalysis(stories=[
-                StoryBoundary(
-                    commit_shas=[c.sha],
-                    title=c.message.split("\n")[0][:80],
-                    category="chore",
+            analysis = _fallback_analysis(commits)
+            stories = None
+
+        if stories is None:
+            stories = await asyncio.to_thread(self._build_stories, commits, analysis, sessions)
+        return stories, self._build_index(stories)
+
+    async def _stream_stories(
+        self,
+        commits: list[CommitData],
+        user_prompt: str,
+        sessions: list[SessionContext] | None = None,
+    ) -> list[Story]:
+        """
+        Stream a synthesis response and build each story as soon as its JSON
+        object is complete, so the git extraction for finished stories
+        overlaps with the LLM still generating the rest.
+        """
+        client = self._get_client()
+        client_type = self._client_type or "openai"
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(
+                (len(STORY_SYNTHESIS_SYSTEM) + len(user_prompt)) // 4 + _EXPECTED_COMPLETION_TOKENS
+            )
+
+        def make_request(use_temperature: bool = True):
+            kwargs = self._request_kwargs(
+                STORY_SYNTHESIS_SYSTEM, user_prompt, use_temperature=use_temperature
+            )
+            if client_type == "anthropic":
+                return client.messages.create(stream=True, **kwargs)
+            return client.chat.completions.create(stream=True, **kwargs)
+
+        def produce() -> None:
+            # Runs in a worker thread; hands text chunks (then None) to the loop
+            try:
+                try:
+                    response = make_request(use_temperature=True)
+                except Exception as e:
+                    if "temperature" in str(e).lower() and "unsupported" in str(e).lower():
+                        response = make_request(use_temperature=False)
+                    else:
+                        raise
+                for chunk in response:
+                    text = _stream_delta_text(client_type, chunk)
+                    if text:
+                        loop.call_soon_threadsafe(queue.put_nowait, text)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            else:
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+
+        find_commit_by_sha = _commit_lookup(commits)
+        session_links = _session_links(sessions)
+        now = datetime.now(timezone.utc)
+        builds: list[asyncio.Future] = []
+
+        def start_build(boundary: StoryBoundary) -> None:
+            builds.append(asyncio.ensure_future(asyncio.to_thread(
+                self._build_story, boundary, find_commit_by_sha, session_links, now
+            )))
+
+        producer = asyncio.ensure_future(asyncio.to_thread(produce))
+        try:
+            parts: list[str] = []
+            since_parse = 0
+            while (item := await queue.get()) is not None:
+                if isinstance(item, Exception):
+                    raise item
+                parts.append(item)
+                since_parse += 1
+                if since_parse >= _STREAM_PARSE_EVERY:
+                    since_parse = 0
+                    for boundary in _completed_boundaries("".join(parts), len(builds)):
+                        start_build(boundary)
+
+            analysis = _parse_llm_json(BatchAnalysis, _clean_llm_json("".join(parts)))
+            for boundary in analysis.stories[len(builds):]:
+                start_build(boundary)
+            stories = await asyncio.gather(*builds)
+        except BaseException:
+            await asyncio.gather(producer, *builds, return_exceptions=True)
+            raise
+        await producer
+
+        return [story for story in stories if story is not None]
+
+    async def synthesize_groups(
+        self,
+        groups: list[list[CommitData]],
+        sessions: list[SessionContext] | None = None,
+    ) -> list[tuple[list[Story], ContentIndex]]:
+        """
+        Synthesize several independent batches with a single LLM request.
+
+        The groups share one system prompt and one round-trip. If the
+        request fails or the response doesn't line up with the groups, each
+        group is retried on its own via synthesize_batch().
+
+        Args:
+            groups: Batches of commits (each ordered by time)
+            sessions: Optional sessions to link
+
+        Returns:
+            One (stories, index) tuple per group, in order
+        """
+        groups = [g for g in groups if g]
+        if len(groups) <= 1:
+            return [await self.synthesize_batch(g, sessions) for g in groups]
+
+        groups_text = "\n".join(
+            f"<<GROUP {i}>>\n{self._format_commits_for_prompt(g)}"
+            for i, g in enumerate(groups, 1)
+        )
+        try:
+            content = await self._complete(
+                STORY_SYNTHESIS_SYSTEM,
+                STORY_SYNTHESIS_GROUPS_USER.format(
+                    group_count=len(groups), groups_text=groups_text
+                ),
+                max_tokens=min(4096 * len(groups), 16384),
+            )
+            analyses = _parse_llm_json(GroupedBatchAnalysis, content).groups
+            if len(analyses) != len(groups):
+                raise ValueError(f"expected {len(groups)} groups, got {len(analyses)}")
+        except Exception as e:
+            from rich.console import Console
+            Console(stderr=True).print(
+                f"[yellow]  Grouped LLM request failed ({type(e).__name__}: {e}); "
+                f"retrying {len(groups)} batches individually[/]"
+            )
+            return [await self.synthesize_batch(g, sessions) for g in groups]
+
+        results = []
+        for commits, analysis in zip(groups, analyses):
+            stories = await asyncio.to_thread(self._build_stories, commits, analysis, sessions)
+            results.append((stories, self._build_index(stories)))
+        return results
+
+    async def synthesize_batches_offline(
+        self,
+        batches: list[list[CommitData]],
+        sessions: list[SessionContext] | None = None,
+        poll_interval: float = 5.0,
+        max_poll_interval: float = 60.0,
+        timeout: float = 24 * 3600,
+        concurrency: int = 8,
+    ) -> list[tuple[list[Story], ContentIndex]]:
+        """
+        Synthesize batches through the OpenAI Batch API.
+
+        All batches are uploaded as one JSONL file and processed
+        asynchronously by OpenAI (cheaper, separate rate limits, but results
+        can take minutes to hours). Batches with no usable result, or the
+        whole run if the Batch API is unavailable (e.g. Anthropic or a local
+        server), go through the live path instead.
+
+        Args:
+            batches: Batches of commits (each ordered by time)
+            sessions: Optional sessions to link
+            poll_interval: Initial seconds between status checks
+            max_poll_interval: Cap for the exponential poll backoff
+            timeout: Give up waiting (and cancel) after this many seconds
+            concurrency: Maximum live fallback requests in flight at once
+
+        Returns:
+            One (stories, index) tuple per batch, in order
+        """
+        import io
+
+        client = self._get_client()
+        contents: dict[str, str] = {}
+
+        try:
+            if self._client_type != "openai":
+                raise ValueError("Batch API requires an OpenAI client")
+
+            lines = []
+            for i, commits in enumerate(batches):
+                if not commits:
+                    continue
+                body = self._request_kwargs(
+                    STORY_SYNTHESIS_SYSTEM,
+                    STORY_SYNTHESIS_USER.format(
+                        commits_text=self._format_commits_for_prompt(commits)
+                    ),
                 )
-                for c in commits
-            ])
-        
-        # Build commit lookup - support both full and prefix matching
-        commit_map = {c.sha: c for c in commits}
+                lines.append(json.dumps({
+                    "custom_id": f"batch-{i}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": body,
+                }))
+            payload = ("\n".join(lines) + "\n").encode("utf-8")
+
+            upload = await asyncio.to_thread(
+                client.files.create,
+                file=("repr-synthesis.jsonl", io.BytesIO(payload)),
+                purpose="batch",
+            )
+            job = await asyncio.to_thread(
+                client.batches.create,
+                input_file_id=upload.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+
+            deadline = time.monotonic() + timeout
+            delay = poll_interval
+            while job.status not in ("completed", "failed", "expired", "cancelled"):
+                if time.monotonic() >= deadline:
+                    await asyncio.to_thread(client.batches.cancel, job.id)
+                    raise TimeoutError(f"Batch {job.id} still {job.status} after {timeout:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_poll_interval)
+                job = await asyncio.to_thread(client.batches.retrieve, job.id)
+
+            if job.status != "completed" or not job.output_file_id:
+                raise RuntimeError(f"Batch {job.id} ended with status {job.status}")
+
+            output = await asyncio.to_thread(client.files.content, job.output_file_id)
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                response = record.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+                content = response["body"]["choices"][0]["message"]["content"]
+                if content:
+                    contents[record["custom_id"]] = _clean_llm_json(content)
+
+        except Exception as e:
+            from rich.console import Console
+            Console(stderr=True).print(
+                f"[yellow]  Batch API unavailable ({type(e).__name__}: {e}); using live requests[/]"
+            )
+
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async def _finish(
+            i: int, commits: list[CommitData],
+        ) -> tuple[list[Story], ContentIndex]:
+            content = contents.get(f"batch-{i}")
+            analysis = None
+            if content is not None:
+                try:
+                    analysis = _parse_llm_json(BatchAnalysis, content)
+                except ValueError:
+                    analysis = None
+            if analysis is None:
+                async with sem:
+                    return await self.synthesize_batch(commits, sessions)
+            stories = await asyncio.to_thread(self._build_stories, commits, analysis, sessions)
+            return stories, self._build_index(stories)
+
+        return list(await asyncio.gather(
+            *(_finish(i, commits) for i, commits in enumerate(batches))
+        ))
+
+    def _build_stories(
+        self,
+        commits: list[CommitData],
+        analysis: BatchAnalysis,
+        sessions: list[SessionContext] | None = None,
+    ) -> list[Story]:
+        """Turn the LLM's story boundaries for a batch into Story objects."""
+        find_commit_by_sha = _commit_lookup(commits)
+        session_links = _session_links(sessions)
+        now = datetime.now(timezone.utc)
+
+        def build(boundary: StoryBoundary) -> Story | None:
+            return self._build_story(boundary, find_commit_by_sha, session_links, now)
+
+        if len(analysis.stories) > 1:
+            # One git pass for every story's commits, instead of one per story
+            prefetch_recall_data(list(dict.fromkeys(
+                commit.sha
+                for boundary in analysis.stories
+                for sha in boundary.commit_shas
+                if (commit := find_commit_by_sha(sha))
+            )))
+            # Anything the prefetch couldn't load is still git work per story
+            workers = min(_RECALL_WORKERS, len(analysis.stories))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                stories = list(pool.map(build, analysis.stories))
+        else:
+            stories = [build(boundary) for boundary in analysis.stories]
+        return [story for story in stories if story is not None]
+
+    def _build_story(
+        self,
+        boundary: StoryBoundary,
+        find_commit_by_sha: Callable[[str], CommitData | None],
+        session_links: list[tuple[str, frozenset[str]]],
+        now: datetime,
+    ) -> Story | None:
+        """Build one Story from an LLM story boundary (None if no commits match)."""
+        # Get commits for this story (with prefix matching)
+        story_commits = []
+        matched_shas = []
+        for sha in boundary.commit_shas:
+            commit = find_commit_by_sha(sha)
+            if commit:
+                story_commits.append(commit)
+                matched_shas.append(commit.sha)  # Use full SHA
         
-        def find_commit_by_sha(sha: str) -> CommitData | None:
-            """Find commit by full or prefix SHA."""
-            if sha in commit_map:
-                return commit_map[sha]
-            # Try prefix matching
-            for full_sha, commit in commit_map.items():
-                if full_sha.startswith(sha):
-                    return commit
+        if not story_commits:
             return None
         
-        # Create stories
-        now = datetime.now(timezone.utc)
-        stories = []
+        # Aggregate files
+        all_files = set()
+        for c in story_commits:
+            all_files.update(c.files)
         
-        for boundary in analysis.stories:
-            # Get commits for this story (with prefix matching)
-            story_commits = []
-            matched_shas = []
-            for sha in boundary.commit_shas:
-                commit = find_commit_by_sha(sha)
-                if commit:
-                    story_commits.append(commit)
-                    matched_shas.append(commit.sha)  # Use full SHA
-            
-            if not story_commits:
-                continue
-            
-            # Aggregate files
-            all_files = set()
-            for c in story_commits:
-                all_files.update(c.files)
-            
-            # Calculate timespan
-            timestamps = [c.timestamp for c in story_commits]
-            started_at = min(timestamps)
-            ended_at = max(timestamps)
-            
-            # Find linked sessions (by commit overlap)
-            linked_sessions = []
-            if sessions:
-                for session in sessions:
-                    if any(sha in session.linked_commits for sha in boundary.commit_shas):
-                        linked_sessions.append(session.session_id)
-            
-            # Use LLM-extracted technologies, fall back to file-based detection
-            files_list = sorted(all_files)[:50]  # Cap at 50 files
-            technologies = boundary.technologies if boundary.technologies else self._detect_tech_stack(files_list)
-
-            # Extract detailed file changes and snippets for recall
-            file_changes, total_ins, total_del = extract_file_changes_from_commits(matched_shas)
-            key_snippets = extract_key_snippets_from_commits(matched_shas, max_snippets=3)
-
-            # Deterministic ID based on sorted commit SHAs + title
-            # Include title to differentiate stories split from the same packed commit
-            sorted_shas = sorted(matched_shas)
-            id_input = f"repr-story-{'-'.join(sorted_shas)}-{boundary.title}"
-            story_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, id_input))
-
-            # Get author: profile username > GPG-derived mnemonic > git author > unknown
-            if identity := get_or_generate_username():
-                author_name = identity
-            elif story_commits and story_commits[0].author:
-                author_name = story_commits[0].author
-            else:
-                author_name = "unknown"
-
-            # Get email from first commit for Gravatar
-            author_email = story_commits[0].author_email if story_commits else ""
-
-            story = Story(
-                id=story_id,
-                created_at=now,
-                updated_at=now,
-                author_name=author_name,
-                author_email=author_email,
-                commit_shas=matched_shas,  # Use full matched SHAs
-                session_ids=linked_sessions,
-                title=boundary.title,
-                problem=boundary.problem,
-                approach=boundary.approach,
-                implementation_details=boundary.implementation_details,
-                decisions=boundary.decisions,
-                tradeoffs=boundary.tradeoffs,
-                outcome=boundary.outcome,
-                lessons=boundary.lessons,
-                category=boundary.category,
-                technologies=technologies,
-                files=files_list,
-                started_at=started_at,
-                ended_at=ended_at,
-                diagram=boundary.diagram,
-                # Recall data
-                file_changes=file_changes,
-                key_snippets=key_snippets,
-                total_insertions=total_ins,
-                total_deletions=total_del,
-            )
-            stories.append(story)
+        # Calculate timespan
+        timestamps = [c.timestamp for c in story_commits]
+        started_at = min(timestamps)
+        ended_at = max(timestamps)
         
-        # Build index for this batch
-        index = self._build_index(stories)
+        # Find linked sessions (by commit overlap)
+        boundary_shas = set(boundary.commit_shas)
+        linked_sessions = [
+            session_id for session_id, linked in session_links
+            if not linked.isdisjoint(boundary_shas)
+        ]
         
-        return stories, index
+        # Use LLM-extracted technologies, fall back to file-based detection
+        files_list = heapq.nsmallest(50, all_files)  # Cap at 50 files, sorted
+        technologies = boundary.technologies if boundary.technologies else self._detect_tech_stack(files_list)
+
+        # Extract detailed file changes and snippets for recall. Snippets only
+        # come from code files, so skip the patch walk when the commits'
+        # file lists show none (an empty list may just be unknown)
+        has_code = not all_files or any(
+            Path(f).suffix.lower() in _SNIPPET_LANGS for f in all_files
+        )
+        file_changes, total_ins, total_del, key_snippets = extract_recall_data(
+            matched_shas, max_snippets=3 if has_code else 0
+        )
+
+        # Deterministic ID based on sorted commit SHAs + title
+        # Include title to differentiate stories split from the same packed commit
+        story_id = _story_id(sorted(matched_shas), boundary.title)
+
+        # Get author: profile username > GPG-derived mnemonic > git author > unknown
+        if identity := get_or_generate_username():
+            author_name = identity
+        elif story_commits and story_commits[0].author:
+            author_name = story_commits[0].author
+        else:
+            author_name = "unknown"
+
+        # Get email from first commit for Gravatar
+        author_email = story_commits[0].author_email if story_commits else ""
+
+        # Inputs are our own commits plus an already-validated StoryBoundary,
+        # so skip re-validating them
+        story = Story.model_construct(
+            id=story_id,
+            created_at=now,
+            updated_at=now,
+            author_name=author_name,
+            author_email=author_email,
+            commit_shas=matched_shas,  # Use full matched SHAs
+            session_ids=linked_sessions,
+            title=boundary.title,
+            problem=boundary.problem,
+            approach=boundary.approach,
+            implementation_details=boundary.implementation_details,
+            decisions=boundary.decisions,
+            tradeoffs=boundary.tradeoffs,
+            outcome=boundary.outcome,
+            lessons=boundary.lessons,
+            category=boundary.category,
+            technologies=technologies,
+            files=files_list,
+            started_at=started_at,
+            ended_at=ended_at,
+            diagram=boundary.diagram,
+            # Recall data
+            file_changes=file_changes,
+            key_snippets=key_snippets,
+            total_insertions=total_ins,
+            total_deletions=total_del,
+        )
+        return story
     
     def _build_index(self, stories: list[Story]) -> ContentIndex:
         """Build content index from stories."""
-        index = ContentIndex(
-            last_updated=datetime.now(timezone.utc),
-            story_count=len(stories),
-        )
+        files_to_stories: defaultdict[str, list[str]] = defaultdict(list)
+        keywords_to_stories: defaultdict[str, list[str]] = defaultdict(list)
+        by_week: defaultdict[str, list[str]] = defaultdict(list)
+        story_digests = []
         
         for story in stories:
             # File → story mapping
             for f in story.files:
-                if f not in index.files_to_stories:
-                    index.files_to_stories[f] = []
-                index.files_to_stories[f].append(story.id)
+                files_to_stories[f].append(story.id)
             
             # Keyword extraction (simple: from title and problem)
             keywords = self._extract_keywords(story.title + " " + story.problem)
             for kw in keywords:
-                if kw not in index.keywords_to_stories:
-                    index.keywords_to_stories[kw] = []
-                index.keywords_to_stories[kw].append(story.id)
+                keywords_to_stories[kw].append(story.id)
             
             # Weekly index
             if story.started_at:
-                week = story.started_at.strftime("%Y-W%W")
-                if week not in index.by_week:
-                    index.by_week[week] = []
-                index.by_week[week].append(story.id)
+                by_week[_week_key(story.started_at.date())].append(story.id)
             
-            # Story digest
-            index.story_digests.append(StoryDigest(
+            # Story digest. tech_stack is file-derived (story.technologies may
+            # come from the LLM instead); the memoized scan from _build_story
+            # is reused rather than recomputed.
+            story_digests.append(StoryDigest.model_construct(
                 story_id=story.id,
                 title=story.title,
                 problem_keywords=keywords[:10],
@@ -953,66 +1878,84 @@ class StorySynthesizer:
                 timestamp=story.started_at or story.created_at,
             ))
         
-        return index
+        # Maps hold our own story IDs; skip re-validating every entry
+        return ContentIndex.model_construct(
+            files_to_stories=dict(files_to_stories),
+            keywords_to_stories=dict(keywords_to_stories),
+            story_digests=story_digests,
+            by_week=dict(by_week),
+            last_updated=datetime.now(timezone.utc),
+            story_count=len(stories),
+        )
     
     def _extract_keywords(self, text: str) -> list[str]:
         """Extract keywords from text (simple approach)."""
-        import re
-        
-        # Split on non-word chars, lowercase, filter short words
-        words = re.findall(r'\b[a-z]+\b', text.lower())
-        stopwords = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'for', 'to', 'in', 'on', 'of', 'and', 'or', 'with', 'from'}
-        keywords = [w for w in words if len(w) > 2 and w not in stopwords]
-        
-        # Dedupe while preserving order
-        seen = set()
-        result = []
-        for kw in keywords:
-            if kw not in seen:
-                seen.add(kw)
-                result.append(kw)
-        
-        return result
+        # Lowercase words of 3+ letters minus stopwords, deduped in order
+        words = _KEYWORD_RE.findall(text.lower())
+        return list(dict.fromkeys(w for w in words if w not in _STOPWORDS))
     
     def _detect_tech_stack(self, files: list[str]) -> list[str]:
         """Detect technologies from file extensions/names."""
-        tech = set()
-        
-        ext_map = {
-            '.py': 'Python',
-            '.ts': 'TypeScript',
-            '.tsx': 'React',
-            '.js': 'JavaScript',
-            '.jsx': 'React',
-            '.go': 'Go',
-            '.rs': 'Rust',
-            '.vue': 'Vue',
-            '.sql': 'SQL',
-            '.prisma': 'Prisma',
-            '.graphql': 'GraphQL',
-        }
-        
-        file_map = {
-            'Dockerfile': 'Docker',
-            'docker-compose': 'Docker',
-            'package.json': 'Node.js',
-            'pyproject.toml': 'Python',
-            'Cargo.toml': 'Rust',
-            'go.mod': 'Go',
-        }
-        
-        for f in files:
-            # Check extensions
-            for ext, name in ext_map.items():
-                if f.endswith(ext):
-                    tech.add(name)
-            
-            # Check filenames
-            for fname, name in file_map.items():
-                if fname in f:
-                    tech.add(name)
-        
-        return sorted(tech)
+        return list(_detect_tech_stack_cached(tuple(files)))
+
+
+@lru_cache(maxsize=4096)
+def _week_key(day: date) -> str:
+    """
+    by_week index key for a day, e.g. "2025-W07". Weeks start on Monday and
+    days before the year's first Monday are week 00 (strftime's %W, not ISO
+    weeks, which would move keys across year boundaries).
+    """
+    return day.strftime("%Y-W%W")
+
+
+_TECH_EXT_MAP = {
+    '.py': 'Python',
+    '.ts': 'TypeScript',
+    '.tsx': 'React',
+    '.js': 'JavaScript',
+    '.jsx': 'React',
+    '.go': 'Go',
+    '.rs': 'Rust',
+    '.vue': 'Vue',
+    '.sql': 'SQL',
+    '.prisma': 'Prisma',
+    '.graphql': 'GraphQL',
+}
+
+# One C-level scan per path instead of splitext + dict lookup; longer
+# extensions first so ".tsx" isn't cut short at ".ts"
+_TECH_EXT_RE = re.compile(
+    r"\.(?:" + "|".join(
+        re.escape(ext[1:]) for ext in sorted(_TECH_EXT_MAP, key=len, reverse=True)
+    ) + r")$"
+)
+
+# Matched as substrings of the path (e.g. docker-compose.yml, Dockerfile.prod)
+_TECH_FILE_MAP = {
+    'Dockerfile': 'Docker',
+    'docker-compose': 'Docker',
+    'package.json': 'Node.js',
+    'pyproject.toml': 'Python',
+    'Cargo.toml': 'Rust',
+    'go.mod': 'Go',
+}
+
+# All filename tokens in one alternation; none overlaps another, so
+# findall sees every token a path contains
+_TECH_FILE_RE = re.compile("|".join(map(re.escape, _TECH_FILE_MAP)))
+
+
+@lru_cache(maxsize=1024)
+def _detect_tech_stack_cached(files: tuple[str, ...]) -> tuple[str, ...]:
+    """Single pass over files: one extension match plus one filename-token scan."""
+    tech = set()
+    for f in files:
+        if m := _TECH_EXT_RE.search(f):
+            tech.add(_TECH_EXT_MAP[m.group()])
+        for token in _TECH_FILE_RE.findall(f):
+            tech.add(_TECH_FILE_MAP[token])
+    return tuple(sorted(tech))
 
 
 # =============================================================================
@@ -1026,9 +1969,19 @@ async def synthesize_stories(
     model: str = "gpt-4o-mini",
     batch_size: int = 25,
     progress_callback: Callable[[int, int], None] | None = None,
+    concurrency: int = 8,
+    groups_per_request: int = 1,
+    use_batch_api: bool = False,
+    requests_per_minute: int | None = None,
+    tokens_per_minute: int | None = None,
+    stream: bool = False,
 ) -> tuple[list[Story], ContentIndex]:
     """
     Synthesize stories from commits with batching.
+
+    Batches are sent to the LLM concurrently (up to ``concurrency`` in
+    flight); results are merged in commit order regardless of which batch
+    finishes first.
     
     Args:
         commits: All commits to process
@@ -1036,59 +1989,206 @@ async def synthesize_stories(
         api_key: API key for LLM
         model: Model to use
         batch_size: Commits per batch
-        progress_callback: Optional progress callback(current, total)
+        progress_callback: Optional progress callback(completed, total),
+            called as each batch finishes
+        concurrency: Maximum number of LLM requests in flight at once
+        groups_per_request: Batches packed into each LLM request (>1 trades
+            per-batch prompt overhead and request count for longer responses)
+        use_batch_api: Submit all batches through the OpenAI Batch API
+            instead of live requests (for offline jobs; can take hours)
+        requests_per_minute: Pace live requests to stay under this RPM limit
+        tokens_per_minute: Pace live requests to stay under this TPM limit
+            (only applied together with requests_per_minute)
+        stream: Stream live responses and build stories as they complete
     
     Returns:
         Tuple of (all_stories, merged_index)
     """
-    synthesizer = StorySynthesizer(api_key=api_key, model=model)
-    
-    all_stories = []
-    merged_index = ContentIndex(last_updated=datetime.now(timezone.utc))
-    
-    # Process in batches
-    total_batches = (len(commits) + batch_size - 1) // batch_size
-    
-    for i in range(0, len(commits), batch_size):
-        batch = commits[i:i + batch_size]
-        batch_num = i // batch_size + 1
-        
-        if progress_callback:
-            progress_callback(batch_num, total_batches)
-        
-        stories, index = await synthesizer.synthesize_batch(batch, sessions)
-        all_stories.extend(stories)
-        
-        # Merge index
-        for f, story_ids in index.files_to_stories.items():
-            if f not in merged_index.files_to_stories:
-                merged_index.files_to_stories[f] = []
-            merged_index.files_to_stories[f].extend(story_ids)
-        
-        for kw, story_ids in index.keywords_to_stories.items():
-            if kw not in merged_index.keywords_to_stories:
-                merged_index.keywords_to_stories[kw] = []
-            merged_index.keywords_to_stories[kw].extend(story_ids)
-        
-        for week, story_ids in index.by_week.items():
-            if week not in merged_index.by_week:
-                merged_index.by_week[week] = []
-            merged_index.by_week[week].extend(story_ids)
-        
-        merged_index.story_digests.extend(index.story_digests)
-    
-    merged_index.story_count = len(all_stories)
+    results = sorted(
+        [item async for item in _synthesize_batches(
+            commits, sessions, api_key, model, batch_size, progress_callback,
+            concurrency, groups_per_request, use_batch_api,
+            requests_per_minute, tokens_per_minute, stream,
+        )],
+        key=lambda item: item[0],
+    )
+    all_stories = list(chain.from_iterable(stories for _, stories, _ in results))
+    merged_index = _merge_content_indexes([index for _, _, index in results])
     
     return all_stories, merged_index
 
 
+async def synthesize_stories_stream(
+    commits: list[CommitData],
+    sessions: list[SessionContext] | None = None,
+    **kwargs,
+) -> AsyncIterator[tuple[list[Story], ContentIndex]]:
+    """
+    Synthesize stories, yielding (stories, index) for each batch as it
+    finishes, so callers can render or persist results while later batches
+    are still in flight.
+
+    Batches arrive in completion order, not commit order. Takes the same
+    keyword arguments as synthesize_stories().
+    """
+    async for _, stories, index in _synthesize_batches(commits, sessions, **kwargs):
+        yield stories, index
+
+
+async def _synthesize_batches(
+    commits: list[CommitData],
+    sessions: list[SessionContext] | None = None,
+    api_key: str | None = None,
+    model: str = "gpt-4o-mini",
+    batch_size: int = 25,
+    progress_callback: Callable[[int, int], None] | None = None,
+    concurrency: int = 8,
+    groups_per_request: int = 1,
+    use_batch_api: bool = False,
+    requests_per_minute: int | None = None,
+    tokens_per_minute: int | None = None,
+    stream: bool = False,
+) -> AsyncIterator[tuple[int, list[Story], ContentIndex]]:
+    """Yield (batch position, stories, index) per batch in completion order."""
+    rate_limiter = TokenBucket(requests_per_minute, tokens_per_minute) if requests_per_minute else None
+    synthesizer = StorySynthesizer(
+        api_key=api_key, model=model, rate_limiter=rate_limiter, stream=stream,
+    )
+    
+    batches = [commits[i:i + batch_size] for i in range(0, len(commits), batch_size)]
+    total_batches = len(batches)
+    step = max(1, groups_per_request)
+    requests = [batches[i:i + step] for i in range(0, total_batches, step)]
+    sem = asyncio.Semaphore(max(1, concurrency))
+    completed = 0
+
+    async def _run(
+        first: int, groups: list[list[CommitData]],
+    ) -> tuple[int, list[tuple[list[Story], ContentIndex]]]:
+        nonlocal completed
+        async with sem:
+            if len(groups) == 1:
+                results = [await synthesizer.synthesize_batch(groups[0], sessions)]
+            else:
+                results = await synthesizer.synthesize_groups(groups, sessions)
+        for _ in groups:
+            completed += 1
+            if progress_callback:
+                progress_callback(completed, total_batches)
+        return first, results
+
+    if use_batch_api:
+        results = await synthesizer.synthesize_batches_offline(
+            batches, sessions, concurrency=concurrency,
+        )
+        if progress_callback and total_batches:
+            progress_callback(total_batches, total_batches)
+        for position, (stories, index) in enumerate(results):
+            yield position, stories, index
+        return
+
+    tasks = [
+        asyncio.ensure_future(_run(i * step, groups))
+        for i, groups in enumerate(requests)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            first, results = await next_done
+            for offset, (stories, index) in enumerate(results):
+                yield first + offset, stories, index
+    finally:
+        # The consumer may stop early; don't leave requests running
+        for task in tasks:
+            task.cancel()
+
+
+def _merge_content_indexes(indexes: list[ContentIndex]) -> ContentIndex:
+    """
+    Merge per-batch content indexes, in order, into one index.
+
+    Story ID lists for the same file/keyword/week are concatenated in
+    batch order; story_count is the total number of merged digests.
+    """
+    files_to_stories: defaultdict[str, list[str]] = defaultdict(list)
+    keywords_to_stories: defaultdict[str, list[str]] = defaultdict(list)
+    by_week: defaultdict[str, list[str]] = defaultdict(list)
+
+    for merged, field in (
+        (files_to_stories, "files_to_stories"),
+        (keywords_to_stories, "keywords_to_stories"),
+        (by_week, "by_week"),
+    ):
+        for key, story_ids in chain.from_iterable(
+            getattr(index, field).items() for index in indexes
+        ):
+            merged[key].extend(story_ids)
+
+    story_digests = list(chain.from_iterable(index.story_digests for index in indexes))
+    return ContentIndex.model_construct(
+        files_to_stories=dict(files_to_stories),
+        keywords_to_stories=dict(keywords_to_stories),
+        story_digests=story_digests,
+        by_week=dict(by_week),
+        last_updated=datetime.now(timezone.utc),
+        story_count=len(story_digests),
+    )
+
+
+# One event loop per thread, reused by the *_sync wrappers. asyncio.run()
+# would build a new loop and worker-thread pool (used by to_thread for every
+# LLM request) on each call, e.g. once per story in a feed refresh.
+_sync_loops = threading.local()
+_all_sync_loops: list[asyncio.AbstractEventLoop] = []
+_SYNC_LOOPS_LOCK = threading.Lock()
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    """Get this thread's reusable event loop, creating it if needed."""
+    loop = getattr(_sync_loops, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _sync_loops.loop = loop
+        with _SYNC_LOOPS_LOCK:
+            _all_sync_loops.append(loop)
+    return loop
+
+
+def _run_sync(coro):
+    """Run a coroutine to completion on this thread's reusable loop."""
+    return _get_sync_loop().run_until_complete(coro)
+
+
+@atexit.register
+def _close_sync_resources() -> None:
+    """Shut down the reusable loops (and their executors) and shared clients at exit."""
+    with _SYNC_LOOPS_LOCK:
+        loops, _all_sync_loops[:] = list(_all_sync_loops), []
+    for loop in loops:
+        if loop.is_closed() or loop.is_running():
+            continue
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.run_until_complete(loop.shutdown_default_executor())
+        finally:
+            loop.close()
+
+    with _CLIENT_CACHE_LOCK:
+        clients = list(_CLIENT_CACHE.values())
+        _CLIENT_CACHE.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
 def synthesize_stories_sync(
     commits: list[CommitData],
     sessions: list[SessionContext] | None = None,
     **kwargs,
 ) -> tuple[list[Story], ContentIndex]:
     """Synchronous wrapper for synthesize_stories."""
-    return asyncio.run(synthesize_stories(commits, sessions, **kwargs))
+    return _run_sync(synthesize_stories(commits, sessions, **kwargs))
 
 
 # =============================================================================
@@ -1117,76 +2217,143 @@ class InternalStory(BaseModel):
     post_body: str = Field(description="Final natural internal update (3–6 sentences)")
 
 
-async def transform_story_for_feed(
-    story: Story,
-    mode: str = "public",
-    api_key: str | None = None,
-    base_url: str | None = None,
-    model: str | None = None,
-) -> PublicStory | InternalStory:
-    """
-    Transform a technical story into a build-in-public feed post.
+# Stories per request in transform_stories_for_feed. One request shares the
+# system prompt across the group; larger groups start to blur stories together.
+_FEED_BATCH_SIZE = 8
 
-    Args:
-        story: The Story to transform
-        mode: "public" (impact only) or "internal" (with technical details)
-        api_key: Optional API key
-        base_url: Optional base URL for API
-        model: Optional model name
+# Feed transform requests in flight at once
+_FEED_CONCURRENCY = 8
 
-    Returns:
-        PublicStory or InternalStory depending on mode
+# Feed posts are a few sentences plus the JSON keys; cap output per story
+# (with headroom, so a wordy post isn't cut off mid-JSON) and keep sampling
+# fairly tight so fewer results need the _check_feed_result patch-up
+_FEED_MAX_TOKENS_PUBLIC = 800
+_FEED_MAX_TOKENS_INTERNAL = 1200
+_FEED_TEMPERATURE = 0.4
+
+
+class _PublicStoryBatch(BaseModel):
+    """LLM output for a batch of public stories."""
+    results: list[PublicStory]
+
+
+class _InternalStoryBatch(BaseModel):
+    """LLM output for a batch of internal stories."""
+    results: list[InternalStory]
+
+
+def _feed_prompt_fields(story: Story) -> dict[str, str]:
+    """Format a story's fields for the feed transform prompts."""
+    return {
+        "title": story.title,
+        "category": story.category,
+        "problem": story.problem or "Not specified",
+        "approach": story.approach or "Not specified",
+        "outcome": story.outcome or "Not specified",
+        "implementation_details": "\n".join(f"- {d}" for d in story.implementation_details) if story.implementation_details else "None",
+        "decisions": "\n".join(f"- {d}" for d in story.decisions) if story.decisions else "None",
+        "files": ", ".join(story.files[:10]) if story.files else "None",
+    }
+
+
+def _feed_batch_record(number: int, story: Story, mode: str) -> dict[str, Any]:
+    """Build one numbered story record for a batched feed prompt."""
+    record = {
+        "story": number,
+        "title": story.title,
+        "category": story.category,
+        "problem": story.problem or "Not specified",
+        "approach": story.approach or "Not specified",
+        "outcome": story.outcome or "Not specified",
+        "implementation_details": story.implementation_details,
+    }
+    if mode != "public":
+        record["decisions"] = story.decisions
+        record["files"] = story.files[:10]
+    return record
+
+
+def _strict_json_schema(model_cls: type[BaseModel]) -> dict[str, Any]:
     """
-    synthesizer = StorySynthesizer(api_key=api_key, base_url=base_url, model=model)
-    client = synthesizer._get_client()
-    client_type = synthesizer._client_type or "openai"
-    model_name = synthesizer.model
+    JSON schema for a pydantic model in the shape OpenAI's strict structured
+    outputs accept: every property required, no extra properties, and no
+    defaults or titles.
+    """
+    def strict(node: Any, is_properties: bool = False) -> Any:
+        if isinstance(node, list):
+            return [strict(item) for item in node]
+        if not isinstance(node, dict):
+            return node
+        if is_properties:
+            # Keys here are field names, not schema keywords
+            return {name: strict(schema) for name, schema in node.items()}
+        node = {
+            key: strict(value, key in ("properties", "$defs"))
+            for key, value in node.items()
+            if key not in ("default", "title")
+        }
+        if node.get("type") == "object" and "properties" in node:
+            node["required"] = list(node["properties"])
+            node["additionalProperties"] = False
+        return node
+
+    return strict(model_cls.model_json_schema())
+
+
+def _json_schema_format(model_cls: type[BaseModel]) -> dict[str, Any]:
+    """Build an OpenAI json_schema response_format for a pydantic model."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model_cls.__name__.lstrip("_"),
+            "schema": _strict_json_schema(model_cls),
+            "strict": True,
+        },
+    }
 
-    # Format implementation details
-    impl_details = "\n".join(f"- {d}" for d in story.implementation_details) if story.implementation_details else "None"
-    decisions = "\n".join(f"- {d}" for d in story.decisions) if story.decisions else "None"
-    files = ", ".join(story.files[:10]) if story.files else "None"
 
-    if mode == "public":
-        system_prompt = PUBLIC_STORY_SYSTEM
-        user_prompt = PUBLIC_STORY_USER.format(
-            title=story.title,
-            category=story.category,
-            problem=story.problem or "Not specified",
-            approach=story.approach or "Not specified",
-            outcome=story.outcome or "Not specified",
-            implementation_details=impl_details,
-        )
-        response_model = PublicStory
-    else:
-        system_prompt = INTERNAL_STORY_SYSTEM
-        user_prompt = INTERNAL_STORY_USER.format(
-            title=story.title,
-            category=story.category,
-            problem=story.problem or "Not specified",
-            approach=story.approach or "Not specified",
-            outcome=story.outcome or "Not specified",
-            implementation_details=impl_details,
-            decisions=decisions,
-            files=files,
-        )
-        response_model = InternalStory
+# Structured-output formats for the feed transforms, built once
+_FEED_RESPONSE_FORMATS = {
+    model_cls: _json_schema_format(model_cls)
+    for model_cls in (PublicStory, InternalStory, _PublicStoryBatch, _InternalStoryBatch)
+}
 
-    def make_story_request(use_temperature: bool = True):
-        actual_model = model_name.split("/")[-1] if "/" in model_name else model_name
 
+def _feed_request(
+    synthesizer: "StorySynthesizer",
+    system_prompt: str,
+    user_prompt: str,
+    max_tokens: int = 4096,
+    response_model: type[BaseModel] | None = None,
+) -> str:
+    """
+    Run one feed transform request and return the JSON text of the response.
+
+    With ``response_model``, OpenAI-compatible providers are asked for
+    schema-conforming output; providers that reject json_schema get a
+    plain json_object request instead.
+    """
+    client = synthesizer._get_client()
+    client_type = synthesizer._client_type or "openai"
+    actual_model = synthesizer.api_model
+
+    def make_story_request(
+        use_temperature: bool = True,
+        use_schema: bool = True,
+        cap_param: str = "max_tokens",
+    ):
         if client_type == "anthropic":
             # Anthropic API format
             kwargs = {
                 "model": actual_model,
-                "system": system_prompt,
+                "system": _anthropic_system(system_prompt),
                 "messages": [
                     {"role": "user", "content": user_prompt},
                 ],
-                "max_tokens": 4096,
+                "max_tokens": max_tokens,
             }
             if use_temperature:
-                kwargs["temperature"] = 0.7
+                kwargs["temperature"] = _FEED_TEMPERATURE
             return client.messages.create(**kwargs)
         else:
             # OpenAI API format
@@ -1196,44 +2363,180 @@ async def transform_story_for_feed(
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt},
                 ],
-                "response_format": {"type": "json_object"},
+                "response_format": (
+                    _FEED_RESPONSE_FORMATS[response_model]
+                    if use_schema and response_model is not None
+                    else {"type": "json_object"}
+                ),
+                cap_param: max_tokens,
             }
             if use_temperature:
-                kwargs["temperature"] = 0.7
+                kwargs["temperature"] = _FEED_TEMPERATURE
             return client.chat.completions.create(**kwargs)
 
-    try:
-        # Use sync client to avoid event loop cleanup issues
+    # Use sync client to avoid event loop cleanup issues
+    options = {"use_temperature": True, "use_schema": response_model is not None}
+    while True:
         try:
-            response = make_story_request(use_temperature=True)
+            response = make_story_request(**options)
+            break
         except Exception as e:
-            if "temperature" in str(e).lower() and "unsupported" in str(e).lower():
-                response = make_story_request(use_temperature=False)
+            message = str(e).lower()
+            if options["use_temperature"] and "temperature" in message and "unsupported" in message:
+                options["use_temperature"] = False
+            elif options["use_schema"] and ("json_schema" in message or "response_format" in message):
+                options["use_schema"] = False
+            elif "cap_param" not in options and "max_completion_tokens" in message:
+                # Newer OpenAI models only take max_completion_tokens
+                options["cap_param"] = "max_completion_tokens"
             else:
                 raise
 
-        # Extract content from response (different formats for OpenAI vs Anthropic)
-        if client_type == "anthropic":
-            content = response.content[0].text.strip()
-        else:
-            content = response.choices[0].message.content.strip()
+    # Extract content from response (different formats for OpenAI vs Anthropic)
+    if client_type == "anthropic":
+        content = response.content[0].text
+    else:
+        content = response.choices[0].message.content
 
-        # Strip markdown code fences if present
-        if content.startswith("```"):
-            first_newline = content.find("\n")
-            if first_newline > 0:
-                content = content[first_newline + 1:]
-            if content.endswith("```"):
-                content = content[:-3].rstrip()
+    return _clean_llm_json(content)
 
-        result = response_model.model_validate_json(content)
 
-        # Quality check: if hook is empty or too generic, or post_body is empty/short, regenerate
-        if not result.hook or len(result.hook) < 10:
-            result = _enhance_with_fallback(result, story, mode)
-        elif not result.post_body or len(result.post_body.strip()) < 40:
-            result = _enhance_with_fallback(result, story, mode)
+def _feed_cache_key(mode: str, model_name: str, system_prompt: str, user_prompt: str) -> str:
+    """Key a feed post by everything that goes into its request."""
+    payload = "\0".join((mode, model_name, system_prompt, user_prompt))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _feed_cache_connect() -> sqlite3.Connection:
+    """Open the feed post cache, creating it if needed."""
+    from .config import FEED_CACHE_FILE
+
+    FEED_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(FEED_CACHE_FILE), timeout=5.0)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS feed_posts (
+            key TEXT PRIMARY KEY,
+            mode TEXT NOT NULL,
+            json TEXT NOT NULL,
+            created_at INTEGER NOT NULL
+        )
+    """)
+    return conn
+
+
+def _feed_cache_get(
+    keys: list[str],
+    model_cls: type[BaseModel],
+) -> dict[str, PublicStory | InternalStory]:
+    """Look up cached feed posts. Best effort: failures read as misses."""
+    try:
+        conn = _feed_cache_connect()
+        try:
+            placeholders = ",".join("?" * len(keys))
+            rows = conn.execute(
+                f"SELECT key, json FROM feed_posts WHERE key IN ({placeholders})", keys
+            ).fetchall()
+        finally:
+            conn.close()
+    except (OSError, sqlite3.Error):
+        return {}
+
+    cached = {}
+    for key, data in rows:
+        try:
+            cached[key] = model_cls.model_validate_json(data)
+        except ValidationError:
+            pass
+    return cached
+
+
+def _feed_cache_put(mode: str, results: dict[str, PublicStory | InternalStory]) -> None:
+    """Cache generated feed posts. Best effort: failures are ignored."""
+    now = int(time.time())
+    try:
+        conn = _feed_cache_connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO feed_posts (key, mode, json, created_at) VALUES (?, ?, ?, ?)",
+                    [(key, mode, result.model_dump_json(), now) for key, result in results.items()],
+                )
+        finally:
+            conn.close()
+    except (OSError, sqlite3.Error):
+        pass
+
+
+def _check_feed_result(
+    result: PublicStory | InternalStory,
+    story: Story,
+    mode: str,
+) -> PublicStory | InternalStory:
+    """Patch up a result whose hook or post body is empty or too short."""
+    if not result.hook or len(result.hook) < 10:
+        return _enhance_with_fallback(result, story, mode)
+    if not result.post_body or len(result.post_body.strip()) < 40:
+        return _enhance_with_fallback(result, story, mode)
+    return result
+
+
+async def transform_story_for_feed(
+    story: Story,
+    mode: str = "public",
+    api_key: str | None = None,
+    base_url: str | None = None,
+    model: str | None = None,
+    synthesizer: StorySynthesizer | None = None,
+) -> PublicStory | InternalStory:
+    """
+    Transform a technical story into a build-in-public feed post.
+
+    Generated posts are cached under FEED_CACHE_FILE, keyed by mode, model
+    and prompt, so re-running on an unchanged story skips the LLM call.
+
+    Args:
+        story: The Story to transform
+        mode: "public" (impact only) or "internal" (with technical details)
+        api_key: Optional API key
+        base_url: Optional base URL for API
+        model: Optional model name
+        synthesizer: Optional synthesizer whose client and resolved model
+            to reuse (the credential arguments are then ignored)
+
+    Returns:
+        PublicStory or InternalStory depending on mode
+    """
+    if synthesizer is None:
+        synthesizer = StorySynthesizer(api_key=api_key, base_url=base_url, model=model)
+    synthesizer._get_client()
+    fields = _feed_prompt_fields(story)
+
+    if mode == "public":
+        system_prompt = PUBLIC_STORY_SYSTEM
+        user_prompt = PUBLIC_STORY_USER.format(**fields)
+        response_model = PublicStory
+        max_tokens = _FEED_MAX_TOKENS_PUBLIC
+    else:
+        system_prompt = INTERNAL_STORY_SYSTEM
+        user_prompt = INTERNAL_STORY_USER.format(**fields)
+        response_model = InternalStory
+        max_tokens = _FEED_MAX_TOKENS_INTERNAL
+
+    # Same story, prompt and model: reuse the post generated last time
+    cache_key = _feed_cache_key(mode, synthesizer.model, system_prompt, user_prompt)
+    if cached := _feed_cache_get([cache_key], response_model):
+        return cached[cache_key]
+
+    try:
+        # Sync client in a worker thread, so concurrent transforms overlap
+        content = await asyncio.to_thread(
+            _feed_request, synthesizer, system_prompt, user_prompt, max_tokens, response_model
+        )
+        result = _parse_llm_json(response_model, content)
 
+        # Quality check: if hook is empty or too generic, or post_body is empty/short, regenerate
+        result = _check_feed_result(result, story, mode)
+        _feed_cache_put(mode, {cache_key: result})
         return result
 
     except Exception as e:
@@ -1244,6 +2547,102 @@ async def transform_story_for_feed(
         return _build_fallback_codex(story, mode)
 
 
+async def transform_stories_for_feed(
+    stories: list[Story],
+    mode: str = "public",
+    api_key: str | None = None,
+    base_url: str | None = None,
+    model: str | None = None,
+    batch_size: int = _FEED_BATCH_SIZE,
+) -> list[PublicStory | InternalStory]:
+    """
+    Transform several stories into feed posts, packing up to ``batch_size``
+    stories into each LLM request.
+
+    Stories with a cached post (see transform_story_for_feed) are not sent,
+    and identical stories are only sent once.
+    Groups are requested concurrently, up to _FEED_CONCURRENCY at a time.
+    A group whose response doesn't validate (or doesn't have one result per
+    story) is retried one story at a time with transform_story_for_feed.
+
+    Returns:
+        One PublicStory or InternalStory per input story, in order
+    """
+    if not stories:
+        return []
+
+    synthesizer = StorySynthesizer(api_key=api_key, base_url=base_url, model=model)
+    synthesizer._get_client()
+
+    if mode == "public":
+        system_prompt, story_template, user_template, response_model, batch_model = (
+            PUBLIC_STORY_SYSTEM, PUBLIC_STORY_USER, PUBLIC_STORY_BATCH_USER,
+            PublicStory, _PublicStoryBatch,
+        )
+        story_max_tokens = _FEED_MAX_TOKENS_PUBLIC
+    else:
+        system_prompt, story_template, user_template, response_model, batch_model = (
+            INTERNAL_STORY_SYSTEM, INTERNAL_STORY_USER, INTERNAL_STORY_BATCH_USER,
+            InternalStory, _InternalStoryBatch,
+        )
+        story_max_tokens = _FEED_MAX_TOKENS_INTERNAL
+
+    # Cache entries are keyed by the single-story prompt, so they're shared
+    # with transform_story_for_feed whichever path generated them
+    keys = [
+        _feed_cache_key(
+            mode, synthesizer.model, system_prompt,
+            story_template.format(**_feed_prompt_fields(story)),
+        )
+        for story in stories
+    ]
+    cached = _feed_cache_get(keys, response_model)
+
+    async def transform_one(story: Story) -> PublicStory | InternalStory:
+        return await transform_story_for_feed(story, mode, synthesizer=synthesizer)
+
+    semaphore = asyncio.Semaphore(_FEED_CONCURRENCY)
+
+    async def transform_group(group: list[int]) -> list[PublicStory | InternalStory]:
+        async with semaphore:
+            return await request_group(group)
+
+    async def request_group(group: list[int]) -> list[PublicStory | InternalStory]:
+        if len(group) == 1:
+            return [await transform_one(stories[group[0]])]
+
+        records = [_feed_batch_record(n, stories[i], mode) for n, i in enumerate(group, 1)]
+        user_prompt = user_template.format(
+            stories_json=json.dumps(records, indent=2, ensure_ascii=False)
+        )
+        try:
+            content = await asyncio.to_thread(
+                _feed_request, synthesizer, system_prompt, user_prompt,
+                story_max_tokens * len(group), batch_model,
+            )
+            results = _parse_llm_json(batch_model, content).results
+        except Exception:
+            results = []
+        if len(results) != len(group):
+            return [await transform_one(stories[i]) for i in group]
+
+        results = [_check_feed_result(r, stories[i], mode) for r, i in zip(results, group)]
+        _feed_cache_put(mode, {keys[i]: r for r, i in zip(results, group)})
+        return results
+
+    # Identical stories (same prompt) are generated once and shared
+    first_index: dict[str, int] = {}
+    for i, key in enumerate(keys):
+        if key not in cached:
+            first_index.setdefault(key, i)
+    misses = list(first_index.values())
+    groups = [misses[i:i + batch_size] for i in range(0, len(misses), max(batch_size, 1))]
+    transformed = await asyncio.gather(*(transform_group(group) for group in groups))
+
+    generated = dict(zip((keys[i] for i in misses), chain.from_iterable(transformed)))
+    return [cached.get(key) or generated[key] for key in keys]
+
+
 def _build_post_body_public(hook: str, what: str, value: str, insight: str) -> str:
     """Build natural post body for public mode."""
     what_clean = what.rstrip(".").rstrip()
@@ -1267,75 +2666,88 @@ def _build_post_body_internal(hook: str, problem: str, what: str, how: list[str]
     return body.strip()
 
 
-def _build_fallback_codex(story: Story, mode: str) -> PublicStory | InternalStory:
-    """Build structured Tripartite Codex content when LLM fails."""
-    import random
-
-    # Hook variations by category
-    category_hooks = {
-        "feature": [
-            "Finally built the thing.",
-            "New capability unlocked.",
-            "This changes everything. (Well, something.)",
-            "Shipped it.",
-        ],
-        "bugfix": [
-            "One less thing to worry about.",
-            "The bug is dead. Long live the code.",
-            "Found it. Fixed it. Done.",
-            "That crash? Gone.",
-        ],
-        "refactor": [
-            "Same behavior. Better code.",
-            "Future me will thank present me.",
-            "Cleaned up the mess.",
-            "Technical debt: paid.",
-        ],
-        "perf": [
-            "Faster now.",
-            "Speed boost shipped.",
-            "Shaved off the milliseconds.",
-            "Performance win.",
-        ],
-        "infra": [
-            "Infrastructure that just works.",
-            "Set it up. Forgot about it.",
-            "The plumbing nobody sees.",
-            "Foundation laid.",
-        ],
-        "docs": [
-            "Wrote it down so I won't forget.",
-            "Documentation: the async communication.",
-            "Now it's not just in my head.",
-            "Future onboarding: simplified.",
-        ],
-        "test": [
-            "Now I can refactor with confidence.",
-            "Tests: the safety net.",
-            "Covered.",
-            "One more thing that won't break silently.",
-        ],
-        "chore": [
-            "Housekeeping done.",
-            "Small fix. Big relief.",
-            "Maintenance mode.",
-            "Keeping things tidy.",
-        ],
-    }
+# Fallback hooks and insights by story category, used when the LLM fails
+# (_build_fallback_codex) or returns a weak hook (_enhance_with_fallback)
+_CATEGORY_HOOKS_FULL: dict[str, tuple[str, ...]] = {
+    "feature": (
+        "Finally built the thing.",
+        "New capability unlocked.",
+        "This changes everything. (Well, something.)",
+        "Shipped it.",
+    ),
+    "bugfix": (
+        "One less thing to worry about.",
+        "The bug is dead. Long live the code.",
+        "Found it. Fixed it. Done.",
+        "That crash? Gone.",
+    ),
+    "refactor": (
+        "Same behavior. Better code.",
+        "Future me will thank present me.",
+        "Cleaned up the mess.",
+        "Technical debt: paid.",
+    ),
+    "perf": (
+        "Faster now.",
+        "Speed boost shipped.",
+        "Shaved off the milliseconds.",
+        "Performance win.",
+    ),
+    "infra": (
+        "Infrastructure that just works.",
+        "Set it up. Forgot about it.",
+        "The plumbing nobody sees.",
+        "Foundation laid.",
+    ),
+    "docs": (
+        "Wrote it down so I won't forget.",
+        "Documentation: the async communication.",
+        "Now it's not just in my head.",
+        "Future onboarding: simplified.",
+    ),
+    "test": (
+        "Now I can refactor with confidence.",
+        "Tests: the safety net.",
+        "Covered.",
+        "One more thing that won't break silently.",
+    ),
+    "chore": (
+        "Housekeeping done.",
+        "Small fix. Big relief.",
+        "Maintenance mode.",
+        "Keeping things tidy.",
+    ),
+}
+
+_CATEGORY_INSIGHTS = {
+    "feature": "New capabilities unlock new possibilities.",
+    "bugfix": "Fewer edge cases mean more reliable software.",
+    "refactor": "Cleaner code is easier to extend.",
+    "perf": "Performance gains compound over time.",
+    "infra": "Good infrastructure is invisible until it's missing.",
+    "docs": "Documentation is a gift to your future self.",
+    "test": "Tests are the safety net that enables bold changes.",
+    "chore": "Small maintenance prevents big problems.",
+}
+
+_CATEGORY_HOOKS_ENHANCE: dict[str, tuple[str, ...]] = {
+    "feature": ("Finally built the thing.", "New capability unlocked.", "Shipped it."),
+    "bugfix": ("One less thing to worry about.", "Found it. Fixed it.", "That crash? Gone."),
+    "refactor": ("Same behavior. Better code.", "Technical debt: paid.", "Cleaned up."),
+    "perf": ("Faster now.", "Speed boost shipped.", "Performance win."),
+    "infra": ("Infrastructure that works.", "Foundation laid.", "Set up and running."),
+    "docs": ("Wrote it down.", "Now it's documented.", "Future-proofed the knowledge."),
+    "test": ("Now I can refactor safely.", "Covered.", "Tests added."),
+    "chore": ("Housekeeping done.", "Small fix. Big relief.", "Tidied up."),
+}
+
+_RAND = random.Random()
 
-    category_insights = {
-        "feature": "New capabilities unlock new possibilities.",
-        "bugfix": "Fewer edge cases mean more reliable software.",
-        "refactor": "Cleaner code is easier to extend.",
-        "perf": "Performance gains compound over time.",
-        "infra": "Good infrastructure is invisible until it's missing.",
-        "docs": "Documentation is a gift to your future self.",
-        "test": "Tests are the safety net that enables bold changes.",
-        "chore": "Small maintenance prevents big problems.",
-    }
 
-    hooks = category_hooks.get(story.category, category_hooks["chore"])
-    hook = random.choice(hooks)
+def _build_fallback_codex(story: Story, mode: str) -> PublicStory | InternalStory:
+    """Build structured Tripartite Codex content when LLM fails."""
+    hooks = _CATEGORY_HOOKS_FULL.get(story.category, _CATEGORY_HOOKS_FULL["chore"])
+    hook = _RAND.choice(hooks)
 
     # Build what from title
     what = story.title.rstrip(".")
@@ -1344,7 +2756,7 @@ def _build_fallback_codex(story: Story, mode: str) -> PublicStory | InternalStor
     value = story.outcome if story.outcome else f"Improves the {story.category} workflow."
 
     # Build insight
-    insight = category_insights.get(story.category, "Incremental progress adds up.")
+    insight = _CATEGORY_INSIGHTS.get(story.category, "Incremental progress adds up.")
 
     if mode == "public":
         post_body = _build_post_body_public(hook, what, value, insight)
@@ -1374,21 +2786,8 @@ def _build_fallback_codex(story: Story, mode: str) -> PublicStory | InternalStor
 
 def _enhance_with_fallback(result: PublicStory | InternalStory, story: Story, mode: str) -> PublicStory | InternalStory:
     """Enhance a weak LLM result with fallback data."""
-    import random
-
-    category_hooks = {
-        "feature": ["Finally built the thing.", "New capability unlocked.", "Shipped it."],
-        "bugfix": ["One less thing to worry about.", "Found it. Fixed it.", "That crash? Gone."],
-        "refactor": ["Same behavior. Better code.", "Technical debt: paid.", "Cleaned up."],
-        "perf": ["Faster now.", "Speed boost shipped.", "Performance win."],
-        "infra": ["Infrastructure that works.", "Foundation laid.", "Set up and running."],
-        "docs": ["Wrote it down.", "Now it's documented.", "Future-proofed the knowledge."],
-        "test": ["Now I can refactor safely.", "Covered.", "Tests added."],
-        "chore": ["Housekeeping done.", "Small fix. Big relief.", "Tidied up."],
-    }
-
-    hooks = category_hooks.get(story.category, ["Done."])
-    new_hook = random.choice(hooks)
+    hooks = _CATEGORY_HOOKS_ENHANCE.get(story.category, ("Done.",))
+    new_hook = _RAND.choice(hooks)
 
     if mode == "public":
         what = result.what or story.title
@@ -1438,4 +2837,13 @@ def transform_story_for_feed_sync(
     **kwargs,
 ) -> PublicStory | InternalStory:
     """Synchronous wrapper for transform_story_for_feed."""
-    return asyncio.run(transform_story_for_feed(story, mode, **kwargs))
+    return _run_sync(transform_story_for_feed(story, mode, **kwargs))
+
+
+def transform_stories_for_feed_sync(
+    stories: list[Story],
+    mode: str = "public",
+    **kwargs,
+) -> list[PublicStory | InternalStory]:
+    """Synchronous wrapper for transform_stories_for_feed."""
+    return _run_sync(transform_stories_for_feed(stories, mode, **kwargs))
@@ -14,20 +14,32 @@ Transparency:
 - Source code is open (you're reading it!)
 """
 
+import atexit
 import hashlib
 import json
 import os
 import platform
+import tempfile
+import threading
 import uuid
+from collections import deque
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import httpx
 
+# Prefer orjson for the queue file when it is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from . import __version__
 from .config import (
     CONFIG_DIR,
+    CONFIG_FILE,
     AUDIT_DIR,
     load_config,
     save_config,
@@ -41,19 +53,42 @@ TELEMETRY_ENDPOINT = os.getenv(
     "https://api.repr.dev/api/cli/telemetry"
 )
 
-# Local telemetry queue file
-TELEMETRY_QUEUE_FILE = AUDIT_DIR / "telemetry_queue.json"
+# Local telemetry queue file (one JSON event per line, appended)
+TELEMETRY_QUEUE_FILE = AUDIT_DIR / "telemetry_queue.jsonl"
+
+# Queue file from older versions (a single JSON array), still read and cleared
+LEGACY_QUEUE_FILE = AUDIT_DIR / "telemetry_queue.json"
+
+# Only the most recent events are kept. Appends don't read the queue, so it
+# is trimmed back to MAX_QUEUED_EVENTS once the file grows past this size.
+MAX_QUEUED_EVENTS = 100
+_QUEUE_TRIM_BYTES = 64 * 1024
 
 # Device ID file (anonymous, persistent)
 DEVICE_ID_FILE = CONFIG_DIR / ".device_id"
 
 
-def is_telemetry_enabled() -> bool:
-    """Check if telemetry is enabled."""
+def _config_stamp() -> int | None:
+    """Config file mtime, used to invalidate the cached telemetry setting."""
+    try:
+        return CONFIG_FILE.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=1)
+def _telemetry_enabled(config_stamp: int | None) -> bool:
+    """Read the telemetry setting from config (cached per config mtime)."""
     config = load_config()
     return config.get("privacy", {}).get("telemetry_enabled", False)
 
 
+def is_telemetry_enabled() -> bool:
+    """Check if telemetry is enabled."""
+    # Checked on every tracked event; only re-read config when it changes
+    return _telemetry_enabled(_config_stamp())
+
+
 def enable_telemetry() -> None:
     """Enable telemetry (opt-in)."""
     set_config_value("privacy.telemetry_enabled", True)
@@ -70,6 +105,7 @@ def disable_telemetry() -> None:
     clear_queue()
 
 
+@lru_cache(maxsize=1)
 def get_device_id() -> str:
     """
     Get or create anonymous device ID.
@@ -78,11 +114,15 @@ def get_device_id() -> str:
     - Random UUID, hashed for extra anonymity
     - Persistent across sessions
     - Not linked to any PII
+
+    The file is read once per process.
     """
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    
-    if DEVICE_ID_FILE.exists():
+    try:
         return DEVICE_ID_FILE.read_text().strip()
+    except FileNotFoundError:
+        pass
+    
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     
     # Generate new anonymous ID
     raw_id = str(uuid.uuid4())
@@ -105,6 +145,12 @@ def get_context() -> dict[str, Any]:
     Never includes:
     - Username, email, paths, code, etc.
     """
+    return dict(_context())
+
+
+@lru_cache(maxsize=1)
+def _context() -> dict[str, Any]:
+    """Build the event context once per process; none of it changes."""
     return {
         "device_id": get_device_id(),
         "cli_version": __version__,
@@ -136,8 +182,8 @@ def track(event: str, properties: dict[str, Any] | None = None) -> None:
     # Queue event locally
     _queue_event(event_data)
     
-    # Try to flush queue (non-blocking)
-    _try_flush_queue()
+    # Send in the background so the CLI never waits on the network
+    _schedule_flush()
 
 
 def track_command(command: str, subcommand: str | None = None, success: bool = True) -> None:
@@ -183,58 +229,203 @@ def track_feature(feature: str, action: str, metadata: dict[str, Any] | None = N
     track("feature_used", properties)
 
 
+def _encode_event(event: dict[str, Any]) -> bytes:
+    """Serialize one event as a compact JSON line."""
+    if orjson is not None:
+        return orjson.dumps(event) + b"\n"
+    return json.dumps(event, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _json_loads(data: bytes | str) -> Any:
+    """Parse JSON (orjson errors subclass JSONDecodeError)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Serializes queue file changes between the CLI and the flush thread. The
+# generation counter moves whenever the file is rewritten wholesale, so a
+# flush knows whether the bytes it sent are still the head of the file.
+_queue_lock = threading.Lock()
+_queue_generation = 0
+
+
 def _queue_event(event: dict[str, Any]) -> None:
     """Queue an event locally for later sending."""
     AUDIT_DIR.mkdir(parents=True, exist_ok=True)
-    
-    # Load existing queue
-    queue = _load_queue()
-    
-    # Add event
-    queue.append(event)
-    
-    # Keep only last 100 events
-    if len(queue) > 100:
-        queue = queue[-100:]
-    
-    # Save
-    TELEMETRY_QUEUE_FILE.write_text(json.dumps(queue, indent=2))
 
+    with _queue_lock:
+        with open(TELEMETRY_QUEUE_FILE, "ab") as f:
+            f.write(_encode_event(event))
+            size = f.tell()
 
-def _load_queue() -> list[dict[str, Any]]:
-    """Load the telemetry queue."""
-    if not TELEMETRY_QUEUE_FILE.exists():
-        return []
-    
+        if size > _QUEUE_TRIM_BYTES:
+            _trim_queue()
+
+
+def _write_queue_file(data: bytes) -> None:
+    """Atomically replace the queue file contents."""
+    fd, tmp_path = tempfile.mkstemp(dir=AUDIT_DIR, suffix=".tmp")
     try:
-        return json.loads(TELEMETRY_QUEUE_FILE.read_text())
-    except (json.JSONDecodeError, IOError):
-        return []
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, TELEMETRY_QUEUE_FILE)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+def _trim_queue() -> None:
+    """Rewrite the queue file keeping only the last MAX_QUEUED_EVENTS lines."""
+    global _queue_generation
+    try:
+        with open(TELEMETRY_QUEUE_FILE, "rb") as f:
+            lines = deque(f, maxlen=MAX_QUEUED_EVENTS)
+        _write_queue_file(b"".join(lines))
+        _queue_generation += 1
+    except OSError:
+        pass
+
+
+def _read_queue() -> tuple[list[dict[str, Any]], int]:
+    """
+    Read the telemetry queue.
+
+    Returns:
+        The last MAX_QUEUED_EVENTS events and the number of queue file bytes
+        they were read from
+    """
+    queue = []
+
+    try:
+        legacy = _json_loads(LEGACY_QUEUE_FILE.read_bytes())
+        if isinstance(legacy, list):
+            queue.extend(legacy)
+    except (json.JSONDecodeError, OSError):
+        pass
+
+    try:
+        data = TELEMETRY_QUEUE_FILE.read_bytes()
+    except OSError:
+        data = b""
+    for line in data.splitlines():
+        try:
+            queue.append(_json_loads(line))
+        except json.JSONDecodeError:
+            # Skip a line torn by an interrupted write
+            continue
+
+    return queue[-MAX_QUEUED_EVENTS:], len(data)
+
+
+def _load_queue() -> list[dict[str, Any]]:
+    """Load the telemetry queue (the last MAX_QUEUED_EVENTS events)."""
+    return _read_queue()[0]
+
+
+# One pooled client per process, so repeated flushes reuse the connection
+_http_client: httpx.Client | None = None
+_http_client_lock = threading.Lock()
+
+
+def _get_http_client() -> httpx.Client:
+    """Get the telemetry HTTP client, creating it on first use."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            # Timeout: 2 seconds, so a stuck send can't hold up exit
+            _http_client = httpx.Client(
+                timeout=2.0,
+                limits=httpx.Limits(max_keepalive_connections=2, keepalive_expiry=60.0),
+            )
+        return _http_client
 
 
 def _try_flush_queue() -> None:
-    """Try to send queued events (non-blocking, best effort)."""
-    queue = _load_queue()
+    """Try to send queued events (best effort)."""
+    with _queue_lock:
+        queue, sent_bytes = _read_queue()
+        generation = _queue_generation
     if not queue:
         return
     
     try:
-        # Send batch (timeout: 2 seconds to not block CLI)
-        with httpx.Client(timeout=2.0) as client:
-            response = client.post(
-                TELEMETRY_ENDPOINT,
-                json={"events": queue},
-                headers={"Content-Type": "application/json"},
-            )
-            
-            if response.status_code == 200:
-                # Clear queue on success
-                clear_queue()
+        response = _get_http_client().post(
+            TELEMETRY_ENDPOINT,
+            json={"events": queue},
+            headers={"Content-Type": "application/json"},
+        )
+        
+        if response.status_code == 200:
+            # Drop what was sent; keep events queued while we were sending
+            _drop_sent(sent_bytes, generation)
     except Exception:
         # Silently fail - telemetry should never break the CLI
         pass
 
 
+def _drop_sent(sent_bytes: int, generation: int) -> None:
+    """Remove the first ``sent_bytes`` of the queue file after a send."""
+    with _queue_lock:
+        LEGACY_QUEUE_FILE.unlink(missing_ok=True)
+        if generation != _queue_generation:
+            # Rewritten mid-send; keep everything (may resend a few events)
+            return
+        try:
+            rest = TELEMETRY_QUEUE_FILE.read_bytes()[sent_bytes:]
+        except OSError:
+            return
+        if rest:
+            _write_queue_file(rest)
+        else:
+            TELEMETRY_QUEUE_FILE.unlink(missing_ok=True)
+
+
+# One background sender per process. track() only marks work pending; the
+# worker keeps flushing until nothing new was queued during its last send.
+_flush_lock = threading.Lock()
+_flush_thread: threading.Thread | None = None
+_flush_pending = False
+
+# How long exit waits for an in-flight send; unsent events stay queued
+_FLUSH_EXIT_WAIT = 0.25
+
+
+def _schedule_flush() -> None:
+    """Start (or re-arm) the background flush."""
+    global _flush_thread, _flush_pending
+    with _flush_lock:
+        _flush_pending = True
+        if _flush_thread is None:
+            _flush_thread = threading.Thread(
+                target=_flush_worker, name="repr-telemetry", daemon=True
+            )
+            _flush_thread.start()
+
+
+def _flush_worker() -> None:
+    """Send queued events until no new ones arrive."""
+    global _flush_thread, _flush_pending
+    while True:
+        with _flush_lock:
+            if not _flush_pending:
+                _flush_thread = None
+                return
+            _flush_pending = False
+        _try_flush_queue()
+
+
+@atexit.register
+def _shutdown_flush() -> None:
+    """Give an in-flight send a moment to finish, then close the client."""
+    thread = _flush_thread
+    if thread is not None:
+        thread.join(_FLUSH_EXIT_WAIT)
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+
+
 def clear_queue() -> int:
     """
     Clear the telemetry queue.
@@ -242,11 +433,14 @@ def clear_queue() -> int:
     Returns:
         Number of events cleared
     """
-    queue = _load_queue()
-    count = len(queue)
-    
-    if TELEMETRY_QUEUE_FILE.exists():
-        TELEMETRY_QUEUE_FILE.unlink()
+    global _queue_generation
+    with _queue_lock:
+        queue = _load_queue()
+        count = len(queue)
+        
+        TELEMETRY_QUEUE_FILE.unlink(missing_ok=True)
+        LEGACY_QUEUE_FILE.unlink(missing_ok=True)
+        _queue_generation += 1
     
     return count
 
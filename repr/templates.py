@@ -8,7 +8,8 @@ Provides different prompts for generating stories based on use case:
 - interview: Behavioral interview preparation
 """
 
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Iterator
 from pydantic import BaseModel, Field
 
 
@@ -39,8 +40,8 @@ class StoryOutput(BaseModel):
     commit_sha: str | None = Field(default=None, description="Linked commit SHA if from git")
 
 
-# Template definitions
-TEMPLATES = {
+# Template definitions (read-only; see TEMPLATES below)
+_TEMPLATES: dict[str, dict[str, Any]] = {
     "resume": {
         "name": "Resume",
         "description": "Technical work log for resumes and portfolios",
@@ -183,6 +184,8 @@ Output valid JSON only.""",
     },
 }
 
+TEMPLATES = MappingProxyType(_TEMPLATES)
+
 # Default template
 DEFAULT_TEMPLATE = "resume"
 
@@ -197,7 +200,10 @@ def get_template(name: str) -> dict[str, Any] | None:
     Returns:
         Template dict or None if not found
     """
-    return TEMPLATES.get(name.lower())
+    template = TEMPLATES.get(name)
+    if template is None and not name.islower():
+        template = TEMPLATES.get(name.lower())
+    return template
 
 
 def list_templates() -> list[dict[str, str]]:
@@ -227,27 +233,30 @@ def format_commits_for_prompt(commits: list[dict[str, Any]]) -> str:
     Returns:
         Formatted string for prompt
     """
-    lines = []
+    return "\n".join(_iter_commit_lines(commits))
+
+
+def _iter_commit_lines(commits: list[dict[str, Any]]) -> Iterator[str]:
+    """Yield the prompt lines for each commit."""
     for c in commits:
-        sha = c.get("sha", c.get("full_sha", ""))[:7]
-        msg = c.get("message", "").split("\n")[0][:80]
-        date = c.get("date", "")[:10]
-        files = c.get("files", [])
-        
-        lines.append(f"- [{sha}] {msg}")
+        get = c.get
+        sha = get("sha", get("full_sha", ""))[:7]
+        msg = get("message", "").split("\n", 1)[0][:80]
+        files = get("files")
+
+        yield f"- [{sha}] {msg}"
         if files:
             # Handle files as either list of dicts or list of strings
-            file_names = [
-                f["path"] if isinstance(f, dict) else f
-                for f in files[:5]
-            ]
-            lines.append(f"  Files: {', '.join(file_names)}")
+            shown = files[:5]
+            if isinstance(shown[0], dict):
+                shown = [f["path"] for f in shown]
+            yield f"  Files: {', '.join(shown)}"
             if len(files) > 5:
-                lines.append(f"  ... and {len(files) - 5} more files")
-        if c.get("insertions") or c.get("deletions"):
-            lines.append(f"  Changes: +{c.get('insertions', 0)}/-{c.get('deletions', 0)}")
-    
-    return "\n".join(lines)
+                yield f"  ... and {len(files) - 5} more files"
+        insertions = get("insertions")
+        deletions = get("deletions")
+        if insertions or deletions:
+            yield f"  Changes: +{insertions or 0}/-{deletions or 0}"
 
 
 def build_generation_prompt(
@@ -290,13 +299,8 @@ def build_generation_prompt(
     return system_prompt, user_prompt
 
 
-def get_template_help() -> str:
-    """
-    Get help text describing all templates.
-    
-    Returns:
-        Formatted help string
-    """
+def _build_template_help() -> str:
+    """Build the help text describing all templates."""
     lines = ["Available templates:\n"]
     
     for key, tmpl in TEMPLATES.items():
@@ -306,3 +310,15 @@ def get_template_help() -> str:
     
     return "\n".join(lines)
 
+
+_TEMPLATE_HELP = _build_template_help()
+
+
+def get_template_help() -> str:
+    """
+    Get help text describing all templates.
+    
+    Returns:
+        Formatted help string
+    """
+    return _TEMPLATE_HELP
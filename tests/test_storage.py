@@ -0,0 +1,437 @@
+"""
+Test local story storage in ~/.repr/stories/.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import repr.storage as storage
+from repr.storage import (
+    delete_story,
+    list_stories,
+    save_story,
+    update_story_metadata,
+)
+
+
+@pytest.fixture
+def temp_stories_dir(monkeypatch):
+    """Use a temporary directory for stories during tests."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repr_home = Path(tmpdir)
+        stories_dir = repr_home / "stories"
+        stories_dir.mkdir()
+        monkeypatch.setattr("repr.storage.REPR_HOME", repr_home)
+        monkeypatch.setattr("repr.storage.STORIES_DIR", stories_dir)
+        monkeypatch.setattr("repr.storage._META_CACHE", {})
+        yield stories_dir
+
+
+def test_list_stories_reuses_cached_metadata(temp_stories_dir, monkeypatch):
+    """Unchanged metadata files are not re-parsed on repeated listings."""
+    save_story("Story", {"repo_name": "test-repo"})
+    list_stories()
+
+    calls = []
+    real_loads = storage._json_loads
+    monkeypatch.setattr(storage, "_json_loads", lambda s: calls.append(s) or real_loads(s))
+
+    stories = list_stories()
+    assert len(stories) == 1
+    assert calls == []
+
+
+def test_list_stories_results_do_not_leak_into_cache(temp_stories_dir):
+    """Mutating a listed story must not affect later listings."""
+    save_story("Story", {"repo_name": "test-repo"})
+
+    first = list_stories()
+    first[0]["repo_name"] = "mutated"
+
+    second = list_stories()
+    assert second[0]["repo_name"] == "test-repo"
+
+
+def test_update_story_metadata_invalidates_cache(temp_stories_dir):
+    """Updates are visible to the next listing."""
+    story_id = save_story("Story", {"repo_name": "test-repo"})
+    list_stories()
+
+    update_story_metadata(story_id, {"needs_review": True})
+
+    stories = list_stories(needs_review=True)
+    assert [s["id"] for s in stories] == [story_id]
+
+
+def test_delete_story_invalidates_cache(temp_stories_dir):
+    """Deleted stories disappear from listings."""
+    story_id = save_story("Story", {"repo_name": "test-repo"})
+    list_stories()
+
+    assert delete_story(story_id)
+    assert list_stories() == []
+    assert str(temp_stories_dir / f"{story_id}.json") not in storage._META_CACHE
+
+
+def test_list_stories_pairs_content_and_metadata(temp_stories_dir):
+    """Content size comes from the paired .md file; orphans are handled."""
+    story_id = save_story("Hello", {"repo_name": "test-repo"})
+    (temp_stories_dir / "ORPHAN.md").write_text("no metadata")
+
+    assert "_content_size" not in list_stories()[0]
+
+    stories = list_stories(include_content_stats=True)
+    assert [s["id"] for s in stories] == [story_id]
+    assert stories[0]["_has_content"] is True
+    assert stories[0]["_content_size"] == len("Hello")
+    assert storage.get_story_count() == 2
+
+
+def test_generate_ulid_format(monkeypatch):
+    """ULIDs are 26 Crockford base32 chars with the timestamp up front."""
+    monkeypatch.setattr(storage.time, "time", lambda: 1_700_000_000.123)
+    ulid = storage.generate_ulid()
+
+    assert len(ulid) == 26
+    assert set(ulid) <= set(storage.ULID_ALPHABET)
+
+    timestamp = 0
+    for ch in ulid[:10]:
+        timestamp = (timestamp << 5) | storage.ULID_ALPHABET.index(ch)
+    assert timestamp == 1_700_000_000_123
+
+
+def test_generate_ulid_monotonic_within_millisecond(monkeypatch):
+    """Monotonic ULIDs in the same millisecond sort in generation order."""
+    monkeypatch.setattr(storage.time, "time", lambda: 1_700_000_000.5)
+    monkeypatch.setattr(storage, "_last_ulid_ms", 0)
+    monkeypatch.setattr(storage, "_last_ulid_rand", 0)
+
+    ids = [storage.generate_ulid(monotonic=True) for _ in range(100)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 100
+    assert len({u[:10] for u in ids}) == 1
+
+
+def test_atomic_write_durable_fsyncs_file_and_directory(tmp_path, monkeypatch):
+    """Durable writes fsync the temp file and the parent directory."""
+    synced = []
+    real_fsync = storage.os.fsync
+    monkeypatch.setattr(storage.os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+
+    target = tmp_path / "story.json"
+    storage._atomic_write(target, "{}")
+    assert synced == []
+
+    storage._atomic_write(target, '{"a": 1}', durable=True)
+    assert target.read_text() == '{"a": 1}'
+    assert len(synced) == (2 if hasattr(storage.os, "O_DIRECTORY") else 1)
+
+
+def test_save_story_writes_pair_with_single_directory_sync(temp_stories_dir, monkeypatch):
+    """A durable save fsyncs both files but the directory only once."""
+    dir_syncs = []
+    monkeypatch.setattr(storage, "_fsync_dir", dir_syncs.append)
+
+    story_id = save_story("Body", {"repo_name": "test-repo"})
+
+    assert (temp_stories_dir / f"{story_id}.md").read_text() == "Body"
+    meta = json.loads((temp_stories_dir / f"{story_id}.json").read_text())
+    assert meta["repo_name"] == "test-repo"
+    assert dir_syncs == [temp_stories_dir]
+    assert not list(temp_stories_dir.glob("*.tmp"))
+
+
+def test_list_stories_since_filter(temp_stories_dir):
+    """Stories created before `since` are filtered out, including Z-suffixed timestamps."""
+    from datetime import datetime, timezone
+
+    save_story("Old", {"created_at": "2025-01-01T10:00:00Z"})
+    new_id = save_story("New", {"created_at": "2026-01-01T10:00:00Z"})
+
+    stories = list_stories(since=datetime(2025, 6, 1, tzinfo=timezone.utc))
+    assert [s["id"] for s in stories] == [new_id]
+
+
+def test_export_stories_json_stream_round_trips(temp_stories_dir):
+    """Streamed export is a valid JSON array matching the stored stories."""
+    import io
+
+    first = save_story("One", {"repo_name": "a"})
+    second = save_story("Two", {"repo_name": "b"})
+
+    buf = io.StringIO()
+    assert storage.export_stories_json_stream(buf) == 2
+
+    exported = {s["id"]: s for s in json.loads(buf.getvalue())}
+    assert exported[first]["content"] == "One"
+    assert exported[second]["metadata"]["repo_name"] == "b"
+    assert json.loads(storage.export_stories_json()) == json.loads(buf.getvalue())
+
+
+def test_export_stories_json_empty(temp_stories_dir):
+    """An empty store exports an empty JSON array."""
+    assert json.loads(storage.export_stories_json()) == []
+
+
+def test_list_stories_parallel_load_matches_serial(temp_stories_dir, monkeypatch):
+    """Large listings go through the thread pool and skip unreadable files."""
+    ids = {save_story(f"Story {i}", {"repo_name": "test-repo"}) for i in range(20)}
+    (temp_stories_dir / "BROKEN.json").write_text("{not json")
+
+    monkeypatch.setattr(storage, "_META_PARALLEL_MIN", 2)
+    storage._META_CACHE.clear()
+    parallel = list_stories()
+    monkeypatch.setattr(storage, "_META_PARALLEL_MIN", 10_000)
+    storage._META_CACHE.clear()
+    serial = list_stories()
+
+    assert {s["id"] for s in parallel} == ids
+    assert parallel == serial
+
+
+def test_load_meta_entries_serves_cache_hits_inline(temp_stories_dir, monkeypatch):
+    """Warm listings don't hand cached entries to the thread pool."""
+    import os
+
+    for i in range(20):
+        save_story(f"Story {i}", {"repo_name": "test-repo"})
+    monkeypatch.setattr(storage, "_META_PARALLEL_MIN", 2)
+    with os.scandir(temp_stories_dir) as it:
+        entries = [e for e in it if e.name.endswith(".json")]
+    storage._load_meta_entries(entries)
+
+    class NoPool:
+        def submit(self, *args, **kwargs):
+            raise AssertionError("cache hit sent to the thread pool")
+
+    monkeypatch.setattr(storage, "_META_POOL", NoPool())
+    loaded = storage._load_meta_entries(entries)
+    assert len(loaded) == 20 and all(m is not None for m in loaded)
+
+
+def test_restore_from_backup_merge_skips_existing(temp_stories_dir, monkeypatch):
+    """Merge restores only new stories and syncs the directory once."""
+    import repr.config
+
+    monkeypatch.setattr(repr.config, "PROFILES_DIR", temp_stories_dir.parent / "profiles")
+    dir_syncs = []
+    monkeypatch.setattr(storage, "_fsync_dir", dir_syncs.append)
+
+    existing = save_story("Original", {"repo_name": "a"}, durable=False)
+    backup = {
+        "stories": [
+            {"id": existing, "content": "Overwritten", "metadata": {}},
+            {"id": "NEW1", "content": "New one", "metadata": {"repo_name": "b"}},
+            {"id": "NEW2", "content": "New two", "metadata": {"repo_name": "b"}},
+        ],
+    }
+
+    result = storage.restore_from_backup(backup, merge=True)
+
+    assert result["stories"] == 2
+    assert (temp_stories_dir / f"{existing}.md").read_text() == "Original"
+    assert (temp_stories_dir / "NEW2.md").read_text() == "New two"
+    assert dir_syncs == [temp_stories_dir]
+
+
+def test_list_stories_combined_filters(temp_stories_dir):
+    """Repo and review filters are applied together."""
+    match = save_story("A", {"repo_name": "a", "needs_review": True})
+    save_story("B", {"repo_name": "a"})
+    save_story("C", {"repo_name": "b", "needs_review": True})
+
+    stories = list_stories(repo_name="a", needs_review=True)
+    assert [s["id"] for s in stories] == [match]
+    assert len(list_stories()) == 3
+
+
+def test_generate_ulid_bytes_round_trip(monkeypatch):
+    """Binary ULIDs encode to the same string form as generate_ulid."""
+    monkeypatch.setattr(storage.time, "time", lambda: 1_700_000_000.25)
+    monkeypatch.setattr(storage.os, "urandom", lambda n: b"\x01" * n)
+
+    raw = storage.generate_ulid_bytes()
+    assert len(raw) == 16
+    assert storage.ulid_bytes_to_str(raw) == storage.generate_ulid()
+
+
+def test_update_story_metadata_keeps_cache_warm(temp_stories_dir, monkeypatch):
+    """After an update, the next listing reuses the written dict."""
+    story_id = save_story("Story", {"repo_name": "test-repo"})
+    storage.mark_story_pushed(story_id)
+
+    calls = []
+    real_loads = storage._json_loads
+    monkeypatch.setattr(storage, "_json_loads", lambda s: calls.append(s) or real_loads(s))
+
+    stories = list_stories()
+    assert stories[0]["pushed_at"]
+    assert calls == []
+
+
+def test_list_stories_index_matches_full_scan(temp_stories_dir):
+    """Indexed listings agree with a full scan, including files written behind its back."""
+    save_story("A", {"repo_name": "a", "created_at": "2026-01-01T10:00:00"})
+    save_story("B", {"repo_name": "b", "needs_review": True, "created_at": "2026-01-02T10:00:00"})
+    (temp_stories_dir / "EXTERNAL.json").write_text(
+        json.dumps({"id": "EXTERNAL", "repo_name": "a", "created_at": "2026-01-03T10:00:00"})
+    )
+
+    for kwargs in ({}, {"repo_name": "a"}, {"needs_review": True}, {"limit": 2}):
+        indexed = list_stories(**kwargs)
+        scanned = storage._list_stories_scan(
+            kwargs.get("repo_name"), None, kwargs.get("needs_review", False),
+            kwargs.get("limit"), False,
+        )
+        assert [s["id"] for s in indexed] == [s["id"] for s in scanned]
+
+    assert list_stories()[0]["id"] == "EXTERNAL"
+
+
+def test_list_stories_falls_back_without_index(temp_stories_dir, monkeypatch):
+    """SQLite errors fall back to scanning the metadata files."""
+    import sqlite3
+
+    story_id = save_story("A", {"repo_name": "a"})
+
+    def broken_sync(*args, **kwargs):
+        raise sqlite3.OperationalError("unable to open database file")
+
+    monkeypatch.setattr(storage.story_index, "sync", broken_sync)
+    assert [s["id"] for s in list_stories()] == [story_id]
+
+
+def test_story_index_skips_rescan_when_directory_unchanged(temp_stories_dir):
+    """A settled stories directory is trusted without rescanning."""
+    import os
+    from repr import story_index
+
+    save_story("A", {"repo_name": "a"})
+    old = 1_600_000_000_000_000_000
+    os.utime(temp_stories_dir, ns=(old, old))
+    with story_index.connect(temp_stories_dir) as conn:
+        story_index.sync(conn, temp_stories_dir, storage._load_meta_entries)
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError("directory was rescanned")
+
+    with patch.object(story_index.os, "scandir", no_scan):
+        assert len(list_stories()) == 1
+
+
+def test_list_stories_sees_in_place_edits(temp_stories_dir):
+    """Rows read by a listing are re-checked against files edited in place."""
+    import os
+
+    story_id = save_story("A", {"repo_name": "a"})
+    meta_path = temp_stories_dir / f"{story_id}.json"
+    old = 1_600_000_000_000_000_000
+    os.utime(meta_path, ns=(old, old))
+    os.utime(temp_stories_dir, ns=(old, old))
+    assert [s["id"] for s in list_stories(repo_name="a")] == [story_id]
+
+    metadata = json.loads(meta_path.read_text())
+    metadata["repo_name"] = "b"
+    with open(meta_path, "r+") as f:
+        f.write(json.dumps(metadata))
+        f.truncate()
+    os.utime(meta_path, ns=(old + 1_000_000_000, old + 1_000_000_000))
+    os.utime(temp_stories_dir, ns=(old, old))
+
+    assert list_stories(repo_name="a") == []
+    assert [s["id"] for s in list_stories(repo_name="b")] == [story_id]
+
+
+def test_rebuild_story_index_picks_up_hand_edits(temp_stories_dir):
+    """A forced rebuild finds stories the index hasn't seen change."""
+    import os
+
+    story_id = save_story("A", {"repo_name": "a"})
+    meta_path = temp_stories_dir / f"{story_id}.json"
+    old = 1_600_000_000_000_000_000
+    os.utime(temp_stories_dir, ns=(old, old))
+    list_stories()
+
+    meta_path.write_text(json.dumps({**json.loads(meta_path.read_text()), "repo_name": "b"}))
+    os.utime(temp_stories_dir, ns=(old, old))
+
+    storage.rebuild_story_index()
+    assert [s["id"] for s in list_stories(repo_name="b")] == [story_id]
+
+
+def test_restore_and_import_update_index(temp_stories_dir, monkeypatch):
+    """Bulk writes index their stories without waiting for a rescan."""
+    from repr import story_index
+
+    monkeypatch.setattr(storage, "_fsync_dir", lambda path: None)
+    storage.restore_from_backup(
+        {"stories": [{"id": "R1", "content": "x", "metadata": {"repo_name": "r"}}]}, merge=True,
+    )
+    storage.import_stories_json(json.dumps(
+        [{"id": "I1", "content": "y", "metadata": {"repo_name": "r"}}]
+    ))
+
+    with story_index.connect(temp_stories_dir) as conn:
+        assert {row[0] for row in story_index.query(conn, repo_name="r")} == {"R1", "I1"}
+
+
+def test_atomic_write_falls_back_when_temp_name_taken(tmp_path, monkeypatch):
+    """A leftover temp file with the next name doesn't break writes."""
+    import itertools
+    import os
+
+    monkeypatch.setattr(storage, "_TMP_COUNTER", itertools.count())
+    (tmp_path / f".repr-{os.getpid()}-0.tmp").write_text("stale")
+
+    target = tmp_path / "story.md"
+    storage._atomic_write(target, "fresh")
+    assert target.read_text() == "fresh"
+
+
+def test_load_story_content_only(temp_stories_dir):
+    """Content-only loads skip metadata and return None for unknown IDs."""
+    story_id = save_story("# Title\n\nBody", {"repo_name": "a"})
+
+    assert storage.load_story_content(story_id) == "# Title\n\nBody"
+    assert storage.load_story_content("MISSING") is None
+    assert storage.load_story(story_id)[1]["repo_name"] == "a"
+    assert storage.load_story("MISSING") is None
+
+
+def test_metadata_written_compact_and_formattable(temp_stories_dir):
+    """Metadata is stored compact; format_story_files toggles indentation."""
+    story_id = save_story("Body", {"repo_name": "a"})
+    meta_path = temp_stories_dir / f"{story_id}.json"
+    assert "\n" not in meta_path.read_text()
+
+    assert storage.format_story_files(pretty=True) == 1
+    assert '\n  "repo_name": "a"' in meta_path.read_text()
+    assert list_stories()[0]["repo_name"] == "a"
+
+    storage.format_story_files(pretty=False)
+    assert "\n" not in meta_path.read_text()
+
+
+def test_import_stories_json_pipelined(temp_stories_dir):
+    """Imports write every story, honoring merge and duplicate IDs."""
+    existing = save_story("Original", {"repo_name": "a"})
+    payload = json.dumps([
+        {"id": existing, "content": "Replaced?", "metadata": {}},
+        {"id": "DUP", "content": "First", "metadata": {"repo_name": "b"}},
+        {"id": "DUP", "content": "Second", "metadata": {"repo_name": "b"}},
+        {"content": "No id", "metadata": {"repo_name": "c"}},
+    ])
+
+    assert storage.import_stories_json(payload, merge=True) == 2
+    assert (temp_stories_dir / f"{existing}.md").read_text() == "Original"
+    assert (temp_stories_dir / "DUP.md").read_text() == "First"
+    repos = sorted(s.get("repo_name") for s in list_stories())
+    assert repos == ["a", "b", "c"]
+
+    assert storage.import_stories_json(payload, merge=False) == 4
+    assert len(list_stories()) == 7
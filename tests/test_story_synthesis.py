@@ -0,0 +1,1272 @@
+"""
+Tests for story synthesis (repr/story_synthesis.py).
+
+LLM calls are replaced with fakes; these cover batching, indexing and the
+pure helpers around the synthesis engine.
+"""
+
+import asyncio
+import json
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from repr import story_synthesis
+from repr.models import CommitData, ContentIndex, Story
+from repr.story_synthesis import BatchAnalysis, StorySynthesizer, synthesize_stories
+
+
+def _commit(n: int, files: list[str] | None = None) -> CommitData:
+    return CommitData(
+        sha=f"{n:04x}" * 10,
+        message=f"Commit {n}",
+        author="dev",
+        timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        files=files or [f"src/file{n}.py"],
+    )
+
+
+def _story(story_id: str, files: list[str]) -> Story:
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return Story(
+        id=story_id,
+        created_at=now,
+        updated_at=now,
+        title=f"Story {story_id}",
+        files=files,
+        started_at=now,
+    )
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Route synthesize_batch to a canned OpenAI-style JSON response."""
+    responses: list[dict] = []
+    requests: list[dict] = []
+
+    def create(**kwargs):
+        requests.append(kwargs)
+        content = json.dumps(responses.pop(0))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    def get_client(self):
+        self._client = client
+        self._client_type = "openai"
+        return client
+
+    monkeypatch.setattr(StorySynthesizer, "_get_client", get_client)
+    monkeypatch.setattr(story_synthesis, "get_or_generate_username", lambda: "dev")
+    monkeypatch.setattr(
+        story_synthesis, "extract_recall_data", lambda shas, max_snippets=3: ([], 0, 0, [])
+    )
+    monkeypatch.setattr(story_synthesis, "prefetch_recall_data", lambda shas: None)
+    return SimpleNamespace(responses=responses, requests=requests, client=client)
+
+
+class TestSynthesizeBatch:
+    """Story construction from an LLM batch analysis."""
+
+    def test_resolves_abbreviated_shas(self, fake_llm):
+        commits = [_commit(0x1234), _commit(0x5678)]
+        fake_llm.responses.append({"stories": [
+            {"commit_shas": [commits[1].sha[:8], commits[0].sha], "title": "Both"},
+            {"commit_shas": ["deadbeef"], "title": "Unknown"},
+        ]})
+
+        stories, index = asyncio.run(
+            StorySynthesizer(model="gpt-4o-mini").synthesize_batch(commits)
+        )
+
+        assert len(stories) == 1
+        assert stories[0].commit_shas == [commits[1].sha, commits[0].sha]
+        assert index.story_count == 1
+
+    def test_prefetches_all_stories_commits_once(self, fake_llm, monkeypatch):
+        commits = [_commit(n) for n in range(1, 4)]
+        prefetched = []
+        monkeypatch.setattr(story_synthesis, "prefetch_recall_data", prefetched.append)
+        fake_llm.responses.append({"stories": [
+            {"commit_shas": [commits[0].sha[:8], commits[1].sha], "title": "One"},
+            {"commit_shas": [commits[1].sha, "deadbeef"], "title": "Two"},
+        ]})
+
+        asyncio.run(StorySynthesizer(model="gpt-4o-mini").synthesize_batch(commits))
+
+        assert prefetched == [[commits[0].sha, commits[1].sha]]
+
+    def test_snippets_skipped_without_code_files(self, fake_llm, monkeypatch):
+        commits = [_commit(1, files=["docs/guide.txt", "LICENSE"]), _commit(2, files=["src/app.py"])]
+        asked = []
+        monkeypatch.setattr(
+            story_synthesis,
+            "extract_recall_data",
+            lambda shas, max_snippets=3: asked.append(max_snippets) or ([], 0, 0, []),
+        )
+        fake_llm.responses.append({"stories": [
+            {"commit_shas": [c.sha], "title": c.message} for c in commits
+        ]})
+
+        asyncio.run(StorySynthesizer(model="gpt-4o-mini").synthesize_batch(commits))
+
+        assert sorted(asked) == [0, 3]
+
+    def test_recall_extracted_in_parallel_in_order(self, fake_llm, monkeypatch):
+        commits = [_commit(n) for n in range(1, 4)]
+        barrier = threading.Barrier(3, timeout=5)
+
+        def recall(shas, max_snippets=3):
+            barrier.wait()  # only passes if all three stories extract at once
+            return [], len(shas), 0, []
+
+        monkeypatch.setattr(story_synthesis, "extract_recall_data", recall)
+        fake_llm.responses.append({"stories": [
+            {"commit_shas": [c.sha], "title": c.message} for c in commits
+        ]})
+
+        stories, _ = asyncio.run(
+            StorySynthesizer(model="gpt-4o-mini").synthesize_batch(commits)
+        )
+
+        assert [s.title for s in stories] == ["Commit 1", "Commit 2", "Commit 3"]
+
+
+class TestSynthesizeStoriesBatching:
+    """Batches run concurrently but merge in commit order."""
+
+    def test_batches_run_concurrently_in_order(self, monkeypatch):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_batch(self, commits, sessions=None):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            # Earlier batches finish last
+            await asyncio.sleep(0.01 * (10 - int(commits[0].sha[:4], 16)))
+            in_flight -= 1
+            stories = [_story(c.sha, c.files) for c in commits]
+            return stories, self._build_index(stories)
+
+        monkeypatch.setattr(StorySynthesizer, "synthesize_batch", fake_batch)
+
+        progress = []
+        commits = [_commit(i) for i in range(6)]
+        stories, index = asyncio.run(synthesize_stories(
+            commits,
+            batch_size=1,
+            concurrency=3,
+            progress_callback=lambda done, total: progress.append((done, total)),
+        ))
+
+        assert [s.id for s in stories] == [c.sha for c in commits]
+        assert max_in_flight == 3
+        assert progress == [(i, 6) for i in range(1, 7)]
+        assert index.story_count == 6
+        assert index.files_to_stories["src/file0.py"] == [commits[0].sha]
+
+
+    def test_stream_yields_batches_as_they_finish(self, monkeypatch):
+        async def fake_batch(self, commits, sessions=None):
+            # Later batches finish first
+            await asyncio.sleep(0.01 * (5 - int(commits[0].sha[:4], 16)))
+            stories = [_story(c.sha, c.files) for c in commits]
+            return stories, self._build_index(stories)
+
+        monkeypatch.setattr(StorySynthesizer, "synthesize_batch", fake_batch)
+        commits = [_commit(i) for i in range(3)]
+
+        async def collect():
+            return [
+                [s.id for s in stories]
+                async for stories, _ in story_synthesis.synthesize_stories_stream(
+                    commits, batch_size=1,
+                )
+            ]
+
+        assert asyncio.run(collect()) == [[c.sha] for c in reversed(commits)]
+
+
+class TestParseLLMJson:
+    """LLM responses parse the same with and without orjson."""
+
+    PAYLOAD = '{"stories": [{"commit_shas": ["abc1234"], "title": "Add caché"}]}'
+
+    def test_orjson_and_fallback_agree(self, monkeypatch):
+        fast = story_synthesis._parse_llm_json(BatchAnalysis, self.PAYLOAD)
+        monkeypatch.setattr(story_synthesis, "orjson", None)
+        slow = story_synthesis._parse_llm_json(BatchAnalysis, self.PAYLOAD)
+
+        assert fast == slow
+        assert fast.stories[0].title == "Add caché"
+
+    def test_invalid_json_raises(self):
+        with pytest.raises(ValueError):
+            story_synthesis._parse_llm_json(BatchAnalysis, '{"stories": [')
+
+    @pytest.mark.parametrize("content", [
+        PAYLOAD,
+        f"```json\n{PAYLOAD}\n```",
+        f"  ```\n{PAYLOAD}```\n",
+        f"```json\n{PAYLOAD}",
+    ])
+    def test_strips_code_fences(self, content):
+        assert story_synthesis._clean_llm_json(content) == self.PAYLOAD
+
+
+class TestSharedClient:
+    """LLM clients are reused across synthesizers."""
+
+    def test_same_credentials_share_client(self, monkeypatch):
+        monkeypatch.setattr(story_synthesis, "_CLIENT_CACHE", {})
+
+        first = StorySynthesizer(api_key="sk-test", base_url="http://localhost:1/v1")
+        second = StorySynthesizer(api_key="sk-test", base_url="http://localhost:1/v1")
+        other = StorySynthesizer(api_key="sk-other", base_url="http://localhost:1/v1")
+
+        assert first._get_client() is second._get_client()
+        assert other._get_client() is not first._get_client()
+        assert first._get_client_type() == "openai"
+
+    def test_clients_retry_rate_limits(self, monkeypatch):
+        monkeypatch.setattr(story_synthesis, "_CLIENT_CACHE", {})
+
+        for client_type in ("openai", "anthropic"):
+            client = story_synthesis._get_shared_client(client_type, "sk-test", None)
+            assert client.max_retries == story_synthesis._MAX_RETRIES > 2
+
+    def test_clients_keep_connections_alive(self, monkeypatch):
+        monkeypatch.setattr(story_synthesis, "_CLIENT_CACHE", {})
+
+        for client_type in ("openai", "anthropic"):
+            client = story_synthesis._get_shared_client(client_type, "sk-test", None)
+            pool = client._client._transport._pool
+            assert pool._keepalive_expiry == story_synthesis._HTTP_LIMITS.keepalive_expiry
+
+    def test_exit_hook_closes_loops_and_clients(self, monkeypatch):
+        monkeypatch.setattr(story_synthesis, "_CLIENT_CACHE", {})
+        monkeypatch.setattr(story_synthesis, "_all_sync_loops", [])
+        monkeypatch.setattr(story_synthesis, "_sync_loops", threading.local())
+
+        client = story_synthesis._get_shared_client("openai", "sk-test", None)
+        loop = story_synthesis._get_sync_loop()
+
+        story_synthesis._close_sync_resources()
+
+        assert loop.is_closed()
+        assert client.is_closed()
+        assert story_synthesis._CLIENT_CACHE == {}
+
+
+class TestRequestKwargs:
+    """Provider-specific request shapes."""
+
+    def test_anthropic_system_prompt_marked_cacheable(self):
+        synthesizer = StorySynthesizer(model="anthropic/claude-x")
+        synthesizer._client_type = "anthropic"
+
+        kwargs = synthesizer._request_kwargs("SYSTEM", "user")
+
+        assert kwargs["model"] == "claude-x"
+        assert kwargs["system"] == [
+            {"type": "text", "text": "SYSTEM", "cache_control": {"type": "ephemeral"}}
+        ]
+
+    def test_api_model_drops_provider_prefix(self):
+        synthesizer = StorySynthesizer(model="openrouter/anthropic/claude-x")
+        assert synthesizer.api_model == "claude-x"
+
+        synthesizer.model = "gpt-4o-mini"
+        assert synthesizer.api_model == "gpt-4o-mini"
+
+    def test_openai_system_prompt_leads_messages(self):
+        kwargs = StorySynthesizer(model="gpt-4o-mini")._request_kwargs("SYSTEM", "user")
+
+        assert kwargs["messages"][0] == {"role": "system", "content": "SYSTEM"}
+
+
+class TestExtractKeywords:
+    """Keyword extraction for the content index."""
+
+    def test_filters_stopwords_and_dedupes_in_order(self):
+        keywords = StorySynthesizer()._extract_keywords(
+            "Fix the cache: cache misses on the API for large repos"
+        )
+        assert keywords == ["fix", "cache", "misses", "api", "large", "repos"]
+
+    def test_ignores_words_glued_to_digits(self):
+        assert StorySynthesizer()._extract_keywords("utf8 oauth2 migration") == ["migration"]
+
+    def test_drops_words_under_three_letters(self):
+        assert StorySynthesizer()._extract_keywords("Go to DB by ID via gRPC") == ["via", "grpc"]
+
+
+class TestDetectTechStack:
+    """File-based technology detection."""
+
+    def test_extensions_and_filenames(self):
+        tech = StorySynthesizer()._detect_tech_stack([
+            "api/server.py",
+            "web/App.tsx",
+            "web/util.ts",
+            "deploy/docker-compose.yml",
+            "deploy/Dockerfile.prod",
+            "README.md",
+        ])
+        assert tech == ["Docker", "Python", "React", "TypeScript"]
+
+    def test_several_filename_tokens_in_one_path(self):
+        tech = StorySynthesizer()._detect_tech_stack(["rust/Cargo.toml", "go.mod/package.json.bak"])
+        assert tech == ["Go", "Node.js", "Rust"]
+
+    def test_extension_must_end_the_path(self):
+        synthesizer = StorySynthesizer()
+        assert synthesizer._detect_tech_stack(["types/index.d.ts", "web/App.JSX"]) == ["TypeScript"]
+        assert synthesizer._detect_tech_stack(["notes.python", "schema.graphql.bak"]) == []
+
+    def test_returns_fresh_list(self):
+        synthesizer = StorySynthesizer()
+        first = synthesizer._detect_tech_stack(["main.go"])
+        first.append("mutated")
+        assert synthesizer._detect_tech_stack(["main.go"]) == ["Go"]
+
+
+class TestSynthesizeGroups:
+    """Several batches packed into one LLM request."""
+
+    def test_one_request_for_all_groups(self, fake_llm):
+        commits = [_commit(1), _commit(2), _commit(3)]
+        fake_llm.responses.append({"groups": [
+            {"stories": [{"commit_shas": [commits[0].sha[:8], commits[1].sha[:8]], "title": "A"}]},
+            {"stories": [{"commit_shas": [commits[2].sha[:8]], "title": "B"}]},
+        ]})
+
+        stories, index = asyncio.run(synthesize_stories(
+            commits, batch_size=2, groups_per_request=2,
+        ))
+
+        assert len(fake_llm.requests) == 1
+        assert "<<GROUP 2>>" in fake_llm.requests[0]["messages"][1]["content"]
+        assert [s.title for s in stories] == ["A", "B"]
+        assert stories[1].commit_shas == [commits[2].sha]
+        assert index.story_count == 2
+
+    def test_group_count_mismatch_retries_individually(self, fake_llm):
+        groups = [[_commit(1)], [_commit(2)]]
+        fake_llm.responses.extend([
+            {"groups": [{"stories": []}]},
+            {"stories": [{"commit_shas": [groups[0][0].sha], "title": "A"}]},
+            {"stories": [{"commit_shas": [groups[1][0].sha], "title": "B"}]},
+        ])
+
+        results = asyncio.run(StorySynthesizer(model="gpt-4o-mini").synthesize_groups(groups))
+
+        assert len(fake_llm.requests) == 3
+        assert [[s.title for s in stories] for stories, _ in results] == [["A"], ["B"]]
+
+
+class TestBatchAPI:
+    """Offline synthesis through the OpenAI Batch API."""
+
+    def test_uploads_jsonl_and_parses_results(self, fake_llm):
+        commits = [_commit(1), _commit(2)]
+        uploaded = {}
+        statuses = iter(["in_progress", "completed"])
+
+        def files_create(file, purpose):
+            uploaded["purpose"] = purpose
+            uploaded["lines"] = [json.loads(l) for l in file[1].getvalue().splitlines()]
+            return SimpleNamespace(id="file-in")
+
+        def batch(status):
+            return SimpleNamespace(id="batch-1", status=status, output_file_id="file-out")
+
+        def output_line(i, title):
+            body = {"choices": [{"message": {"content": json.dumps(
+                {"stories": [{"commit_shas": [commits[i].sha], "title": title}]}
+            )}}]}
+            return json.dumps({"custom_id": f"batch-{i}", "response": {"status_code": 200, "body": body}})
+
+        synthesizer = StorySynthesizer(model="gpt-4o-mini")
+        client = synthesizer._get_client()
+        client.files = SimpleNamespace(
+            create=files_create,
+            content=lambda file_id: SimpleNamespace(text=output_line(0, "Offline A")),
+        )
+        client.batches = SimpleNamespace(
+            create=lambda **kwargs: batch("validating"),
+            retrieve=lambda batch_id: batch(next(statuses)),
+        )
+        # batch-1 is missing from the output, so it goes through the live path
+        fake_llm.responses.append({"stories": [{"commit_shas": [commits[1].sha], "title": "Live B"}]})
+
+        results = asyncio.run(synthesizer.synthesize_batches_offline(
+            [[commits[0]], [commits[1]]], poll_interval=0,
+        ))
+
+        assert uploaded["purpose"] == "batch"
+        assert [l["custom_id"] for l in uploaded["lines"]] == ["batch-0", "batch-1"]
+        assert uploaded["lines"][0]["url"] == "/v1/chat/completions"
+        assert [[s.title for s in stories] for stories, _ in results] == [["Offline A"], ["Live B"]]
+        assert len(fake_llm.requests) == 1
+
+    def test_live_fallback_runs_concurrently(self, fake_llm, monkeypatch):
+        import threading
+        import time
+
+        commits = [_commit(i) for i in range(1, 6)]
+        lock = threading.Lock()
+        in_flight = [0, 0]  # current, peak
+
+        def create(**kwargs):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            time.sleep(0.05)
+            with lock:
+                in_flight[0] -= 1
+            prompt = kwargs["messages"][-1]["content"]
+            sha = next(c.sha for c in commits if c.sha[:7] in prompt)
+            content = json.dumps({"stories": [{"commit_shas": [sha], "title": sha[:7]}]})
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+        def unavailable(**kwargs):
+            raise RuntimeError("no batch endpoint")
+
+        synthesizer = StorySynthesizer(model="gpt-4o-mini")
+        client = synthesizer._get_client()
+        monkeypatch.setattr(client.chat.completions, "create", create)
+        client.files = SimpleNamespace(create=unavailable)
+
+        results = asyncio.run(synthesizer.synthesize_batches_offline(
+            [[c] for c in commits], concurrency=2,
+        ))
+
+        assert [[s.title for s in stories] for stories, _ in results] == [[c.sha[:7]] for c in commits]
+        assert in_flight[1] == 2
+
+
+class TestTokenBucket:
+    """Proactive rate limiting for LLM requests."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        now = [1000.0]
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        monkeypatch.setattr(story_synthesis.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(story_synthesis.asyncio, "sleep", fake_sleep)
+        return sleeps
+
+    def test_paces_requests_once_burst_is_spent(self, clock):
+        async def run():
+            bucket = story_synthesis.TokenBucket(rpm=2)
+            for _ in range(3):
+                await bucket.acquire()
+
+        asyncio.run(run())
+        assert clock == [pytest.approx(30.0)]
+
+    def test_waits_for_token_budget(self, clock):
+        async def run():
+            bucket = story_synthesis.TokenBucket(rpm=1000, tpm=6000)
+            await bucket.acquire(6000)
+            await bucket.acquire(3000)
+
+        asyncio.run(run())
+        assert sum(clock) == pytest.approx(30.0)
+
+    def test_synthesizer_acquires_before_request(self, fake_llm):
+        acquired = []
+
+        class RecordingBucket:
+            async def acquire(self, tokens=0):
+                acquired.append((tokens, len(fake_llm.requests)))
+
+        fake_llm.responses.append({"stories": []})
+        synthesizer = StorySynthesizer(model="gpt-4o-mini", rate_limiter=RecordingBucket())
+        asyncio.run(synthesizer.synthesize_batch([_commit(1)]))
+
+        assert len(acquired) == 1
+        tokens, requests_before = acquired[0]
+        assert requests_before == 0
+        assert tokens > story_synthesis._EXPECTED_COMPLETION_TOKENS
+
+
+class TestStreamingSynthesis:
+    """Stories are built while the response is still streaming."""
+
+    def test_builds_first_story_before_stream_ends(self, fake_llm, monkeypatch):
+        import threading
+
+        commits = [_commit(1), _commit(2)]
+        content = json.dumps({"stories": [
+            {"commit_shas": [commits[0].sha[:8]], "title": "First"},
+            {"commit_shas": [commits[1].sha[:8]], "title": "Second"},
+        ]})
+        split = content.index('{"commit_shas"', content.index("First"))
+        first_built = threading.Event()
+        overlapped = []
+
+        def chunk(text):
+            delta = SimpleNamespace(content=text)
+            return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+        def create(stream=False, **kwargs):
+            assert stream
+            yield chunk(content[:split])
+            yield chunk(content[split:split + 5])
+            overlapped.append(first_built.wait(timeout=5))
+            yield chunk(content[split + 5:])
+
+        original_build = StorySynthesizer._build_story
+
+        def build_story(self, boundary, *args):
+            story = original_build(self, boundary, *args)
+            if boundary.title == "First":
+                first_built.set()
+            return story
+
+        monkeypatch.setattr(story_synthesis, "_STREAM_PARSE_EVERY", 1)
+        monkeypatch.setattr(StorySynthesizer, "_build_story", build_story)
+        synthesizer = StorySynthesizer(model="gpt-4o-mini", stream=True)
+        synthesizer._get_client().chat.completions.create = create
+
+        stories, index = asyncio.run(synthesizer.synthesize_batch(commits))
+
+        assert overlapped == [True]
+        assert [s.title for s in stories] == ["First", "Second"]
+        assert stories[1].commit_shas == [commits[1].sha]
+
+    def test_completed_boundaries_skips_open_story(self):
+        partial = '```json\n{"stories": [{"commit_shas": ["a"], "title": "Done"}, {"commit_shas": ["b"], "ti'
+        boundaries = story_synthesis._completed_boundaries(partial, 0)
+        assert [b.title for b in boundaries] == ["Done"]
+        assert story_synthesis._completed_boundaries(partial, 1) == []
+
+
+class TestBuildIndex:
+    """Content index built from a batch of stories."""
+
+    def test_maps_files_keywords_and_weeks(self):
+        stories = [
+            _story("s1", ["api/auth.py", "api/db.py"]),
+            _story("s2", ["api/auth.py"]),
+        ]
+        index = StorySynthesizer()._build_index(stories)
+
+        assert index.files_to_stories == {"api/auth.py": ["s1", "s2"], "api/db.py": ["s1"]}
+        assert index.keywords_to_stories["story"] == ["s1", "s2"]
+        assert index.by_week == {"2025-W00": ["s1", "s2"]}
+        assert type(index.files_to_stories) is dict
+        assert [d.story_id for d in index.story_digests] == ["s1", "s2"]
+        assert index.story_digests[0].tech_stack == ["Python"]
+        assert index.story_count == 2
+
+
+class TestStoryConstruction:
+    """Per-story fields derived from commits, sessions and LLM boundaries."""
+
+    def test_built_story_matches_validated_model(self, fake_llm):
+        commits = [_commit(1, files=["api/auth.py", "Dockerfile"])]
+        fake_llm.responses.append({"stories": [
+            {"commit_shas": [commits[0].sha], "title": "Add auth", "problem": "No login"},
+        ]})
+
+        stories, index = asyncio.run(
+            StorySynthesizer(model="gpt-4o-mini").synthesize_batch(commits)
+        )
+
+        story = stories[0]
+        assert Story.model_validate(story.model_dump()) == story
+        assert story.visibility == "private"
+        assert story.technologies == ["Docker", "Python"]
+        digest = index.story_digests[0]
+        assert type(digest).model_validate(digest.model_dump()) == digest
+
+    def test_tech_stack_scanned_once_per_story(self, fake_llm):
+        commits = [_commit(7, files=["svc/main.go", "svc/go.mod"])]
+        fake_llm.responses.append({"stories": [{"commit_shas": [commits[0].sha], "title": "Go svc"}]})
+        story_synthesis._detect_tech_stack_cached.cache_clear()
+
+        stories, index = asyncio.run(
+            StorySynthesizer(model="gpt-4o-mini").synthesize_batch(commits)
+        )
+
+        info = story_synthesis._detect_tech_stack_cached.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+        assert index.story_digests[0].tech_stack == stories[0].technologies == ["Go"]
+
+    def test_files_capped_at_50_in_sorted_order(self, fake_llm):
+        files = [f"src/m{i:03d}.py" for i in range(120, 0, -1)]
+        commits = [_commit(1, files=files[:60]), _commit(2, files=files[50:])]
+        fake_llm.responses.append({"stories": [
+            {"commit_shas": [c.sha for c in commits], "title": "Big refactor"},
+        ]})
+
+        stories, _ = asyncio.run(
+            StorySynthesizer(model="gpt-4o-mini").synthesize_batch(commits)
+        )
+
+        assert stories[0].files == sorted(files)[:50]
+
+    def test_links_sessions_by_commit_overlap(self, fake_llm):
+        from repr.models import SessionContext
+
+        commits = [_commit(1), _commit(2)]
+        sessions = [
+            SessionContext(
+                session_id=sid,
+                timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc),
+                problem="p", approach="a", outcome="o",
+                linked_commits=linked,
+            )
+            for sid, linked in [
+                ("s-both", [commits[0].sha, commits[1].sha]),
+                ("s-second", [commits[1].sha]),
+                ("s-none", ["f" * 40]),
+            ]
+        ]
+        fake_llm.responses.append({"stories": [
+            {"commit_shas": [commits[0].sha], "title": "One"},
+            {"commit_shas": [commits[1].sha], "title": "Two"},
+        ]})
+
+        stories, _ = asyncio.run(
+            StorySynthesizer(model="gpt-4o-mini").synthesize_batch(commits, sessions)
+        )
+
+        assert [s.session_ids for s in stories] == [["s-both"], ["s-both", "s-second"]]
+
+    @pytest.mark.parametrize("day, key", [
+        (datetime(2025, 1, 5, 23, tzinfo=timezone.utc), "2025-W00"),
+        (datetime(2025, 1, 6, tzinfo=timezone.utc), "2025-W01"),
+        (datetime(2024, 12, 30, tzinfo=timezone.utc), "2024-W53"),
+    ])
+    def test_week_keys_use_monday_weeks(self, day, key):
+        story = _story("s1", ["a.py"])
+        story.started_at = day
+        index = StorySynthesizer()._build_index([story])
+        assert index.by_week == {key: ["s1"]} == {day.strftime("%Y-W%W"): ["s1"]}
+
+    def test_merge_content_indexes_keeps_batch_order(self):
+        synthesizer = StorySynthesizer()
+        first = synthesizer._build_index([_story("s1", ["a.py"]), _story("s2", ["b.py"])])
+        second = synthesizer._build_index([_story("s3", ["a.py"])])
+
+        merged = story_synthesis._merge_content_indexes([first, second])
+
+        assert merged.files_to_stories == {"a.py": ["s1", "s3"], "b.py": ["s2"]}
+        assert merged.by_week == {"2025-W00": ["s1", "s2", "s3"]}
+        assert [d.story_id for d in merged.story_digests] == ["s1", "s2", "s3"]
+        assert merged.story_count == 3
+        assert ContentIndex.model_validate(merged.model_dump()) == merged
+
+
+class TestResolveCredentials:
+    """Config/keychain credential lookups are cached per config version."""
+
+    def test_cached_until_config_changes(self, monkeypatch):
+        from repr import config
+
+        calls = []
+
+        def get_byok_config(provider):
+            calls.append(provider)
+            if provider == "groq":
+                return {"api_key": "gsk-test", "model": "llama-3.3", "base_url": "https://groq.test/v1"}
+            return None
+
+        monkeypatch.setattr(config, "get_byok_config", get_byok_config)
+        monkeypatch.setattr(story_synthesis, "_CLIENT_CACHE", {})
+        stamp = [1]
+        monkeypatch.setattr(story_synthesis, "_config_stamp", lambda: stamp[0])
+        story_synthesis._resolve_credentials.cache_clear()
+
+        first = StorySynthesizer(model="llama-3.3")
+        first._get_client()
+        lookups = len(calls)
+        StorySynthesizer(model="llama-3.3")._get_client()
+        assert len(calls) == lookups
+
+        stamp[0] = 2
+        StorySynthesizer(model="llama-3.3")._get_client()
+        assert len(calls) == 2 * lookups
+
+        assert story_synthesis._resolve_credentials("llama-3.3", 2) == (
+            "gsk-test", "https://groq.test/v1", "openai",
+        )
+        assert str(first._get_client().base_url).startswith("https://groq.test/v1")
+
+
+    def test_each_byok_provider_read_once(self, monkeypatch):
+        from repr import config
+
+        calls = []
+
+        def get_byok_config(provider):
+            calls.append(provider)
+            if provider == "openai":
+                return {"api_key": "sk-test"}
+            return None
+
+        monkeypatch.setattr(config, "get_byok_config", get_byok_config)
+        monkeypatch.setattr(config, "get_llm_config", lambda: {})
+        monkeypatch.setattr(config, "get_litellm_config", lambda: (None, None))
+        story_synthesis._resolve_credentials.cache_clear()
+
+        assert story_synthesis._resolve_credentials("anthropic/claude-x", None)[0] == "sk-test"
+        assert sorted(calls) == sorted(set(calls))
+
+
+class TestFormatCommitsForPrompt:
+    """Commit text sent to the LLM."""
+
+    def test_block_per_commit(self):
+        first = _commit(1, files=["a.py", "b.py"])
+        second = _commit(2)
+        second.insertions, second.deletions = 5, 2
+
+        text = StorySynthesizer()._format_commits_for_prompt([first, second])
+
+        assert text == (
+            f"SHA: {first.sha[:8]}\nMessage: Commit 1\nFiles: a.py, b.py\n"
+            "\n"
+            f"SHA: {second.sha[:8]}\nMessage: Commit 2\nFiles: src/file2.py\nChanges: +5/-2\n"
+        )
+
+
+class TestStoryId:
+    """Story IDs stay stable across releases."""
+
+    @pytest.mark.parametrize("shas,title", [
+        (["abc", "def"], "Add auth"),
+        ([], ""),
+        (["a" * 40], "Fix caché — ünïcode"),
+    ])
+    def test_matches_uuid5(self, shas, title):
+        import uuid
+
+        expected = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"repr-story-{'-'.join(shas)}-{title}"))
+        assert story_synthesis._story_id(shas, title) == expected
+
+
+class TestSyncWrappers:
+    """Sync wrappers reuse one event loop per thread."""
+
+    def test_reuses_loop_across_calls(self):
+        loops = []
+
+        async def current_loop():
+            loops.append(asyncio.get_running_loop())
+
+        story_synthesis._run_sync(current_loop())
+        story_synthesis._run_sync(current_loop())
+
+        assert loops[0] is loops[1]
+        assert not loops[0].is_closed()
+
+    def test_synthesize_stories_sync(self, fake_llm):
+        commits = [_commit(1)]
+        fake_llm.responses.extend([
+            {"stories": [{"commit_shas": [commits[0].sha], "title": "First run"}]},
+            {"stories": [{"commit_shas": [commits[0].sha], "title": "Second run"}]},
+        ])
+
+        first, _ = story_synthesis.synthesize_stories_sync(commits)
+        second, _ = story_synthesis.synthesize_stories_sync(commits)
+
+        assert [s.title for s in first + second] == ["First run", "Second run"]
+
+
+@pytest.fixture(autouse=True)
+def commit_cache_dir(tmp_path, monkeypatch):
+    """Keep the on-disk commit cache out of the real ~/.repr."""
+    from repr import config
+
+    cache_dir = tmp_path / "commit-cache"
+    monkeypatch.setattr(config, "COMMIT_CACHE_DIR", cache_dir)
+    return cache_dir
+
+
+@pytest.fixture(autouse=True)
+def feed_cache_file(tmp_path, monkeypatch):
+    """Keep the feed post cache out of the real ~/.repr."""
+    from repr import config
+
+    cache_file = tmp_path / "feed-posts.db"
+    monkeypatch.setattr(config, "FEED_CACHE_FILE", cache_file)
+    return cache_file
+
+
+@pytest.fixture
+def history_repo(mock_git_repo):
+    """A small history: edits, an added file, a deletion, a binary and a merge."""
+    root = mock_git_repo.working_tree_dir
+    git = mock_git_repo.git
+
+    def write(name, content, mode="w"):
+        with open(f"{root}/{name}", mode) as f:
+            f.write(content)
+
+    write("app.py", "def main():\n    return run()\n")
+    git.add("app.py")
+    git.commit("-m", "Add app")
+    write("README.md", "\nUsage\n", "a")
+    write("logo.bin", b"\x00\x01\x02", "wb")
+    git.add(".")
+    git.commit("-m", "Docs and logo")
+    git.checkout("-b", "side")
+    write("side.py", "x = 1\n")
+    git.add("side.py")
+    git.commit("-m", "Side work")
+    git.checkout("-")
+    git.rm("app.py")
+    git.commit("-m", "Drop app")
+    git.merge("--no-edit", "side")
+    return mock_git_repo
+
+
+class TestExtractFileChanges:
+    """Per-file stats from git history."""
+
+    def test_matches_gitpython_stats(self, history_repo):
+        shas = [c.hexsha for c in history_repo.iter_commits()]
+        changes, ins, dels = story_synthesis.extract_file_changes_from_commits(
+            shas, history_repo.working_tree_dir
+        )
+
+        expected: dict[str, list[int]] = {}
+        for sha in shas:
+            for path, stats in history_repo.commit(sha).stats.files.items():
+                totals = expected.setdefault(path, [0, 0])
+                totals[0] += stats["insertions"]
+                totals[1] += stats["deletions"]
+        assert {c.file_path: [c.insertions, c.deletions] for c in changes} == expected
+        assert ins == sum(v[0] for v in expected.values())
+        assert dels == sum(v[1] for v in expected.values())
+        assert [c.file_path for c in changes] == sorted(expected)
+
+    def test_change_types(self, history_repo):
+        commits = list(history_repo.iter_commits())
+        add_app = next(c for c in commits if c.message.startswith("Add app"))
+        drop_app = next(c for c in commits if c.message.startswith("Drop app"))
+        docs = next(c for c in commits if c.message.startswith("Docs"))
+
+        changes, _, _ = story_synthesis.extract_file_changes_from_commits(
+            [add_app.hexsha[:8]], history_repo.working_tree_dir
+        )
+        assert [(c.file_path, c.change_type) for c in changes] == [("app.py", "added")]
+
+        changes, _, _ = story_synthesis.extract_file_changes_from_commits(
+            [drop_app.hexsha], history_repo.working_tree_dir
+        )
+        assert [(c.file_path, c.change_type) for c in changes] == [("app.py", "deleted")]
+
+        changes, _, _ = story_synthesis.extract_file_changes_from_commits(
+            [docs.hexsha], history_repo.working_tree_dir
+        )
+        by_path = {c.file_path: c for c in changes}
+        assert (by_path["logo.bin"].insertions, by_path["logo.bin"].deletions) == (0, 0)
+
+    def test_single_merge_and_root_commits(self, history_repo):
+        root_dir = history_repo.working_tree_dir
+        merge = history_repo.head.commit
+        root = next(c for c in history_repo.iter_commits() if not c.parents)
+
+        changes, _, _ = story_synthesis.extract_file_changes_from_commits([merge.hexsha], root_dir)
+        assert [c.file_path for c in changes] == list(merge.stats.files) == ["side.py"]
+
+        changes, ins, _ = story_synthesis.extract_file_changes_from_commits([root.hexsha], root_dir)
+        assert [(c.file_path, c.change_type) for c in changes] == [("README.md", "added")]
+        assert ins == root.stats.total["insertions"]
+
+    def test_unknown_sha_is_skipped(self, history_repo):
+        head = history_repo.head.commit.hexsha
+        changes, _, _ = story_synthesis.extract_file_changes_from_commits(
+            ["f" * 40, head], history_repo.working_tree_dir
+        )
+        assert [c.file_path for c in changes] == ["side.py"]
+
+    def test_not_a_repo(self, tmp_path):
+        assert story_synthesis.extract_file_changes_from_commits(["abc123"], str(tmp_path)) == ([], 0, 0)
+
+
+class TestExtractKeySnippets:
+    """Code snippets from streamed commit patches."""
+
+    def _sha(self, repo, subject):
+        return next(c.hexsha for c in repo.iter_commits() if c.message.startswith(subject))
+
+    def test_snippet_from_added_lines(self, history_repo):
+        sha = self._sha(history_repo, "Add app")
+        snippets = story_synthesis.extract_key_snippets_from_commits(
+            [sha], history_repo.working_tree_dir
+        )
+        assert len(snippets) == 1
+        assert snippets[0].file_path == "app.py"
+        assert snippets[0].language == "python"
+        assert snippets[0].content == "def main():\n    return run()"
+        assert snippets[0].line_count == 2
+
+    def test_first_occurrence_of_file_wins(self, history_repo):
+        # Newest first: the deletion of app.py claims the file, so its
+        # earlier addition isn't used
+        shas = [c.hexsha for c in history_repo.iter_commits()]
+        snippets = story_synthesis.extract_key_snippets_from_commits(
+            shas, history_repo.working_tree_dir
+        )
+        assert snippets == []
+
+    def test_root_commit_and_unknown_sha_skipped(self, history_repo):
+        root = self._sha(history_repo, "Initial commit")
+        add_app = self._sha(history_repo, "Add app")
+        snippets = story_synthesis.extract_key_snippets_from_commits(
+            ["f" * 40, root, add_app], history_repo.working_tree_dir
+        )
+        assert [s.file_path for s in snippets] == ["app.py"]
+
+    def test_stops_at_max_snippets(self, history_repo):
+        root = history_repo.working_tree_dir
+        for name in ("a.py", "b.py", "c.py"):
+            with open(f"{root}/{name}", "w") as f:
+                f.write(f"def {name[0]}():\n    return 1\n")
+        history_repo.git.add(".")
+        history_repo.git.commit("-m", "Three files")
+
+        snippets = story_synthesis.extract_key_snippets_from_commits(
+            [history_repo.head.commit.hexsha], root, max_snippets=2
+        )
+        assert [s.file_path for s in snippets] == ["a.py", "b.py"]
+
+    def test_skips_imports_and_comments(self, history_repo):
+        root = history_repo.working_tree_dir
+        with open(f"{root}/lib.py", "w") as f:
+            f.write("import os\n# helper\n\ndef lib():\n    return os.sep\n")
+        history_repo.git.add(".")
+        history_repo.git.commit("-m", "Lib")
+
+        snippets = story_synthesis.extract_key_snippets_from_commits(
+            [history_repo.head.commit.hexsha], root
+        )
+        assert snippets[0].content == "def lib():\n    return os.sep"
+
+    def test_extension_match_ignores_case(self, history_repo):
+        root = history_repo.working_tree_dir
+        with open(f"{root}/notes.txt", "w") as f:
+            f.write("one\ntwo\nthree\n")
+        with open(f"{root}/Tool.PY", "w") as f:
+            f.write("def tool():\n    return 2\n")
+        history_repo.git.add(".")
+        history_repo.git.commit("-m", "Tool")
+
+        snippets = story_synthesis.extract_key_snippets_from_commits(
+            [history_repo.head.commit.hexsha], root
+        )
+        assert [(s.file_path, s.language) for s in snippets] == [("Tool.PY", "python")]
+
+
+class TestExtractRecallData:
+    """Combined recall extraction through a shared per-repo extractor."""
+
+    def test_returns_changes_and_snippets(self, history_repo):
+        sha = next(c.hexsha for c in history_repo.iter_commits() if c.message.startswith("Add app"))
+        changes, ins, dels, snippets = story_synthesis.extract_recall_data(
+            [sha], history_repo.working_tree_dir
+        )
+        assert [(c.file_path, c.change_type) for c in changes] == [("app.py", "added")]
+        assert (ins, dels) == (2, 0)
+        assert [s.file_path for s in snippets] == ["app.py"]
+
+    def test_prefetch_serves_later_subsets(self, history_repo, monkeypatch):
+        root = history_repo.working_tree_dir
+        shas = [c.hexsha for c in history_repo.iter_commits()]
+        story_synthesis.prefetch_recall_data(shas, root)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("git called again")
+
+        monkeypatch.setattr(story_synthesis, "_git_numstat", fail)
+        monkeypatch.setattr(story_synthesis, "_git_snippet_files", fail)
+        for sha in shas:
+            story_synthesis.extract_recall_data([sha], root)
+
+    def test_no_patch_walk_without_snippets(self, history_repo, monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError("patch walk")
+
+        monkeypatch.setattr(story_synthesis, "_git_snippet_files", fail)
+        head = history_repo.head.commit.hexsha
+        changes, _, _, snippets = story_synthesis.extract_recall_data(
+            [head], history_repo.working_tree_dir, max_snippets=0
+        )
+        assert [c.file_path for c in changes] == ["side.py"]
+        assert snippets == []
+
+    def test_commit_stats_are_memoized(self, history_repo, monkeypatch):
+        root = history_repo.working_tree_dir
+        head = history_repo.head.commit.hexsha
+        first = story_synthesis.extract_file_changes_from_commits([head], root)
+
+        def fail(*args):
+            raise AssertionError("git called again")
+
+        monkeypatch.setattr(story_synthesis, "_git_numstat", fail)
+        assert story_synthesis.extract_file_changes_from_commits([head], root) == first
+
+
+class TestCommitCache:
+    """Per-commit recall data persists across runs, keyed by SHA."""
+
+    def test_second_run_reads_disk_not_git(self, history_repo, commit_cache_dir, monkeypatch):
+        root = history_repo.working_tree_dir
+        shas = [c.hexsha for c in history_repo.iter_commits()]
+        first = story_synthesis._CommitExtractor(root).recall(shas)
+        assert len(list((commit_cache_dir / "stats").iterdir())) == len(shas)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("git called again")
+
+        monkeypatch.setattr(story_synthesis, "_git_numstat", fail)
+        monkeypatch.setattr(story_synthesis, "_git_snippet_files", fail)
+        assert story_synthesis._CommitExtractor(root).recall(shas) == first
+
+    def test_only_new_commits_go_to_git(self, history_repo, monkeypatch):
+        root = history_repo.working_tree_dir
+        old = [c.hexsha for c in history_repo.iter_commits()]
+        story_synthesis._CommitExtractor(root).recall(old)
+
+        with open(f"{root}/new.py", "w") as f:
+            f.write("def new():\n    return 3\n")
+        history_repo.git.add(".")
+        history_repo.git.commit("-m", "New")
+        new = history_repo.head.commit.hexsha
+
+        asked = []
+        real = story_synthesis._git_numstat
+        monkeypatch.setattr(
+            story_synthesis, "_git_numstat", lambda path, shas: asked.append(shas) or real(path, shas)
+        )
+        changes, _, _, snippets = story_synthesis._CommitExtractor(root).recall([new, *old])
+
+        assert asked == [[new]]
+        assert "new.py" in [c.file_path for c in changes]
+        assert snippets[0].file_path == "new.py"
+
+    def test_unknown_and_abbreviated_shas_not_cached(self, history_repo, commit_cache_dir):
+        head = history_repo.head.commit.hexsha
+        story_synthesis._CommitExtractor(history_repo.working_tree_dir).commit_stats(
+            ["f" * 40, head[:8]]
+        )
+        assert not (commit_cache_dir / "stats").exists()
+
+    def test_clear_cache_removes_commit_cache(self, history_repo, commit_cache_dir, monkeypatch):
+        from repr import config
+
+        monkeypatch.setattr(config, "REPO_HASHES_FILE", commit_cache_dir / "repo-hashes.json")
+        head = history_repo.head.commit.hexsha
+        story_synthesis._CommitExtractor(history_repo.working_tree_dir).commit_stats([head])
+        assert commit_cache_dir.exists()
+        config.clear_cache()
+        assert not commit_cache_dir.exists()
+
+
+def _feed_post(n: int) -> dict:
+    return {
+        "hook": f"I finally shipped part {n}.",
+        "what": f"Added part {n}.",
+        "value": "Saves time.",
+        "insight": "Small steps add up.",
+        "show": None,
+        "post_body": f"I finally shipped part {n}. It took a few tries but it works now.",
+    }
+
+
+class TestTransformStoriesForFeed:
+    """Batched feed post generation."""
+
+    def test_packs_stories_into_one_request(self, fake_llm):
+        stories = [_story(str(n), [f"src/{n}.py"]) for n in range(3)]
+        fake_llm.responses.append({"results": [_feed_post(n) for n in range(3)]})
+
+        results = story_synthesis.transform_stories_for_feed_sync(stories, model="gpt-4o-mini")
+
+        assert [r.what for r in results] == ["Added part 0.", "Added part 1.", "Added part 2."]
+        assert len(fake_llm.requests) == 1
+        prompt = fake_llm.requests[0]["messages"][1]["content"]
+        assert all(s.title in prompt for s in stories)
+
+    def test_identical_stories_sent_once(self, fake_llm):
+        stories = [_story("a", ["src/a.py"]), _story("b", ["src/b.py"])]
+        stories.insert(1, stories[0].model_copy(update={"id": "a2"}))
+        fake_llm.responses.append({"results": [_feed_post(0), _feed_post(1)]})
+
+        results = story_synthesis.transform_stories_for_feed_sync(stories, model="gpt-4o-mini")
+
+        assert [r.what for r in results] == ["Added part 0.", "Added part 0.", "Added part 1."]
+        prompt = fake_llm.requests[0]["messages"][1]["content"]
+        assert prompt.count('"title": "Story a"') == 1
+
+    def test_short_batch_falls_back_to_single_requests(self, fake_llm):
+        stories = [_story(str(n), [f"src/{n}.py"]) for n in range(2)]
+        fake_llm.responses.extend([
+            {"results": [_feed_post(0)]},
+            _feed_post(0),
+            _feed_post(1),
+        ])
+
+        results = story_synthesis.transform_stories_for_feed_sync(
+            stories, mode="internal", model="gpt-4o-mini"
+        )
+
+        assert [r.what for r in results] == ["Added part 0.", "Added part 1."]
+        assert all(isinstance(r, story_synthesis.InternalStory) for r in results)
+        assert len(fake_llm.requests) == 3
+
+    def test_single_story_retries_reuse_the_synthesizer(self, fake_llm, monkeypatch):
+        resolved = []
+        monkeypatch.setattr(
+            StorySynthesizer, "_resolve_model", lambda self: resolved.append(self) or "gpt-4o-mini"
+        )
+        stories = [_story(str(n), [f"src/{n}.py"]) for n in range(2)]
+        fake_llm.responses.extend([{"results": []}, _feed_post(0), _feed_post(1)])
+
+        story_synthesis.transform_stories_for_feed_sync(stories)
+
+        assert len(fake_llm.requests) == 3
+        assert len(resolved) == 1
+
+    def test_requests_run_concurrently(self, fake_llm, monkeypatch):
+        stories = [_story(str(n), [f"src/{n}.py"]) for n in range(3)]
+        fake_llm.responses.extend([_feed_post(0)] * 3)
+        barrier = threading.Barrier(3, timeout=5)
+        create = fake_llm.client.chat.completions.create
+
+        def blocking_create(**kwargs):
+            barrier.wait()
+            return create(**kwargs)
+
+        monkeypatch.setattr(fake_llm.client.chat.completions, "create", blocking_create)
+
+        results = story_synthesis.transform_stories_for_feed_sync(
+            stories, model="gpt-4o-mini", batch_size=1
+        )
+
+        assert [r.what for r in results] == ["Added part 0."] * 3
+
+    def test_requests_structured_output(self, fake_llm):
+        fake_llm.responses.append(_feed_post(1))
+
+        story_synthesis.transform_story_for_feed_sync(
+            _story("1", ["src/1.py"]), mode="internal", model="gpt-4o-mini"
+        )
+
+        response_format = fake_llm.requests[0]["response_format"]
+        assert response_format["type"] == "json_schema"
+        schema = response_format["json_schema"]["schema"]
+        assert schema["additionalProperties"] is False
+        assert set(schema["required"]) == set(story_synthesis.InternalStory.model_fields)
+        assert "default" not in json.dumps(schema)
+
+    def test_json_schema_rejection_falls_back_to_json_object(self, fake_llm, monkeypatch):
+        create = fake_llm.client.chat.completions.create
+
+        def picky_create(**kwargs):
+            if kwargs["response_format"]["type"] == "json_schema":
+                raise ValueError("response_format json_schema is not supported")
+            return create(**kwargs)
+
+        monkeypatch.setattr(fake_llm.client.chat.completions, "create", picky_create)
+        fake_llm.responses.append(_feed_post(1))
+
+        result = story_synthesis.transform_story_for_feed_sync(
+            _story("1", ["src/1.py"]), model="gpt-4o-mini"
+        )
+
+        assert result.what == "Added part 1."
+        assert fake_llm.requests[0]["response_format"] == {"type": "json_object"}
+
+    def test_output_capped_per_story(self, fake_llm, monkeypatch):
+        create = fake_llm.client.chat.completions.create
+
+        def newer_model_create(**kwargs):
+            if "max_tokens" in kwargs:
+                raise ValueError("Unsupported parameter: 'max_tokens'. Use 'max_completion_tokens'.")
+            return create(**kwargs)
+
+        monkeypatch.setattr(fake_llm.client.chat.completions, "create", newer_model_create)
+        stories = [_story(str(n), [f"src/{n}.py"]) for n in range(2)]
+        fake_llm.responses.append({"results": [_feed_post(0), _feed_post(1)]})
+
+        story_synthesis.transform_stories_for_feed_sync(stories, model="gpt-4o-mini")
+
+        request = fake_llm.requests[0]
+        assert request["max_completion_tokens"] == 2 * story_synthesis._FEED_MAX_TOKENS_PUBLIC
+        assert request["temperature"] == story_synthesis._FEED_TEMPERATURE
+
+    def test_fenced_response_parsed(self, fake_llm, monkeypatch):
+        content = "```json\n" + json.dumps(_feed_post(1)) + "\n```"
+        monkeypatch.setattr(
+            fake_llm.client.chat.completions, "create",
+            lambda **kwargs: SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+            ),
+        )
+
+        result = story_synthesis.transform_story_for_feed_sync(
+            _story("1", ["src/1.py"]), model="gpt-4o-mini"
+        )
+
+        assert result.what == "Added part 1."
+
+    def test_cached_posts_skip_the_llm(self, fake_llm):
+        stories = [_story(str(n), [f"src/{n}.py"]) for n in range(3)]
+        fake_llm.responses.append(_feed_post(0))
+        single = story_synthesis.transform_story_for_feed_sync(stories[0], model="gpt-4o-mini")
+
+        fake_llm.responses.append({"results": [_feed_post(1), _feed_post(2)]})
+        results = story_synthesis.transform_stories_for_feed_sync(stories, model="gpt-4o-mini")
+        assert results[0] == single
+        assert [r.what for r in results[1:]] == ["Added part 1.", "Added part 2."]
+
+        again = story_synthesis.transform_stories_for_feed_sync(stories, model="gpt-4o-mini")
+        assert again == results
+        assert len(fake_llm.requests) == 2
+
+    def test_fallback_posts_are_not_cached(self, fake_llm):
+        story = _story("1", ["src/1.py"])
+        fake_llm.responses.append({"unexpected": True})
+        story_synthesis.transform_story_for_feed_sync(story, model="gpt-4o-mini")
+
+        fake_llm.responses.append(_feed_post(1))
+        result = story_synthesis.transform_story_for_feed_sync(story, model="gpt-4o-mini")
+        assert result.what == "Added part 1."
+
+
+class TestFallbackCodex:
+    """Structured posts built without the LLM."""
+
+    def test_uses_category_tables(self):
+        story = _story("1", ["src/1.py"]).model_copy(update={"category": "perf"})
+
+        result = story_synthesis._build_fallback_codex(story, "internal")
+
+        assert result.hook in story_synthesis._CATEGORY_HOOKS_FULL["perf"]
+        assert result.insight == story_synthesis._CATEGORY_INSIGHTS["perf"]
+        assert result.problem == "Needed improvement."
+
+    def test_enhance_replaces_weak_hook(self):
+        story = _story("1", ["src/1.py"]).model_copy(update={"category": "unknown"})
+        weak = story_synthesis.PublicStory(**{**_feed_post(1), "hook": "Hi"})
+
+        result = story_synthesis._enhance_with_fallback(weak, story, "public")
+
+        assert result.hook == "Done."
+        assert result.post_body == weak.post_body
@@ -0,0 +1,189 @@
+"""
+Tests for opt-in telemetry (repr/telemetry.py).
+"""
+
+import importlib
+import os
+
+import pytest
+
+
+@pytest.fixture
+def telemetry(mock_repr_home, monkeypatch):
+    """Telemetry module bound to a temporary ~/.repr, with the network offline."""
+    import repr.telemetry
+
+    def offline(*args, **kwargs):
+        raise module.httpx.ConnectError("offline")
+
+    module = importlib.reload(repr.telemetry)
+    monkeypatch.setattr(module.httpx, "Client", offline)
+    return module
+
+
+def test_telemetry_setting_follows_config_changes(telemetry):
+    """The cached setting is re-read when the config file changes."""
+    from repr.config import CONFIG_FILE, set_config_value
+
+    assert telemetry.is_telemetry_enabled() is False
+
+    set_config_value("privacy.telemetry_enabled", True)
+    stat = CONFIG_FILE.stat()
+    os.utime(CONFIG_FILE, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert telemetry.is_telemetry_enabled() is True
+
+
+def test_track_queues_events_with_cached_context(telemetry, monkeypatch):
+    """Events share one computed context; callers get their own copy."""
+    telemetry.enable_telemetry()
+    calls = []
+    real_device_id = telemetry.get_device_id
+    monkeypatch.setattr(telemetry, "get_device_id", lambda: calls.append(1) or real_device_id())
+
+    telemetry.get_context()["os"] = "mutated"
+    telemetry.track_command("generate")
+    telemetry.track_feature("local_llm", "used", {"count": 2, "path": "/secret"})
+
+    events = telemetry.get_pending_events()
+    assert [e["event"] for e in events] == ["telemetry_enabled", "command_run", "feature_used"]
+    assert events[2]["properties"] == {"feature": "local_llm", "action": "used", "count": 2}
+    assert all(e["context"]["os"] != "mutated" for e in events)
+    assert len({e["context"]["device_id"] for e in events}) == 1
+    assert calls == []
+
+
+def test_disable_telemetry_clears_queue(telemetry):
+    """Opting out drops pending events and stops tracking."""
+    telemetry.enable_telemetry()
+    telemetry.disable_telemetry()
+    telemetry.track_command("generate")
+
+    assert telemetry.get_queue_stats()["pending_events"] == 0
+
+
+def test_queue_appends_and_trims(telemetry, monkeypatch):
+    """Events are appended one per line; the file is trimmed past its size cap."""
+    monkeypatch.setattr(telemetry, "_QUEUE_TRIM_BYTES", 1024)
+
+    for i in range(150):
+        telemetry._queue_event({"event": "e", "n": i})
+
+    lines = telemetry.TELEMETRY_QUEUE_FILE.read_text().splitlines()
+    assert len(lines) < 150
+    assert [e["n"] for e in telemetry.get_pending_events()] == list(range(50, 150))
+
+
+def test_queue_reads_legacy_file_and_skips_torn_lines(telemetry):
+    """Events queued by older versions are kept until the queue is cleared."""
+    telemetry.AUDIT_DIR.mkdir(parents=True, exist_ok=True)
+    telemetry.LEGACY_QUEUE_FILE.write_text('[{"event": "old"}]')
+    telemetry._queue_event({"event": "new"})
+    with open(telemetry.TELEMETRY_QUEUE_FILE, "a") as f:
+        f.write('{"event": "tor')
+
+    assert [e["event"] for e in telemetry.get_pending_events()] == ["old", "new"]
+    assert telemetry.clear_queue() == 2
+    assert telemetry.get_pending_events() == []
+    assert not telemetry.LEGACY_QUEUE_FILE.exists()
+
+
+class _FakeClient:
+    """Stands in for httpx.Client; records posted event batches."""
+
+    def __init__(self, sent, on_post=None, status_code=200):
+        self.sent = sent
+        self.on_post = on_post
+        self.status_code = status_code
+
+    def close(self):
+        pass
+
+    def post(self, url, json, headers):
+        self.sent.append([e["event"] for e in json["events"]])
+        if self.on_post:
+            self.on_post()
+        return type("Response", (), {"status_code": self.status_code})()
+
+
+def test_flush_keeps_events_queued_during_send(telemetry, monkeypatch):
+    """A successful send drops only the events it carried."""
+    sent = []
+    telemetry._queue_event({"event": "a"})
+    telemetry._queue_event({"event": "b"})
+    monkeypatch.setattr(
+        telemetry.httpx, "Client",
+        lambda **kwargs: _FakeClient(sent, on_post=lambda: telemetry._queue_event({"event": "c"})),
+    )
+
+    telemetry._try_flush_queue()
+
+    assert sent == [["a", "b"]]
+    assert [e["event"] for e in telemetry.get_pending_events()] == ["c"]
+
+
+def test_track_sends_in_background(telemetry, monkeypatch):
+    """track() returns without waiting for the send, which happens on a worker thread."""
+    import threading
+
+    sent = []
+    release = threading.Event()
+    monkeypatch.setattr(
+        telemetry.httpx, "Client",
+        lambda **kwargs: _FakeClient(sent, on_post=lambda: release.wait(5)),
+    )
+    telemetry.enable_telemetry()
+    telemetry.track_command("generate")
+
+    worker = telemetry._flush_thread
+    assert worker is not None and worker.is_alive()
+    release.set()
+    worker.join(5)
+
+    assert sent and sent[-1][-1] == "command_run"
+    assert telemetry.get_pending_events() == []
+
+
+def test_flushes_share_one_client(telemetry, monkeypatch):
+    """The HTTP client is created once and reused for later sends."""
+    sent = []
+    created = []
+    monkeypatch.setattr(
+        telemetry.httpx, "Client",
+        lambda **kwargs: created.append(kwargs) or _FakeClient(sent),
+    )
+
+    for event in ("a", "b"):
+        telemetry._queue_event({"event": event})
+        telemetry._try_flush_queue()
+
+    assert sent == [["a"], ["b"]]
+    assert len(created) == 1
+
+
+def test_device_id_persisted_and_read_once(telemetry, monkeypatch):
+    """The device ID is created once, stored, and then served from memory."""
+    device_id = telemetry.get_device_id()
+    assert len(device_id) == 32
+    assert telemetry.DEVICE_ID_FILE.read_text() == device_id
+
+    def no_read(*args, **kwargs):
+        raise AssertionError("device ID file was re-read")
+
+    monkeypatch.setattr(type(telemetry.DEVICE_ID_FILE), "read_text", no_read)
+    assert telemetry.get_device_id() == device_id
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_queue_lines_are_compact_json(telemetry, monkeypatch, use_orjson):
+    """Queue lines round-trip with or without orjson installed."""
+    if not use_orjson:
+        monkeypatch.setattr(telemetry, "orjson", None)
+    elif telemetry.orjson is None:
+        pytest.skip("orjson not installed")
+
+    telemetry._queue_event({"event": "e", "properties": {"mode": "ünïcode"}})
+
+    line = telemetry.TELEMETRY_QUEUE_FILE.read_bytes()
+    assert line.count(b"\n") == 1 and b": " not in line
+    assert telemetry.get_pending_events() == [{"event": "e", "properties": {"mode": "ünïcode"}}]
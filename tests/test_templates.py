@@ -0,0 +1,55 @@
+"""
+Tests for story generation templates (repr/templates.py).
+"""
+
+import pytest
+
+from repr import templates
+from repr.templates import build_generation_prompt, format_commits_for_prompt
+
+
+def test_format_commits_for_prompt():
+    """Commits render as a summary line plus optional files/changes lines."""
+    commits = [
+        {
+            "sha": "abcdef1234567",
+            "message": "Add login\n\nLong body",
+            "files": [{"path": f"src/f{i}.py"} for i in range(7)],
+            "insertions": 10,
+            "deletions": 2,
+        },
+        {"full_sha": "1234567890", "message": "Tidy", "files": ["README.md"]},
+        {"sha": "fedcba9", "message": "Empty"},
+    ]
+
+    assert format_commits_for_prompt(commits) == "\n".join([
+        "- [abcdef1] Add login",
+        "  Files: src/f0.py, src/f1.py, src/f2.py, src/f3.py, src/f4.py",
+        "  ... and 2 more files",
+        "  Changes: +10/-2",
+        "- [1234567] Tidy",
+        "  Files: README.md",
+        "- [fedcba9] Empty",
+    ])
+    assert format_commits_for_prompt([]) == ""
+
+
+def test_build_generation_prompt_falls_back_to_default():
+    """Unknown templates use the default; custom instructions are appended."""
+    commits = [{"sha": "abcdef1", "message": "Fix bug"}]
+
+    system, user = build_generation_prompt("nope", "repo", commits, custom_prompt="Be brief")
+    default_system, _ = build_generation_prompt("Resume", "repo", commits)
+
+    assert system == default_system
+    assert user.startswith("Repository: repo\n\nCommits:\n- [abcdef1] Fix bug\n")
+    assert user.endswith("\n\nAdditional instructions: Be brief")
+
+
+def test_templates_read_only_and_case_insensitive():
+    """Template lookups ignore case; the registry can't be modified."""
+    assert templates.get_template("Changelog") is templates.TEMPLATES["changelog"]
+    assert templates.get_template("missing") is None
+    with pytest.raises(TypeError):
+        templates.TEMPLATES["new"] = {}
+    assert "  interview\n" in templates.get_template_help()